@@ -0,0 +1,105 @@
+"""Fingerprinted page assets the MkDocs plugin injects alongside its blocks.
+
+Each asset is written once per build under ``ASSET_DIR`` with a content hash in
+its file name, so it can be served with long-lived cache headers and only the
+pages that actually render termynal blocks (or a command explorer) reference
+it.
+"""
+
+import functools
+import hashlib
+from dataclasses import dataclass
+from importlib import resources
+from typing import Iterable, Tuple
+
+from .termynal_render import TERMYNAL_EXTRA_HINT
+
+#: Site-relative directory the fingerprinted assets are written to.
+ASSET_DIR = "assets/mkdocs-typer2"
+
+
+@dataclass(frozen=True)
+class Asset:
+    """A static text asset (``.css`` or ``.js``) identified by its logical name."""
+
+    name: str
+    content: str
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.content.encode("utf-8")).hexdigest()[:10]
+
+    @property
+    def path(self) -> str:
+        """Fingerprinted site path, e.g. ``termynal.css`` -> ``termynal.<hash>.css``."""
+        stem, _, suffix = self.name.rpartition(".")
+        return f"{ASSET_DIR}/{stem}.{self.digest}.{suffix}"
+
+
+def _static_text(name: str) -> str:
+    """Read one of this package's own ``static/`` files."""
+    return resources.files(__package__).joinpath("static", name).read_text("utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def termynal_assets() -> Tuple[Asset, ...]:
+    """termynal's CSS/JS (from the installed package) plus our lazy-init script."""
+    try:
+        from termynal.markdown import get_default_css, get_default_js
+    except ModuleNotFoundError as exc:
+        raise ModuleNotFoundError(TERMYNAL_EXTRA_HINT) from exc
+
+    return (
+        Asset("termynal.css", get_default_css()),
+        Asset("termynal.js", get_default_js()),
+        # After termynal.js: starts ``:lazy:`` blocks as they scroll into view.
+        Asset("termynal-lazy.js", _static_text("termynal-lazy.js")),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def explorer_assets() -> Tuple[Asset, ...]:
+    """The command explorer's viewer (see ``explorer``)."""
+    return (
+        Asset("typer-explorer.css", _static_text("typer-explorer.css")),
+        Asset("typer-explorer.js", _static_text("typer-explorer.js")),
+    )
+
+
+def _asset_tag(asset: Asset, url: str) -> str:
+    if asset.name.endswith(".css"):
+        return f'<link rel="stylesheet" href="{url}">'
+    return f'<script src="{url}"></script>'
+
+
+def inject_assets(html: str, assets: Iterable[Asset], page_url: str) -> str:
+    """Reference ``assets`` from a rendered page, relative to ``page_url``.
+
+    Stylesheets go at the end of ``<head>`` and scripts at the end of ``<body>``
+    (so the blocks exist when termynal.js initialises them). A page without the
+    closing tag gets the tags appended instead.
+    """
+    from mkdocs.utils import get_relative_url
+
+    head: list[str] = []
+    body: list[str] = []
+    for asset in assets:
+        tag = _asset_tag(asset, get_relative_url(asset.path, page_url))
+        (head if asset.name.endswith(".css") else body).append(tag)
+
+    for tags, closing in ((head, "</head>"), (body, "</body>")):
+        if tags:
+            html = _insert_before(html, closing, "\n".join(tags) + "\n")
+    return html
+
+
+def inject_head(html: str, markup: str) -> str:
+    """Put ``markup`` at the end of a rendered page's ``<head>``."""
+    return _insert_before(html, "</head>", markup)
+
+
+def _insert_before(html: str, closing: str, markup: str) -> str:
+    index = html.rfind(closing)
+    if index == -1:
+        return html + markup
+    return html[:index] + markup + html[index:]
@@ -0,0 +1,161 @@
+"""Last good output of each directive, kept on disk between builds.
+
+With ``cache_dir`` set, every directive that renders successfully stores its
+HTML under a key derived from its resolved settings (module, app name, engine,
+termynal options …), so the same directive on a later build finds it again
+regardless of the page it sits on. ``TyperProcessor`` falls back to it when a
+render blows its ``render_budget_ms``.
+
+Entries are small JSON files written atomically (temporary file plus
+``os.replace``), so an abandoned render finishing late, or two builds sharing
+the directory, never leave a torn entry behind. Each records a
+``source_fingerprint`` of the documented package, so ``engine: auto`` can tell
+a still-valid entry from a stale one.
+
+Snapshots (``snapshot_dir``) are the committed counterpart: one plain HTML file
+per module, command and output mode, used by ``engine: auto`` whenever present,
+e.g. for CLIs whose dependencies the docs environment does not install.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import typer
+
+
+@dataclass
+class CachedOutput:
+    """HTML produced for one directive.
+
+    ``kind`` is ``"termynal"`` (raw HTML, stashed as-is), ``"markdown"``
+    (converted Markdown, parsed into the page's element tree) or
+    ``"explorer"`` (an explorer model: JSON, not HTML); ``units`` is
+    what the render cost scales with (see ``profiling.RenderCost``).
+    ``engine`` names the path that produced it (an engine, ``"termynal"``,
+    ``"cache"`` or ``"snapshot"``), ``fingerprint`` the source it was
+    rendered from and ``records`` its search records (``search.SearchRecord``
+    fields; snapshots have none).
+    """
+
+    kind: str
+    html: str
+    units: int = 1
+    engine: str = ""
+    fingerprint: str = ""
+    records: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def cache_key(settings: Dict[str, Any]) -> str:
+    """Stable key for a directive's resolved ``settings``."""
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def source_files(module: str) -> Optional[List[Path]]:
+    """Every ``.py`` file of ``module``'s top-level package (``None`` if unknown).
+
+    Apps are often assembled from sibling modules, so the whole package is the
+    source of one. Found without importing anything.
+    """
+    top = module.split(".")[0]
+    try:
+        spec = importlib.util.find_spec(top)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        return None
+    if spec.submodule_search_locations:
+        return [
+            path
+            for location in spec.submodule_search_locations
+            for path in sorted(Path(location).rglob("*.py"))
+        ]
+    if spec.origin and os.path.isfile(spec.origin):
+        return [Path(spec.origin)]
+    return None  # built-in or frozen
+
+
+def source_fingerprint(module: str) -> str:
+    """Fingerprint of the source ``module`` is documented from ("" if unknown).
+
+    Covers ``source_files`` by path, size and modification time, so it is
+    computed without reading or importing anything, plus the installed typer
+    version, which shapes the output too.
+    """
+    paths = source_files(module)
+    if paths is None:
+        return ""
+    digest = hashlib.sha256(typer.__version__.encode("utf-8"))
+    for path in paths:
+        stat = path.stat()
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:32]
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Write ``data`` to ``path`` as JSON, atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class OutputCache:
+    """One JSON file per directive key in ``directory``."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> Optional[CachedOutput]:
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+            return CachedOutput(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def store(self, key: str, output: CachedOutput) -> None:
+        write_json(self._path(key), asdict(output))
+
+
+#: Snapshot file suffix per ``CachedOutput.kind`` other than ``"markdown"``.
+_SNAPSHOT_SUFFIXES = {"termynal": ".termynal.html", "explorer": ".explorer.json"}
+
+
+class SnapshotStore:
+    """Readable HTML snapshots in ``directory``, one per ``name``.
+
+    A ``.termynal.html`` suffix marks termynal output and ``.explorer.json``
+    an explorer model; everything else holds converted Markdown.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, name: str, kind: str) -> Path:
+        suffix = _SNAPSHOT_SUFFIXES.get(kind, ".html")
+        return self.directory / f"{name}{suffix}"
+
+    def load(self, name: str, kind: str) -> Optional[CachedOutput]:
+        try:
+            html = self._path(name, kind).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        return CachedOutput(kind, html, engine="snapshot")
+
+    def write(self, name: str, output: CachedOutput) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(name, output.kind).write_text(output.html, encoding="utf-8")
@@ -0,0 +1,237 @@
+"""Walk a Click command into a plain ``CommandNode``-shaped dict.
+
+This is the native engine's tree builder without pydantic (or anything else
+outside the standard library, Click and Typer), so the same walk runs in other
+interpreters: ``pretty.CommandNode`` validates its output in this one, and
+``interpreter`` runs this module as a script in a worker for another
+interpreter or virtualenv, which imports the CLI from its own site-packages.
+
+As a worker (``python path/to/clicktree.py``) it reads one JSON request per
+line from stdin and answers each with one JSON line on stdout:
+
+    {"op": "tree", "module": "mycli.main", "name": "app"}
+    {"ok": true, "value": {"name": "mycli", ...}}
+
+``op`` is ``"tree"`` (the command tree) or ``"fingerprint"`` (what the
+module's documentation depends on, without importing it). Failures come back
+as ``{"ok": false, "error": "..."}``. The worker keeps answering until stdin
+is closed. It must keep running on every Python version the project supports
+and import nothing from this package.
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def format_usage(usage_text: str) -> Optional[str]:
+    if not usage_text:
+        return None
+    first_line = usage_text.splitlines()[0]
+    if first_line.startswith("Usage: "):
+        return first_line.replace("Usage: ", "", 1).strip()
+    return first_line.strip()
+
+
+def format_choice_metavar(option: Any) -> Optional[str]:
+    param_types = [option.type, getattr(option.type, "func", None)]
+    for param_type in param_types:
+        if param_type is None:
+            continue
+        choices = getattr(param_type, "choices", None)
+        if choices is not None:
+            return f"[{'|'.join(str(choice) for choice in choices)}]"
+    return None
+
+
+def format_option_name(option: Any, ctx: Any) -> str:
+    choice_metavar = format_choice_metavar(option)
+    if choice_metavar:
+        primary = ", ".join(option.opts)
+        if option.secondary_opts:
+            secondary = " / ".join(option.secondary_opts)
+            return f"{primary} / {secondary}"
+        return f"{primary} {choice_metavar}"
+
+    help_record = option.get_help_record(ctx)
+    if help_record:
+        return help_record[0]
+    primary = ", ".join(option.opts)
+    if option.secondary_opts:
+        secondary = " / ".join(option.secondary_opts)
+        return f"{primary} / {secondary}"
+    return primary
+
+
+def format_option_default(option: Any) -> Optional[str]:
+    if option.default is None:
+        return None
+    if isinstance(option.default, bool) and option.secondary_opts:
+        if option.default is False:
+            return option.secondary_opts[0].lstrip("-")
+        return option.opts[0].lstrip("-") if option.opts else None
+    return str(option.default)
+
+
+def short_help(command: Any) -> str:
+    text = command.get_short_help_str()
+    return text.strip() if text else ""
+
+
+def is_group(command: object) -> bool:
+    commands = getattr(command, "commands", None)
+    return isinstance(commands, dict)
+
+
+def _context(command: Any, info_name: str, parent: Any) -> Any:
+    # The command's own Click: Typer releases vendor theirs, so ``click`` may
+    # not be importable (or may be another copy) where the CLI is.
+    return command.context_class(command, info_name=info_name, parent=parent)
+
+
+def command_tree(
+    command: Any, parent_ctx: Any = None, display_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """``command``'s tree as a dict with ``CommandNode``'s fields."""
+    info_name = display_name or command.name or ""
+    ctx = _context(command, info_name, parent_ctx)
+    arguments: List[Dict[str, Any]] = []
+    options: List[Dict[str, Any]] = []
+    node: Dict[str, Any] = {
+        "name": info_name,
+        "description": (command.help or "").strip(),
+        "usage": format_usage(ctx.get_usage()),
+        "arguments": arguments,
+        "options": options,
+        "subcommands": [],
+        "commands": [],
+    }
+
+    for param in command.params:
+        param_type = getattr(param, "param_type_name", None)
+        if param_type == "argument":
+            arguments.append(
+                {
+                    "name": getattr(param, "human_readable_name", None) or param.name,
+                    "description": (getattr(param, "help", "") or "").strip(),
+                    "required": param.required,
+                }
+            )
+        elif param_type == "option":
+            options.append(
+                {
+                    "name": format_option_name(param, ctx),
+                    "description": (param.help or "").strip(),
+                    "required": param.required,
+                    "default": format_option_default(param),
+                    "type": str(param.type) if param.type else None,
+                }
+            )
+
+    if is_group(command):
+        for subcommand in command.commands.values():
+            node["commands"].append(
+                {"name": subcommand.name, "description": short_help(subcommand)}
+            )
+        for subcommand in command.commands.values():
+            node["subcommands"].append(command_tree(subcommand, parent_ctx=ctx))
+    return node
+
+
+def _click_command(app: Any) -> Any:
+    if callable(getattr(app, "get_params", None)) and getattr(app, "name", None):
+        return app
+    try:
+        import typer.main
+    except ImportError:
+        typer = None
+    if typer is not None and isinstance(app, typer.Typer):
+        return typer.main.get_command(app)
+    raise ValueError("Resolved object is not a Typer or Click command.")
+
+
+def module_tree(module: str, name: str) -> Dict[str, Any]:
+    """Import ``module`` and walk its app (``name``, else ``app``)."""
+    module_ref = importlib.import_module(module)
+    app = getattr(module_ref, name, None) if name else None
+    if app is None:
+        app = getattr(module_ref, "app", None)
+    if app is None:
+        raise ValueError(f"Unable to resolve Typer app from module '{module}'.")
+    return command_tree(_click_command(app), display_name=name or None)
+
+
+def module_fingerprint(module: str) -> str:
+    """Like ``cache.source_fingerprint``, for this interpreter's ``module``.
+
+    Hashes the path, size and modification time of every ``.py`` file of the
+    module's top-level package plus the Python and Typer versions, without
+    importing anything; "" if the module cannot be found.
+    """
+    from importlib import metadata
+
+    try:
+        spec = importlib.util.find_spec(module.split(".")[0])
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        return ""
+    if spec.submodule_search_locations:
+        paths = [
+            path
+            for location in spec.submodule_search_locations
+            for path in sorted(Path(location).rglob("*.py"))
+        ]
+    elif spec.origin and spec.origin.endswith(".py"):
+        paths = [Path(spec.origin)]
+    else:
+        return ""
+    try:
+        typer_version = metadata.version("typer")
+    except metadata.PackageNotFoundError:
+        typer_version = ""
+    digest = hashlib.sha256(f"{sys.version} {typer_version}".encode("utf-8"))
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:32]
+
+
+def _answer(request: Dict[str, Any]) -> Any:
+    if request.get("op") == "fingerprint":
+        return module_fingerprint(request["module"])
+    return module_tree(request["module"], request.get("name") or "")
+
+
+def main() -> None:
+    """Worker loop: answer requests until the parent closes stdin."""
+    # Run as a script, this package's directory leads ``sys.path``, where its
+    # modules would shadow same-named ones (``markdown``); the CLI is imported
+    # from the working directory instead, as with ``python -m``.
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [entry for entry in sys.path if os.path.abspath(entry) != here]
+    sys.path.insert(0, os.getcwd())
+    responses = sys.stdout
+    # Rendering code that prints must not corrupt the response stream.
+    sys.stdout = sys.stderr
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = {"ok": True, "value": _answer(json.loads(line))}
+        except Exception as exc:
+            response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+
+if __name__ == "__main__":
+    main()
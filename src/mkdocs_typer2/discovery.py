@@ -0,0 +1,183 @@
+"""Find the installed Typer/Click console scripts and document one page each.
+
+With ``discover`` on, the MkDocs plugin scans the ``console_scripts`` entry
+points of the installed distributions (optionally only those whose name
+matches ``discover_distributions``, or whose script name matches
+``discover_scripts``; both take globs) and keeps those that resolve to a Typer
+app or Click command. Each one gets a generated page, ``<discover_dir>/<script>.md``.
+
+Entry points are imported and rendered by a pool of ``IsolatedRenderer``
+workers, so several CLIs are documented at once and none of their modules stay
+in the build process. Scripts that are not Typer/Click commands (a plain
+``main`` function, say) fail to resolve in their worker and are dropped.
+
+With ``cache_dir``, the names of the scripts kept are cached under a key made
+of the filters and every installed distribution's name, version and ``RECORD``
+hash, so later builds skip importing the rejected ones until something is
+installed, upgraded or removed.
+"""
+
+import fnmatch
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .isolation import IsolatedRenderer
+from .pretty import (
+    _build_tree_from_click_command,
+    resolve_click_command,
+    tree_to_markdown,
+    tree_to_markdown_list,
+)
+from .report import log
+
+
+@dataclass(frozen=True)
+class ConsoleScript:
+    """One ``console_scripts`` entry point."""
+
+    name: str
+    module: str
+    attr: str
+    distribution: str
+
+
+def _normalized(name: str) -> str:
+    """Distribution name as PEP 503 normalises it."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _matches(name: str, patterns: Sequence[str]) -> bool:
+    return not patterns or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def console_scripts(
+    distributions: Sequence[str] = (), scripts: Sequence[str] = ()
+) -> List[ConsoleScript]:
+    """Console scripts of the installed distributions matching the filters.
+
+    ``distributions`` and ``scripts`` are globs on distribution names
+    (normalised, so ``my_tools`` matches ``My.Tools``) and script names; empty
+    means no filter. Entry points naming a nested attribute are skipped.
+    """
+    patterns = [_normalized(pattern) for pattern in distributions]
+    found: Dict[str, ConsoleScript] = {}
+    for distribution in metadata.distributions():
+        dist_name = _normalized(distribution.metadata["Name"] or "")
+        if not _matches(dist_name, patterns):
+            continue
+        for entry_point in distribution.entry_points:
+            if entry_point.group != "console_scripts":
+                continue
+            if not _matches(entry_point.name, scripts) or "." in (
+                entry_point.attr or ""
+            ):
+                continue
+            found.setdefault(
+                entry_point.name,
+                ConsoleScript(
+                    entry_point.name, entry_point.module, entry_point.attr, dist_name
+                ),
+            )
+    return [found[name] for name in sorted(found)]
+
+
+def installed_fingerprint(*filters: Sequence[str]) -> str:
+    """Key of the installed distributions (and ``filters``) for the scan cache.
+
+    Hashes each distribution's name, version and ``RECORD`` file, which lists
+    every installed file with its own hash.
+    """
+    entries = []
+    for distribution in metadata.distributions():
+        record = distribution.read_text("RECORD") or ""
+        entries.append(
+            f"{_normalized(distribution.metadata['Name'] or '')} "
+            f"{distribution.version} "
+            f"{hashlib.sha256(record.encode('utf-8')).hexdigest()}"
+        )
+    digest = hashlib.sha256(json.dumps([sorted(entries), *filters]).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def render_console_script(
+    module: str, attr: str, name: str, pretty: bool, compact: bool = False
+) -> str:
+    """The script's Markdown; module-level so isolated workers can run it.
+
+    Raises ``ValueError`` when the entry point is not a Typer/Click command.
+    """
+    command = resolve_click_command(module, attr)
+    tree = _build_tree_from_click_command(command, display_name=name)
+    if pretty:
+        return tree_to_markdown(tree, compact)
+    return tree_to_markdown_list(tree, compact)
+
+
+def render_console_scripts(
+    scripts: Iterable[ConsoleScript],
+    pretty: bool,
+    compact: bool = False,
+    processes: int = 4,
+) -> Dict[str, Optional[str]]:
+    """Markdown per script name, ``None`` for scripts that are not CLIs.
+
+    Each script is imported in a fresh worker; up to ``processes`` run at once.
+    """
+    scripts = list(scripts)
+
+    def render(script: ConsoleScript) -> Optional[str]:
+        renderer = IsolatedRenderer()
+        try:
+            return renderer.run(
+                script.module,
+                render_console_script,
+                script.module,
+                script.attr,
+                script.name,
+                pretty,
+                compact,
+            )
+        except Exception as exc:
+            log.debug("discover: skipping %s (%s)", script.name, exc)
+            return None
+        finally:
+            renderer.close()
+
+    with ThreadPoolExecutor(max(1, processes)) as executor:
+        results = list(executor.map(render, scripts))
+    return {script.name: md for script, md in zip(scripts, results)}
+
+
+def discover(
+    distributions: Sequence[str] = (),
+    scripts: Sequence[str] = (),
+    pretty: bool = False,
+    compact: bool = False,
+    processes: int = 4,
+    cache_dir: Optional[Path] = None,
+) -> Dict[str, str]:
+    """Markdown of every Typer/Click console script matching the filters."""
+    candidates = console_scripts(distributions, scripts)
+    cache_file = None
+    if cache_dir is not None:
+        key = installed_fingerprint(list(distributions), list(scripts))
+        cache_file = Path(cache_dir) / f"discover-{key}.json"
+        try:
+            kept = set(json.loads(cache_file.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            pass
+        else:
+            candidates = [script for script in candidates if script.name in kept]
+            cache_file = None
+    rendered = render_console_scripts(candidates, pretty, compact, processes)
+    pages = {name: md for name, md in rendered.items() if md is not None}
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(sorted(pages)), encoding="utf-8")
+    return pages
@@ -0,0 +1,239 @@
+"""Run a CLI's example invocations and show their output as termynal blocks.
+
+A directive's ``:examples:`` lists command lines, one per line (the program
+name is optional):
+
+    ::: mkdocs-typer2
+        :module: mycli.main
+        :name: mycli
+        :examples:
+            status --format table
+            sync --dry-run
+
+Each example runs in-process through the resolved Click command, the way
+Click's ``CliRunner`` runs one: empty stdin, stdout and stderr captured,
+``SystemExit`` caught for the exit code. Output printed through Typer's rich
+console keeps its color, as in ``termynal_render._colored_help``. Each example
+becomes one termynal block, styled by the directive's termynal options.
+
+Capturing swaps the process-wide ``sys.stdout``, so examples cannot run side
+by side in threads. With several to run they are shared out between up to
+``processes`` isolated workers instead, each importing the CLI once.
+
+Results are cached under the module's ``source_fingerprint``, the app, the
+capture width and the arguments: in memory for the build, and under
+``cache_dir`` across builds. An example only runs again once the CLI's source
+or the example itself changes.
+"""
+
+import contextlib
+import io
+import json
+import shlex
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import click
+
+from .cache import cache_key, source_fingerprint, write_json
+from .isolation import IsolatedRenderer
+from .pretty import resolve_click_command
+from .stubs import stubbed_imports
+from .termynal_render import (
+    STACKED_BLOCK_STYLE,
+    TermynalOptions,
+    _help_block,
+    _normalized,
+    rich_console_into,
+)
+from .tracing import span
+
+
+@dataclass
+class ExampleResult:
+    """What one example printed, and how it exited."""
+
+    output: str
+    exit_code: int = 0
+
+
+def example_args(example: str, program: str = "") -> List[str]:
+    """``example``'s arguments, without a leading ``program`` name."""
+    args = shlex.split(example)
+    if program and args and args[0] == program:
+        args = args[1:]
+    return args
+
+
+@contextlib.contextmanager
+def _empty_stdin() -> Iterator[None]:
+    original = sys.stdin
+    sys.stdin = io.StringIO("")
+    try:
+        yield
+    finally:
+        sys.stdin = original
+
+
+def _exit_code(code: object) -> int:
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+
+def invoke(
+    command: click.core.Command, info_name: str, args: Sequence[str], width: int = 80
+) -> ExampleResult:
+    """Run ``command`` with ``args`` and capture what it prints.
+
+    Prompts read an empty stdin, so they abort instead of waiting.
+    """
+    buf = io.StringIO()
+    exit_code = 0
+    with (
+        rich_console_into(buf, width),
+        contextlib.redirect_stdout(buf),
+        contextlib.redirect_stderr(buf),
+        _empty_stdin(),
+    ):
+        try:
+            command.main(
+                args=list(args),
+                prog_name=info_name,
+                color=True,
+                terminal_width=width,
+            )
+        except SystemExit as exc:
+            exit_code = _exit_code(exc.code)
+    return ExampleResult(buf.getvalue().rstrip("\n"), exit_code)
+
+
+def run_examples(
+    module: str,
+    name: str,
+    examples: Sequence[Sequence[str]],
+    width: int = 80,
+    stubs: Sequence[str] = (),
+) -> List[ExampleResult]:
+    """Run each example's arguments; module-level so isolated workers can run it."""
+    with stubbed_imports(stubs):
+        command = resolve_click_command(module, name)
+    info_name = name or command.name or ""
+    results = []
+    for args in examples:
+        with span("example", module=module, args=" ".join(args)):
+            results.append(invoke(command, info_name, args, width))
+    return results
+
+
+class ExampleCache:
+    """Example results by key, kept in ``directory`` too when one is given."""
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self.directory = Path(directory) if directory else None
+        self._results: Dict[str, ExampleResult] = {}
+
+    def load(self, key: str) -> Optional[ExampleResult]:
+        result = self._results.get(key)
+        if result is None and self.directory is not None:
+            try:
+                path = self.directory / f"{key}.json"
+                result = ExampleResult(**json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError, TypeError):
+                return None
+            self._results[key] = result
+        return result
+
+    def store(self, key: str, result: ExampleResult) -> None:
+        self._results[key] = result
+        if self.directory is not None:
+            write_json(self.directory / f"{key}.json", asdict(result))
+
+
+def _chunks(items: List, count: int) -> List[List]:
+    return [items[index::count] for index in range(count) if items[index::count]]
+
+
+def cached_examples(
+    module: str,
+    name: str,
+    examples: Sequence[Sequence[str]],
+    width: int = 80,
+    stubs: Sequence[str] = (),
+    cache: Optional[ExampleCache] = None,
+    processes: int = 4,
+    isolation: Optional[IsolatedRenderer] = None,
+) -> List[ExampleResult]:
+    """``run_examples``, running only the examples ``cache`` does not have.
+
+    Several examples to run are spread over up to ``processes`` workers; a
+    single batch runs in ``isolation`` when given, else in this process.
+    """
+    cache = cache if cache is not None else ExampleCache()
+    fingerprint = source_fingerprint(module)
+    keys = [
+        cache_key(
+            {
+                "fingerprint": fingerprint,
+                "module": module,
+                "name": name,
+                "width": width,
+                "args": list(args),
+            }
+        )
+        for args in examples
+    ]
+    # Without a fingerprint a cached result could be stale: run everything.
+    results = [cache.load(key) if fingerprint else None for key in keys]
+    missing = [index for index, result in enumerate(results) if result is None]
+    batches = _chunks(missing, max(1, min(processes, len(missing))))
+
+    def run(batch: List[int], renderer: Optional[IsolatedRenderer]) -> None:
+        batch_examples = [list(examples[index]) for index in batch]
+        if renderer is None:
+            ran = run_examples(module, name, batch_examples, width, stubs)
+        else:
+            ran = renderer.run(
+                module, run_examples, module, name, batch_examples, width, stubs
+            )
+        for index, result in zip(batch, ran):
+            results[index] = result
+            if fingerprint:
+                cache.store(keys[index], result)
+
+    def run_isolated(batch: List[int]) -> None:
+        renderer = IsolatedRenderer()
+        try:
+            run(batch, renderer)
+        finally:
+            renderer.close()
+
+    if len(batches) == 1:
+        run(batches[0], isolation)
+    elif batches:
+        with ThreadPoolExecutor(len(batches)) as executor:
+            list(executor.map(run_isolated, batches))
+    return results
+
+
+def examples_html(
+    program: str,
+    command_lines: Sequence[str],
+    results: Sequence[ExampleResult],
+    options: Optional[TermynalOptions] = None,
+) -> str:
+    """One termynal block per example, ``command_lines`` at the prompt."""
+    options = _normalized(options or TermynalOptions())
+    return "\n".join(
+        _help_block(
+            result.output,
+            program,
+            options,
+            style=STACKED_BLOCK_STYLE if index else "",
+            input_text=command_line,
+        )
+        for index, (command_line, result) in enumerate(zip(command_lines, results))
+    )
@@ -0,0 +1,118 @@
+"""Client-side command explorer: the command tree as one compact JSON model.
+
+A directive with ``:explorer: true`` renders no tables at all. It emits the
+``CommandNode`` tree once, as a compact JSON model, plus an empty
+``<div class="typer-explorer">`` that ``static/typer-explorer.js`` fills in the
+browser: a filterable command list and the selected command's options, both
+rendered as virtualised lists, so only the rows on screen ever reach the DOM.
+
+Under the MkDocs plugin the model is a fingerprinted asset next to the viewer
+(optionally precompressed, ``explorer_gzip``), so the page itself stays a few
+hundred bytes. Without it (e.g. Zensical) the model is inlined in the page as a
+``<script type="application/json">``.
+"""
+
+import gzip
+import html
+import json
+from typing import Any, Dict, List, Optional
+
+from .assets import ASSET_DIR, Asset
+from .pretty import CommandNode
+
+#: Class of the ``<div>`` the viewer script fills in. The MkDocs plugin looks
+#: for it to decide which pages need the viewer's CSS/JS.
+EXPLORER_CLASS = "typer-explorer"
+
+#: Bumped whenever the model's layout changes; the viewer checks it.
+MODEL_VERSION = 1
+
+
+def _trimmed(row: List[Any]) -> List[Any]:
+    """``row`` without trailing empty values, which the viewer defaults."""
+    while row and row[-1] in (None, "", False):
+        row.pop()
+    return row
+
+
+def command_model(node: CommandNode) -> Dict[str, Any]:
+    """The compact form of ``node`` and its subcommands.
+
+    Keys are single letters and empty fields are left out: ``n`` name, ``d``
+    description, ``u`` usage, ``a`` arguments as ``[name, description,
+    required]``, ``o`` options as ``[name, description, required, default]``
+    and ``c`` subcommands. Option types are left out: the option name already
+    carries its metavar.
+    """
+    model: Dict[str, Any] = {"n": node.name}
+    if node.description:
+        model["d"] = node.description
+    if node.usage:
+        model["u"] = node.usage
+    if node.arguments:
+        model["a"] = [
+            _trimmed([argument.name, argument.description, argument.required])
+            for argument in node.arguments
+        ]
+    if node.options:
+        model["o"] = [
+            _trimmed([option.name, option.description, option.required, option.default])
+            for option in node.options
+        ]
+    if node.subcommands:
+        model["c"] = [command_model(subcommand) for subcommand in node.subcommands]
+    elif node.commands:
+        # Legacy output parsed without subcommand sections: names only.
+        model["c"] = [
+            {"n": entry.name, "d": entry.description}
+            if entry.description
+            else {"n": entry.name}
+            for entry in node.commands
+        ]
+    return model
+
+
+def count_commands(model: Dict[str, Any]) -> int:
+    """Commands in a ``command_model``, its root included."""
+    return 1 + sum(count_commands(child) for child in model.get("c", ()))
+
+
+def model_json(node: CommandNode) -> str:
+    """The explorer model of ``node`` as compact JSON."""
+    model = {"v": MODEL_VERSION, "root": command_model(node)}
+    return json.dumps(model, separators=(",", ":"), ensure_ascii=False)
+
+
+def model_asset(name: str, model: str) -> Asset:
+    """Fingerprinted asset holding ``model`` for the directive called ``name``."""
+    return Asset(f"models/{name}.json", model)
+
+
+def gzipped(asset: Asset) -> bytes:
+    """``asset``'s content gzip-compressed, byte-for-byte reproducible."""
+    return gzip.compress(asset.content.encode("utf-8"), mtime=0)
+
+
+def explorer_html(
+    model: str, asset: Optional[Asset] = None, compressed: bool = False
+) -> str:
+    """The viewer's container for ``model``.
+
+    With an ``asset`` the container references it by its path relative to
+    ``ASSET_DIR`` (the viewer script resolves it against its own URL, so pages
+    at any depth share one reference), with ``.gz`` appended when a
+    precompressed copy is written. Otherwise the model is inlined.
+    """
+    fallback = "<noscript>The command explorer needs JavaScript.</noscript>"
+    if asset is not None:
+        path = asset.path[len(ASSET_DIR) + 1 :] + (".gz" if compressed else "")
+        return (
+            f'<div class="{EXPLORER_CLASS}" data-model="{html.escape(path)}">'
+            f"{fallback}</div>"
+        )
+    # "</" cannot end the script early once escaped; JSON reads "<\/" as "</".
+    inline = model.replace("</", "<\\/")
+    return (
+        f'<div class="{EXPLORER_CLASS}">'
+        f'<script type="application/json">{inline}</script>{fallback}</div>'
+    )
@@ -0,0 +1,393 @@
+"""Write one command tree as Markdown, HTML, man pages and JSON at once.
+
+``python -m mkdocs_typer2.export mycli.main:app --output-dir build/cli`` imports
+the CLI once and builds its ``CommandNode`` tree once. Markdown is
+``tree_to_markdown``'s (or ``tree_to_markdown_list``'s) output, as on the site,
+made by that function's own walk of the tree. For the HTML, man and JSON
+emitters the tree is walked once: every command is turned into a
+``CommandText`` (path, synopsis, short help, option flags and metavars …) that
+they share, so the string work they have in common is done once per command
+rather than once per format.
+
+``export`` returns the files by path relative to the output directory:
+
+- ``<cli>.md``: Markdown (``pretty`` tables, else the list layout);
+- ``<cli>.html``: a standalone HTML page with a section per command;
+- ``man/<cli>[-<command>…].1``: a roff man page per command;
+- ``<cli>.json``: the tree as JSON, with each command's path, flags and
+  metavars spelled out for tools (editor plugins, completion generators).
+"""
+
+import abc
+import html
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import typer
+
+from .pretty import (
+    CommandNode,
+    build_tree_from_click_app,
+    tree_to_markdown,
+    tree_to_markdown_list,
+)
+
+#: Formats ``export`` can write.
+FORMATS = ("markdown", "html", "man", "json")
+
+#: Version of the JSON export's layout.
+JSON_VERSION = 1
+
+
+@dataclass
+class OptionText:
+    """An option's strings, split once for every format."""
+
+    name: str
+    flags: List[str]
+    metavar: str
+    description: str
+    required: bool
+    default: Optional[str]
+
+
+@dataclass
+class CommandText:
+    """A command's strings, computed once per command for every format."""
+
+    node: CommandNode
+    name: str
+    path: str
+    depth: int
+    short_help: str
+    synopsis: str
+    options: List[OptionText] = field(default_factory=list)
+
+    @property
+    def slug(self) -> str:
+        return "-".join(self.path.split())
+
+
+def _option_text(name: str, description: str, required: bool, default) -> OptionText:
+    flags, metavar = [], []
+    for token in name.split():
+        if token.startswith("-"):
+            flags.append(token.rstrip(","))
+        elif token != "/":
+            metavar.append(token)
+    return OptionText(name, flags, " ".join(metavar), description, required, default)
+
+
+def command_texts(
+    node: CommandNode, parent: str = "", depth: int = 0
+) -> Iterator[CommandText]:
+    """The single walk of the tree, depth first."""
+    name = node.name.strip("` ")
+    path = f"{parent} {name}".strip()
+    usage = node.usage or ""
+    synopsis = usage[len(path) :].strip() if usage.startswith(path) else usage
+    yield CommandText(
+        node=node,
+        name=name,
+        path=path,
+        depth=depth,
+        short_help=" ".join(node.description.strip().split("\n\n")[0].split()),
+        synopsis=synopsis,
+        options=[
+            _option_text(
+                option.name, option.description, option.required, option.default
+            )
+            for option in node.options
+        ],
+    )
+    for subcommand in node.subcommands:
+        yield from command_texts(subcommand, path, depth + 1)
+
+
+class Emitter(abc.ABC):
+    """Receives every command of the walk, then returns its files."""
+
+    @abc.abstractmethod
+    def command(self, text: CommandText) -> None:
+        """Take the walk's next command."""
+
+    @abc.abstractmethod
+    def files(self, program: str) -> Dict[str, str]:
+        """The output files by name, once every command has been seen."""
+
+
+class MarkdownEmitter(Emitter):
+    """``tree_to_markdown`` of the root; the walk's other commands are unused."""
+
+    def __init__(self, pretty: bool = True, compact: bool = False) -> None:
+        self.pretty = pretty
+        self.compact = compact
+        self.root: Optional[CommandNode] = None
+
+    def command(self, text: CommandText) -> None:
+        if text.depth == 0:
+            self.root = text.node
+
+    def files(self, program: str) -> Dict[str, str]:
+        if self.pretty:
+            md = tree_to_markdown(self.root, self.compact)
+        else:
+            md = tree_to_markdown_list(self.root, self.compact)
+        return {f"{program}.md": md}
+
+
+class HtmlEmitter(Emitter):
+    def __init__(self) -> None:
+        self.sections: List[str] = []
+        self.title = ""
+
+    def command(self, text: CommandText) -> None:
+        if text.depth == 0:
+            self.title = text.path
+        esc = html.escape
+        level = min(text.depth + 1, 6)
+        parts = [
+            f'<section id="{esc(text.slug)}">',
+            f"<h{level}>{esc(text.path)}</h{level}>",
+        ]
+        parts.extend(
+            f"<p>{esc(paragraph.strip())}</p>"
+            for paragraph in text.node.description.split("\n\n")
+            if paragraph.strip()
+        )
+        if text.node.usage:
+            parts.append(f"<pre><code>{esc(text.node.usage)}</code></pre>")
+        if text.node.arguments:
+            parts.append("<p><strong>Arguments</strong></p><dl>")
+            for argument in text.node.arguments:
+                required = " (required)" if argument.required else ""
+                parts.append(
+                    f"<dt><code>{esc(argument.name)}</code>{required}</dt>"
+                    f"<dd>{esc(argument.description)}</dd>"
+                )
+            parts.append("</dl>")
+        if text.options:
+            parts.append(
+                "<table><thead><tr><th>Name</th><th>Description</th>"
+                "<th>Required</th><th>Default</th></tr></thead><tbody>"
+            )
+            for option in text.options:
+                parts.append(
+                    f"<tr><td><code>{esc(option.name)}</code></td>"
+                    f"<td>{esc(option.description)}</td>"
+                    f"<td>{'Yes' if option.required else 'No'}</td>"
+                    f"<td>{esc(option.default or '-')}</td></tr>"
+                )
+            parts.append("</tbody></table>")
+        if text.node.commands:
+            parts.append("<ul>")
+            for entry in text.node.commands:
+                slug = f"{text.slug}-{entry.name}"
+                parts.append(
+                    f'<li><a href="#{esc(slug)}"><code>{esc(entry.name)}</code></a>'
+                    f"{': ' + esc(entry.description) if entry.description else ''}"
+                    "</li>"
+                )
+            parts.append("</ul>")
+        parts.append("</section>")
+        self.sections.append("\n".join(parts))
+
+    def files(self, program: str) -> Dict[str, str]:
+        page = (
+            "<!DOCTYPE html>\n"
+            '<html><head><meta charset="utf-8">'
+            f"<title>{html.escape(self.title)}</title></head>\n<body>\n"
+            + "\n".join(self.sections)
+            + "\n</body></html>\n"
+        )
+        return {f"{program}.html": page}
+
+
+def _roff(text: str) -> str:
+    """``text`` escaped for roff, with no line starting as a request."""
+    text = text.replace("\\", "\\e").replace("-", "\\-")
+    return "\n".join(
+        "\\&" + line if line.startswith((".", "'")) else line
+        for line in text.split("\n")
+    )
+
+
+class ManEmitter(Emitter):
+    """A man page (section 1) per command, linked through SEE ALSO."""
+
+    def __init__(self) -> None:
+        self.pages: Dict[str, str] = {}
+
+    def command(self, text: CommandText) -> None:
+        program = text.path.split()[0] if text.path else ""
+        lines = [
+            f'.TH "{_roff(text.slug.upper())}" "1" "" "{_roff(program)}" '
+            f'"{_roff(program)} Manual"',
+            ".SH NAME",
+            _roff(text.slug)
+            + (f" \\- {_roff(text.short_help)}" if text.short_help else ""),
+            ".SH SYNOPSIS",
+            f".B {_roff(text.path)}",
+        ]
+        if text.synopsis:
+            lines.append(_roff(text.synopsis))
+        paragraphs = [p.strip() for p in text.node.description.split("\n\n")]
+        if any(paragraphs):
+            lines.append(".SH DESCRIPTION")
+            lines.extend(
+                f".PP\n{_roff(paragraph)}" for paragraph in paragraphs if paragraph
+            )
+        if text.node.arguments:
+            lines.append(".SH ARGUMENTS")
+            for argument in text.node.arguments:
+                lines.extend([".TP", f"\\fB{_roff(argument.name)}\\fR"])
+                description = argument.description
+                if argument.required:
+                    description = f"{description} [required]".strip()
+                lines.append(_roff(description))
+        if text.options:
+            lines.append(".SH OPTIONS")
+            for option in text.options:
+                flags = ", ".join(f"\\fB{_roff(flag)}\\fR" for flag in option.flags)
+                if option.metavar:
+                    flags += f" \\fI{_roff(option.metavar)}\\fR"
+                notes = []
+                if option.required:
+                    notes.append("required")
+                if option.default:
+                    notes.append(f"default: {option.default}")
+                description = option.description
+                if notes:
+                    description = f"{description} [{'; '.join(notes)}]".strip()
+                lines.extend([".TP", flags, _roff(description)])
+        if text.node.commands:
+            lines.append(".SH COMMANDS")
+            for entry in text.node.commands:
+                page = _roff(f"{text.slug}-{entry.name}")
+                see = f"See \\fB{page}\\fR(1)."
+                description = _roff(entry.description)
+                lines.extend(
+                    [
+                        ".TP",
+                        f"\\fB{_roff(entry.name)}\\fR",
+                        f"{description} {see}".strip(),
+                    ]
+                )
+        if text.depth:
+            parent = "-".join(text.path.split()[:-1])
+            lines.extend([".SH SEE ALSO", f"\\fB{_roff(parent)}\\fR(1)"])
+        self.pages[f"man/{text.slug}.1"] = "\n".join(lines) + "\n"
+
+    def files(self, program: str) -> Dict[str, str]:
+        return dict(self.pages)
+
+
+class JsonEmitter(Emitter):
+    """The tree as nested JSON, rebuilt from the walk's depth."""
+
+    def __init__(self) -> None:
+        self.stack: List[Dict[str, Any]] = []
+        self.root: Optional[Dict[str, Any]] = None
+
+    def command(self, text: CommandText) -> None:
+        entry = {
+            "name": text.name,
+            "path": text.path,
+            "help": text.node.description,
+            "short_help": text.short_help,
+            "usage": text.node.usage,
+            "arguments": [argument.model_dump() for argument in text.node.arguments],
+            "options": [
+                {
+                    "flags": option.flags,
+                    "metavar": option.metavar or None,
+                    "help": option.description,
+                    "required": option.required,
+                    "default": option.default,
+                }
+                for option in text.options
+            ],
+            "commands": [],
+        }
+        del self.stack[text.depth :]
+        if self.stack:
+            self.stack[-1]["commands"].append(entry)
+        else:
+            self.root = entry
+        self.stack.append(entry)
+
+    def files(self, program: str) -> Dict[str, str]:
+        document = {"version": JSON_VERSION, "root": self.root}
+        return {f"{program}.json": json.dumps(document, indent=2) + "\n"}
+
+
+def emitters(
+    formats: Sequence[str] = FORMATS, pretty: bool = True, compact: bool = False
+) -> List[Emitter]:
+    """An emitter per format, in ``FORMATS`` order."""
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(
+            f"Unknown export format {sorted(unknown)[0]!r}; "
+            "expected one of " + ", ".join(FORMATS)
+        )
+    factories = {
+        "markdown": lambda: MarkdownEmitter(pretty, compact),
+        "html": HtmlEmitter,
+        "man": ManEmitter,
+        "json": JsonEmitter,
+    }
+    return [factories[name]() for name in FORMATS if name in formats]
+
+
+def export(
+    tree: CommandNode,
+    formats: Sequence[str] = FORMATS,
+    pretty: bool = True,
+    compact: bool = False,
+) -> Dict[str, str]:
+    """Every file of ``formats`` for ``tree``, by relative path."""
+    outputs = emitters(formats, pretty, compact)
+    program = "-".join(tree.name.strip("` ").split()) or "cli"
+    for text in command_texts(tree):
+        for emitter in outputs:
+            emitter.command(text)
+    files: Dict[str, str] = {}
+    for emitter in outputs:
+        files.update(emitter.files(program))
+    return files
+
+
+app = typer.Typer(add_completion=False)
+
+
+@app.command()
+def main(
+    target: str = typer.Argument(..., help="The CLI, as module:app."),
+    formats: List[str] = typer.Option(
+        list(FORMATS), "--format", "-f", help="Format to write (repeatable)."
+    ),
+    output_dir: Path = typer.Option(Path("."), help="Directory to write into."),
+    pretty: bool = typer.Option(True, help="Markdown tables, else lists."),
+    compact: bool = typer.Option(False, help="Document shared options once."),
+):
+    """Write a CLI's reference in several formats from one import."""
+    module, _, name = target.partition(":")
+    try:
+        files = export(
+            build_tree_from_click_app(module, name), formats, pretty, compact
+        )
+    except ValueError as exc:
+        typer.echo(f"error: {exc}", err=True)
+        raise typer.Exit(2)
+    for path, content in files.items():
+        destination = output_dir / path
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_text(content, encoding="utf-8")
+        typer.echo(str(destination))
+
+
+if __name__ == "__main__":
+    app()
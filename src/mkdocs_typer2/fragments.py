@@ -0,0 +1,126 @@
+"""Convert a command tree's Markdown to HTML a subtree at a time.
+
+Converting Markdown is most of what rendering a large tree costs, and a
+directive's output is all-or-nothing: one changed option in one subcommand of
+a 600-command reference means converting all of it again. ``tree_html`` instead
+converts each command's section on its own and keeps the HTML of every subtree
+under the subtree's ``CommandNode.structural_hash`` (plus the settings that
+shape the Markdown: list or table layout, depth, compact's common options).
+On a rebuild only the subtrees whose hash changed are converted, the path from
+them up to the root; every other subtree is stitched in from the cache.
+
+The stitched HTML is what ``markdown.markdown`` makes of ``tree_to_markdown``
+(or ``tree_to_markdown_list``) output: sections only ever hold whole blocks.
+
+Fragments live in memory for the build and, with ``cache_dir`` set, under its
+``fragments`` directory across builds.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import markdown
+
+from .cache import cache_key, write_json
+from .pretty import (
+    _ADDRESS_RE,
+    SUBCOMMAND_DEPTH,
+    CommandNode,
+    _compacted,
+    _option_key,
+    common_options,
+    common_options_markdown,
+    section_markdown,
+    structural_hashes,
+    subcommands_heading,
+)
+
+
+class TreeMarkdown(str):
+    """Markdown rendered from ``tree``, which it keeps for ``tree_html``."""
+
+    def __new__(
+        cls, text: str, tree: CommandNode, pretty: bool, compact: bool = False
+    ) -> "TreeMarkdown":
+        self = super().__new__(cls, text)
+        self.tree = tree
+        self.pretty = pretty
+        self.compact = compact
+        return self
+
+    def __reduce__(self):
+        # Travels back from isolated workers with its tree.
+        return (TreeMarkdown, (str(self), self.tree, self.pretty, self.compact))
+
+
+class FragmentCache:
+    """Subtree HTML by key, kept in ``directory`` too when one is given."""
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self.directory = Path(directory) if directory else None
+        self._fragments: Dict[str, str] = {}
+
+    def load(self, key: str) -> Optional[str]:
+        fragment = self._fragments.get(key)
+        if fragment is None and self.directory is not None:
+            try:
+                path = self.directory / f"{key}.json"
+                fragment = json.loads(path.read_text(encoding="utf-8"))["html"]
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+            self._fragments[key] = fragment
+        return fragment
+
+    def store(self, key: str, fragment: str) -> None:
+        self._fragments[key] = fragment
+        if self.directory is not None:
+            write_json(self.directory / f"{key}.json", {"html": fragment})
+
+
+def tree_html(
+    tree: CommandNode,
+    pretty: bool = True,
+    compact: bool = False,
+    cache: Optional[FragmentCache] = None,
+) -> Tuple[str, int]:
+    """``tree``'s HTML, and how many Markdown fragments had to be converted."""
+    cache = cache if cache is not None else FragmentCache()
+    shared_options = common_options(tree) if compact else []
+    common = {_option_key(option) for option in shared_options}
+    settings = {
+        "pretty": bool(pretty),
+        "compact": compact,
+        # Without the object addresses, so keys hold across builds.
+        "common": sorted(_ADDRESS_RE.sub("", key) for key in common),
+    }
+    hashes = structural_hashes(tree)
+    converter = markdown.Markdown(extensions=["tables"])
+    converted = 0
+
+    def convert(text: str) -> str:
+        nonlocal converted
+        converted += 1
+        return converter.reset().convert(_compacted(text) if compact else text)
+
+    def subtree(node: CommandNode, depth: int) -> str:
+        key = cache_key({**settings, "depth": depth, "hash": hashes[id(node)]})
+        fragment = cache.load(key)
+        if fragment is None:
+            parts = [convert(section_markdown(node, depth, bool(pretty), common))]
+            if node.subcommands and depth < SUBCOMMAND_DEPTH:
+                parts.append(convert(subcommands_heading(depth)))
+                parts.extend(subtree(child, depth + 1) for child in node.subcommands)
+            fragment = "\n".join(parts)
+            cache.store(key, fragment)
+        return fragment
+
+    parts = [subtree(tree, 0)]
+    if shared_options:
+        key = cache_key({**settings, "common_options": True})
+        fragment = cache.load(key)
+        if fragment is None:
+            fragment = convert(common_options_markdown(shared_options, bool(pretty)))
+            cache.store(key, fragment)
+        parts.append(fragment)
+    return "\n".join(parts), converted
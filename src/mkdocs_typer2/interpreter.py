@@ -0,0 +1,154 @@
+"""Build command trees with another Python interpreter.
+
+A directive with ``:python:`` documents the CLI installed for that interpreter
+(a virtualenv of an older release line, say) instead of the one the docs are
+built with. Each interpreter gets one persistent worker, ``clicktree.py`` run
+as a script, which imports the CLI from its own site-packages, walks it with
+the same code as the native engine and sends the tree back as JSON; pydantic,
+Markdown and everything else stay in the build process. Nothing of this
+package has to be installed in the other environment, only the CLI and its
+Typer/Click.
+
+Requests to one worker run one at a time; workers for different interpreters
+run side by side, so the trees for several versions are built in parallel
+when they are requested ahead (``InterpreterPool.submit``). Each result is kept
+per interpreter, module and app for the rest of the build.
+"""
+
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from . import clicktree
+from .tracing import span
+
+
+def interpreter_path(value: str, base_dir: Optional[Path] = None) -> str:
+    """The executable for ``value``: an interpreter, or a virtualenv directory.
+
+    Relative paths start at ``base_dir``; a bare name (``python3.9``) is left
+    for the ``PATH`` lookup.
+    """
+    path = Path(value).expanduser()
+    if os.sep not in value and "/" not in value and not path.exists():
+        return value
+    if not path.is_absolute() and base_dir is not None:
+        path = base_dir / path
+    if path.is_dir():
+        for candidate in ("bin/python", "Scripts/python.exe"):
+            if (path / candidate).exists():
+                return str(path / candidate)
+        raise ValueError(f"No Python interpreter in virtualenv '{value}'")
+    return str(path)
+
+
+class InterpreterWorker:
+    """One persistent ``clicktree`` worker for ``python``."""
+
+    def __init__(self, python: str) -> None:
+        self.python = python
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+
+    def request(self, op: str, module: str, name: str = "") -> Any:
+        """Answer of the worker; its error is raised as ``RuntimeError``."""
+        with self._lock:
+            if self._process is None:
+                try:
+                    self._process = subprocess.Popen(
+                        [self.python, clicktree.__file__],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        text=True,
+                        encoding="utf-8",
+                    )
+                except OSError as exc:
+                    raise RuntimeError(f"cannot start '{self.python}': {exc}") from exc
+            process = self._process
+            request = {"op": op, "module": module, "name": name}
+            with span("interpreter worker", python=self.python, module=module):
+                try:
+                    process.stdin.write(json.dumps(request) + "\n")
+                    process.stdin.flush()
+                    line = process.stdout.readline()
+                except BrokenPipeError:
+                    line = ""
+            if not line:
+                self._stop()
+                raise RuntimeError(f"worker for '{self.python}' exited unexpectedly")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise RuntimeError(f"{module} with '{self.python}': {response['error']}")
+        return response["value"]
+
+    def _stop(self) -> None:
+        process, self._process = self._process, None
+        if process is not None:
+            process.stdin.close()
+            process.wait()
+            process.stdout.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop()
+
+
+class InterpreterPool:
+    """A worker per interpreter, and the trees they built this build."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._workers: Dict[str, InterpreterWorker] = {}
+        self._trees: Dict[Tuple[str, str, str], Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def worker(self, python: str) -> InterpreterWorker:
+        with self._lock:
+            if python not in self._workers:
+                self._workers[python] = InterpreterWorker(python)
+            return self._workers[python]
+
+    def submit(self, python: str, module: str, name: str = "") -> Future:
+        """Start building the tree of ``module``'s app with ``python``.
+
+        The same request later returns the same future.
+        """
+        key = (python, module, name)
+        with self._lock:
+            future = self._trees.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        thread_name_prefix="mkdocs-typer2 interpreter"
+                    )
+                future = self._trees[key] = self._executor.submit(
+                    self._tree, python, module, name
+                )
+        return future
+
+    def _tree(self, python: str, module: str, name: str) -> Dict[str, Any]:
+        return self.worker(python).request("tree", module, name)
+
+    def tree(self, python: str, module: str, name: str = "") -> Dict[str, Any]:
+        """``module``'s tree as ``python`` sees it, as a ``CommandNode`` dict."""
+        return self.submit(python, module, name).result()
+
+    def fingerprint(self, python: str, module: str) -> str:
+        """``cache.source_fingerprint`` of ``module`` for ``python``."""
+        return self.worker(python).request("fingerprint", module)
+
+    def close(self) -> None:
+        """Stop every worker and forget the trees (called at the end of a build)."""
+        with self._lock:
+            workers = list(self._workers.values())
+            executor, self._executor = self._executor, None
+            self._workers.clear()
+            self._trees.clear()
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for worker in workers:
+            worker.close()
@@ -0,0 +1,113 @@
+"""Render directives in a short-lived child process.
+
+With ``isolate_imports`` the documented module is imported in a worker
+interpreter instead of the build process, so its modules are freed when the
+worker exits rather than staying in ``sys.modules`` for the rest of the build.
+Consecutive directives for the same module share one worker (the import is
+paid once per module group); moving on to another module retires it.
+
+The worker is ``python -m mkdocs_typer2.isolation`` with this interpreter's
+``sys.path`` (as in ``profiling``), exchanging pickled ``(function, args)``
+requests and results over its stdin/stdout. Unlike ``multiprocessing`` it never
+re-imports the build's ``__main__``. Rendering functions must therefore be
+importable, module-level functions, and only their (string) results come back.
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+from typing import IO, Any, Callable, Optional
+
+from .tracing import span
+
+
+def _send(stream: IO[bytes], payload: Any) -> None:
+    pickle.dump(payload, stream)
+    stream.flush()
+
+
+class IsolatedRenderer:
+    """One worker process per module group."""
+
+    def __init__(self) -> None:
+        self._module: Optional[str] = None
+        self._worker: Optional[subprocess.Popen] = None
+
+    def run(self, module: str, function: Callable[..., Any], *args: Any) -> Any:
+        """Call ``function(*args)`` in the worker for ``module``.
+
+        An exception raised by ``function`` is re-raised here.
+        """
+        if module != self._module or self._worker is None:
+            self.close()
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+            self._worker = subprocess.Popen(
+                [sys.executable, "-m", "mkdocs_typer2.isolation"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                env=env,
+            )
+            self._module = module
+        worker = self._worker
+        try:
+            with span("isolated worker", module=module, worker=worker.pid):
+                _send(worker.stdin, (function, args))
+                ok, value = pickle.load(worker.stdout)
+        except (EOFError, BrokenPipeError):
+            if worker is self._worker:
+                self.close()
+            else:
+                # ``kill`` reaped it; its pipes are this request's to close.
+                worker.stdin.close()
+                worker.stdout.close()
+            raise RuntimeError(
+                f"isolated worker for '{module}' exited unexpectedly"
+            ) from None
+        if not ok:
+            raise value
+        return value
+
+    def kill(self) -> None:
+        """Stop the current worker without waiting for the request it runs.
+
+        The caller blocked on that request gets the "exited unexpectedly"
+        error and closes the worker's pipes; the next ``run`` starts a fresh
+        worker.
+        """
+        worker, self._worker, self._module = self._worker, None, None
+        if worker is not None:
+            worker.kill()
+            worker.wait()
+
+    def close(self) -> None:
+        """Stop the current worker, if any (also called at the end of a build)."""
+        if self._worker is not None:
+            self._worker.stdin.close()
+            self._worker.wait()
+            self._worker.stdout.close()
+        self._worker = None
+        self._module = None
+
+
+def main() -> None:
+    """Worker loop: answer requests until the parent closes stdin."""
+    requests, responses = sys.stdin.buffer, sys.stdout.buffer
+    # Rendering code that prints must not corrupt the response stream.
+    sys.stdout = sys.stderr
+    while True:
+        try:
+            function, args = pickle.load(requests)
+        except EOFError:
+            return
+        try:
+            _send(responses, (True, function(*args)))
+        except Exception as exc:
+            try:
+                _send(responses, (False, exc))
+            except Exception:  # unpicklable exception
+                _send(responses, (False, RuntimeError(repr(exc))))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,92 @@
+import contextvars
+import html
+import json
 import re
+import shlex
 import subprocess
+import sys
+import threading
+import time
 import xml.etree.ElementTree as etree
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
 
 import markdown
 from markdown.blockprocessors import BlockProcessor
 
+from .assets import Asset
+from .cache import (
+    CachedOutput,
+    OutputCache,
+    SnapshotStore,
+    cache_key,
+    source_fingerprint,
+)
+from .examples import ExampleCache, cached_examples, example_args, examples_html
+from .explorer import count_commands, explorer_html, model_asset, model_json
+from .fragments import FragmentCache, TreeMarkdown, tree_html
+from .interpreter import InterpreterPool, interpreter_path
+from .isolation import IsolatedRenderer
+from .memory import measure_memory
 from .pretty import (
+    CommandNode,
     build_tree_from_click_app,
     parse_markdown_to_tree,
     tree_to_markdown,
     tree_to_markdown_list,
 )
+from .profiling import profile_if_slow, profile_imports, profile_thread
+from .report import BuildReport, DiagnosticsOptions, EngineChoice, log
+from .search import (
+    SearchRecord,
+    add_records,
+    collect,
+    collecting,
+    is_collecting,
+)
+from .static import StaticAnalysisError, build_tree_from_source
+from .stubs import stubbed_imports
 from .termynal_render import TermynalOptions, render_termynal_html
+from .tracing import Tracer, current_page, install, span
+
+#: Class of the wrapper ``<div>`` around termynal output. The MkDocs plugin looks
+#: for it to decide which pages need termynal's CSS/JS.
+TERMYNAL_CONTAINER_CLASS = "termynal-typer-docs"
+
+#: One "Usage" heading per documented command, in every engine's Markdown.
+_USAGE_RE = re.compile(r"^(?:#+ |\*\*)Usage\b", re.MULTILINE)
+
+#: Accepted ``engine`` values.
+ENGINES = ("legacy", "native", "static", "auto")
+
+#: Most targets of one ``:apps:`` directive rendered at once.
+APPS_THREADS = 8
+
+#: Returned by ``TyperProcessor._render_within_budget`` when time ran out.
+_OVER_BUDGET = object()
+
+#: Over-budget renders still running in the background that hold process-wide
+#: state (``_holds_process_state``), and the lock guarding the list.
+_ABANDONED: list[threading.Thread] = []
+_ABANDONED_LOCK = threading.Lock()
+
+#: Blank lines, which separate Python-Markdown's blocks.
+_BLANK_LINE_RE = re.compile(r"\n[ \t]*\n")
+
+
+def is_directive(block: str) -> bool:
+    """Whether ``block`` is a ``::: mkdocs-typer2`` directive."""
+    return block.strip().startswith(":::") and "mkdocs-typer2" in block
+
+
+def directive_blocks(text: str) -> list[str]:
+    """The directive blocks of a page's Markdown, split like the block parser."""
+    return [
+        block.strip("\n") for block in _BLANK_LINE_RE.split(text) if is_directive(block)
+    ]
 
 
 def _directive_value(block: str, key: str) -> str | None:
@@ -29,6 +104,51 @@ def _directive_line(block: str, key: str) -> str | None:
     return match.group(1).strip() if match else None
 
 
+def _list_option(block: str, key: str) -> tuple[list[str], str]:
+    """``_directive_lines``, and the block without the list's lines."""
+    lines = block.split("\n")
+    for index, line in enumerate(lines):
+        match = re.match(rf"\s*:{key}:(.*)$", line)
+        if not match:
+            continue
+        items = [match.group(1)]
+        end = index + 1
+        for following in lines[index + 1 :]:
+            if re.match(r"\s*:\w+:", following):
+                break
+            items.append(following)
+            end += 1
+        items = [item.strip() for item in items]
+        values = [
+            item[2:].strip() if item.startswith("- ") else item
+            for item in items
+            if item
+        ]
+        return values, "\n".join(lines[:index] + lines[end:])
+    return [], block
+
+
+def _directive_lines(block: str, key: str) -> list[str]:
+    """A list value: the rest of the ``:key:`` line and the lines under it.
+
+    The list ends at the next ``:option:`` line; a leading ``- `` is dropped
+    from each item, so the items may be written as a Markdown list.
+    """
+    return _list_option(block, key)[0]
+
+
+def _app_target(item: str) -> tuple[str, str, str]:
+    """``module``, ``name`` and ``:command:`` of an ``:apps:`` item.
+
+    Items read ``module:name``, optionally followed by ``:command: <path>``.
+    """
+    target, _, command = item.partition(":command:")
+    module, _, name = target.strip().partition(":")
+    if not module:
+        raise ValueError(f"Invalid :apps: target {item!r}; expected module:name")
+    return module, name, command.strip()
+
+
 def _as_bool(value: str | None, default: bool) -> bool:
     if value is None:
         return default
@@ -49,12 +169,386 @@ def _as_int(value: str | None, default: int | None) -> int | None:
         return default
 
 
+def _as_float(value: str | None, default: float | None) -> float | None:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _as_int_list(value: str | None) -> list[int] | None:
+    """Parse a comma-separated list of integers (``"60, 100"``).
+
+    Returns ``None`` when ``value`` is missing or any item is not an integer, so
+    the caller keeps its default.
+    """
+    if value is None:
+        return None
+    try:
+        return [int(item) for item in value.split(",") if item.strip()] or None
+    except ValueError:
+        return None
+
+
+def _as_str_list(value: str | None) -> list[str]:
+    """Split a comma-separated directive value (``"torch, boto3"``)."""
+    if value is None:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _legacy_command(module: str, name: str, stub_imports: Sequence[str]) -> list[str]:
+    """The ``typer <module> utils docs`` invocation for the legacy engine.
+
+    With stubs it runs the same ``typer`` CLI through ``mkdocs_typer2.stubs`` in
+    this interpreter, so the finder is installed before the module is imported.
+    """
+    args = [module, "utils", "docs", "--name", name]
+    if not stub_imports:
+        return ["typer", *args]
+    return [sys.executable, "-m", "mkdocs_typer2.stubs", ",".join(stub_imports), *args]
+
+
+def _tree_markdown(tree: CommandNode, pretty: bool, compact: bool = False) -> str:
+    """The tree's Markdown, carrying the tree along for ``tree_html``."""
+    collect(tree)
+    with span("render", pretty=bool(pretty)):
+        if pretty:
+            text = tree_to_markdown(tree, compact)
+        else:
+            text = tree_to_markdown_list(tree, compact)
+    return TreeMarkdown(text, tree, bool(pretty), compact)
+
+
+def _native_markdown(
+    module: str,
+    name: str,
+    pretty: bool,
+    stubs: Sequence[str] = (),
+    compact: bool = False,
+    records: bool = False,
+) -> tuple[str, list[SearchRecord]]:
+    """Native-engine Markdown; module-level so isolated workers can run it.
+
+    Returns the tree's search records along with it when ``records`` is set.
+    """
+    with stubbed_imports(stubs), collecting(records) as collected:
+        tree = build_tree_from_click_app(module, name)
+        return _tree_markdown(tree, pretty, compact), collected
+
+
+def _explorer_model(
+    module: str, name: str, stubs: Sequence[str] = (), records: bool = False
+) -> tuple[str, list[SearchRecord]]:
+    """Explorer model JSON (and search records, like ``_native_markdown``)."""
+    with stubbed_imports(stubs), collecting(records) as collected:
+        tree = build_tree_from_click_app(module, name)
+        collect(tree)
+        return model_json(tree), collected
+
+
+def _termynal_html(
+    module: str,
+    name: str,
+    options: TermynalOptions,
+    command: str,
+    stubs: Sequence[str] = (),
+) -> str:
+    """Termynal HTML; module-level so isolated workers can run it."""
+    with stubbed_imports(stubs):
+        return render_termynal_html(module, name, options, command=command)
+
+
+@dataclass
+class Directive:
+    """One ``::: mkdocs-typer2`` block with the global settings applied."""
+
+    module: str
+    name: str
+    pretty: bool | None
+    engine: str
+    termynal: bool
+    command: str
+    stubs: list[str]
+    isolate: bool
+    termynal_options: TermynalOptions
+    render_budget_ms: float | None = None
+    compact: bool = False
+    explorer: bool = False
+    #: Interpreter that builds the tree ("": this one, in-process).
+    python: str = ""
+    #: Command lines to run and show instead of documenting the CLI.
+    examples: list[str] = field(default_factory=list)
+
+
+def _cache_key(directive: Directive) -> str:
+    """Key of the directive's output: every setting that can change it."""
+    settings = asdict(directive)
+    del settings["isolate"], settings["render_budget_ms"]
+    return cache_key(settings)
+
+
+def _snapshot_name(directive: Directive) -> str:
+    """File name (without suffix) of the directive's snapshot.
+
+    The target, then a short key of the settings that shape its output, so
+    directives that render one CLI differently keep a file each.
+    """
+    name = directive.module
+    if directive.name:
+        name += "." + directive.name
+    if directive.command:
+        name += "." + "-".join(directive.command.split())
+    if directive.examples:
+        name += ".examples"
+    settings = asdict(directive)
+    # The target is spelled out above; the kind is the file's suffix.
+    for field_name in (
+        "module",
+        "name",
+        "command",
+        "examples",
+        "engine",
+        "stubs",
+        "isolate",
+        "render_budget_ms",
+        "termynal",
+        "explorer",
+    ):
+        del settings[field_name]
+    return f"{name}.{cache_key(settings)[:8]}"
+
+
+def _kind(directive: Directive) -> str:
+    """``CachedOutput.kind`` of the directive's output."""
+    if directive.termynal or directive.examples:
+        return "termynal"
+    return "explorer" if directive.explorer else "markdown"
+
+
+def _renders_concurrently(directive: Directive) -> bool:
+    """Whether the directive can render alongside others of its block.
+
+    Termynal and example output swap Typer's console hook and ``sys.stdout``,
+    stubs add an import finder and isolated renders share one worker: those
+    render one at a time.
+    """
+    return not (
+        directive.termynal or directive.examples or directive.stubs or directive.isolate
+    )
+
+
+@dataclass
+class DirectiveDefaults:
+    """The global settings a directive starts from, and its resolution.
+
+    Needs no Markdown instance: the MkDocs plugin resolves a page's directives
+    with the extension's defaults before the page is converted.
+    """
+
+    pretty: bool | None = None
+    engine: str = "legacy"
+    termynal: bool = False
+    compact: bool = False
+    explorer: bool = False
+    stub_imports: tuple[str, ...] = ()
+    isolate_imports: bool = False
+    render_budget_ms: float | None = None
+    termynal_options: TermynalOptions = field(default_factory=TermynalOptions)
+    #: ``:python:`` names and the interpreters they stand for.
+    interpreters: Mapping[str, str] = field(default_factory=dict)
+
+    def _resolve_termynal_options(self, block: str) -> TermynalOptions:
+        """Build per-block options from the globals plus directive overrides."""
+        base = self.termynal_options
+        # ``:width:`` takes one width or a comma-separated list (``60, 100``) for
+        # responsive output; either form replaces both global width settings.
+        widths = _as_int_list(_directive_line(block, "width"))
+        return TermynalOptions(
+            width=widths[0] if widths else base.width,
+            widths=tuple(widths) if widths else base.widths,
+            scheme=_directive_value(block, "scheme") or base.scheme,
+            dark_bg=_as_bool(_directive_value(block, "dark_bg"), base.dark_bg),
+            buttons=_directive_value(block, "buttons") or base.buttons,
+            # Capture the rest of the line so a multi-word prompt (e.g. ``my $``)
+            # is kept whole rather than truncated at the first token.
+            prompt=_directive_line(block, "prompt") or base.prompt,
+            type_delay=_as_int(_directive_value(block, "type_delay"), base.type_delay),
+            line_delay=_as_int(_directive_value(block, "line_delay"), base.line_delay),
+            start_delay=_as_int(
+                _directive_value(block, "start_delay"), base.start_delay
+            ),
+            subcommands=_as_int(
+                _directive_value(block, "subcommands"), base.subcommands
+            ),
+            lazy=_as_bool(_directive_value(block, "lazy"), base.lazy),
+            max_lines=_as_int(_directive_value(block, "max_lines"), base.max_lines),
+            static=_as_bool(_directive_value(block, "static"), base.static),
+        )
+
+    def resolve_directives(self, block: str) -> list[Directive]:
+        """The block's directive, or one per ``:apps:`` target in their order.
+
+        The targets share the block's other options; a target's own
+        ``:command:`` replaces the block's.
+        """
+        targets, rest = _list_option(block, "apps")
+        if not targets:
+            return [self.resolve_directive(block)]
+        base = self.resolve_directive(rest, module="")
+        directives = []
+        for target in targets:
+            module, name, command = _app_target(target)
+            directives.append(
+                replace(base, module=module, name=name, command=command or base.command)
+            )
+        return directives
+
+    def resolve_directive(self, block: str, module: str | None = None) -> Directive:
+        """Parse a directive block and apply the global settings to it.
+
+        ``module``, when given, stands in for a missing ``:module:``.
+        """
+        module_match = re.search(r":module:\s*(\S+)", block)
+        name_match = re.search(r":name:\s*(\S+)", block)
+        pretty_match = re.search(r":pretty:\s*(\S+)", block)
+        engine_match = re.search(r":engine:\s*(\S+)", block)
+        if not module_match and module is None:
+            raise ValueError("Module is required")
+
+        # Determine if pretty formatting should be used
+        # Block-level setting overrides global setting if present
+        use_pretty = self.pretty  # Start with global setting
+        if pretty_match:
+            # Parse the block-level setting as a boolean
+            block_pretty_value = pretty_match.group(1).lower()
+            if block_pretty_value in ["true", "1", "yes"]:
+                use_pretty = True
+            elif block_pretty_value in ["false", "0", "no"]:
+                use_pretty = False
+
+        # Determine engine (legacy, native, static or auto)
+        use_engine = self.engine or "legacy"
+        if engine_match:
+            block_engine_value = engine_match.group(1).lower()
+            if block_engine_value in ENGINES:
+                use_engine = block_engine_value
+            else:
+                raise ValueError(
+                    "Engine must be one of " + ", ".join(f"'{e}'" for e in ENGINES)
+                )
+
+        return Directive(
+            module=module_match.group(1) if module_match else module,
+            name=name_match.group(1) if name_match else "",
+            pretty=use_pretty,
+            engine=use_engine,
+            termynal=_as_bool(_directive_value(block, "termynal"), self.termynal),
+            command=_directive_line(block, "command") or "",
+            # ``:stub_imports:`` adds to the globally stubbed packages.
+            stubs=[
+                *self.stub_imports,
+                *_as_str_list(_directive_line(block, "stub_imports")),
+            ],
+            isolate=_as_bool(
+                _directive_value(block, "isolate_imports"), self.isolate_imports
+            ),
+            termynal_options=self._resolve_termynal_options(block),
+            render_budget_ms=_as_float(
+                _directive_value(block, "render_budget_ms"), self.render_budget_ms
+            ),
+            compact=_as_bool(_directive_value(block, "compact"), self.compact),
+            explorer=_as_bool(_directive_value(block, "explorer"), self.explorer),
+            python=self._interpreter(_directive_line(block, "python")),
+            examples=_directive_lines(block, "examples"),
+        )
+
+    def _interpreter(self, value: str | None) -> str:
+        """``:python:``'s interpreter: a name from ``interpreters`` or a path."""
+        if not value:
+            return ""
+        if value in self.interpreters:
+            return self.interpreters[value]
+        return interpreter_path(value)
+
+
+def prefetch_trees(
+    defaults: DirectiveDefaults, pool: InterpreterPool, text: str
+) -> None:
+    """Start building the trees of ``text``'s ``:python:`` directives.
+
+    Their workers then run side by side while the page is converted, one
+    directive at a time, instead of one after the other.
+    """
+    for block in directive_blocks(text):
+        try:
+            directives = defaults.resolve_directives(block)
+        except ValueError:
+            continue  # reported when the block is rendered
+        for directive in directives:
+            if directive.python and not directive.termynal:
+                pool.submit(directive.python, directive.module, directive.name)
+
+
+def _holds_process_state(directive: Directive) -> bool:
+    """Whether rendering the directive swaps process-wide state while it runs.
+
+    Typer's console hook, ``sys.stdout`` and ``sys.stdin`` for termynal and
+    example output, the stub finder on ``sys.meta_path`` for stubs; an
+    isolated render does all that in its worker.
+    """
+    return not directive.isolate and bool(
+        directive.termynal or directive.examples or directive.stubs
+    )
+
+
+def _wait_for_abandoned() -> None:
+    """Let abandoned over-budget renders restore process-wide state first."""
+    with _ABANDONED_LOCK:
+        threads = list(_ABANDONED)
+        _ABANDONED.clear()
+    for thread in threads:
+        thread.join()
+
+
+def _page_url(page: str, use_directory_urls: bool = True) -> str:
+    """URL of ``page`` (a ``src_uri``) relative to the site root.
+
+    As MkDocs builds it: with ``use_directory_urls`` ``cli.md`` is served as
+    ``cli/`` and ``index.md`` as its directory, otherwise as ``cli.html``.
+    """
+    stem = page.rsplit(".", 1)[0]
+    if not use_directory_urls:
+        return f"{stem}.html"
+    if stem == "index" or stem.endswith("/index"):
+        return stem[: -len("index")]
+    return f"{stem}/"
+
+
+def _placeholder_html(
+    directive: Directive, page: str, full_docs_url: str, use_directory_urls: bool
+) -> str:
+    """Stand-in for an over-budget directive without a last good output."""
+    text = (
+        f"The reference for <code>{html.escape(directive.module)}</code> took "
+        f"longer than {directive.render_budget_ms:g} ms to render and was "
+        f"skipped in this build."
+    )
+    if full_docs_url and page:
+        url = full_docs_url.rstrip("/") + "/" + _page_url(page, use_directory_urls)
+        text += f' <a href="{html.escape(url)}">See the full page.</a>'
+    return f'<p class="typer-docs-placeholder">{text}</p>'
+
+
 class TyperExtension(markdown.Extension):
     def __init__(
         self,
         *args,
         pretty: bool | None = None,
         engine: str = "legacy",
+        compact: bool = False,
         termynal: bool = False,
         width: int = TermynalOptions.width,
         scheme: str = TermynalOptions.scheme,
@@ -65,12 +559,74 @@ class TyperExtension(markdown.Extension):
         line_delay: int | None = TermynalOptions.line_delay,
         start_delay: int | None = TermynalOptions.start_delay,
         subcommands: int = TermynalOptions.subcommands,
+        lazy: bool = TermynalOptions.lazy,
+        max_lines: int | None = TermynalOptions.max_lines,
+        static: bool = TermynalOptions.static,
+        widths: Sequence[int] = TermynalOptions.widths,
+        profile_imports: bool = DiagnosticsOptions.profile_imports,
+        track_memory: bool = DiagnosticsOptions.track_memory,
+        trace_file: str | None = DiagnosticsOptions.trace_file,
+        profile_threshold_ms: float | None = DiagnosticsOptions.profile_threshold_ms,
+        profile_dir: str = DiagnosticsOptions.profile_dir,
+        render_profile: str | None = None,
+        stub_imports: Sequence[str] = (),
+        isolate_imports: bool = False,
+        render_budget_ms: float | None = None,
+        cache_dir: str | None = None,
+        full_docs_url: str = "",
+        use_directory_urls: bool = True,
+        snapshot_dir: str | None = None,
+        update_snapshots: bool = False,
+        explorer: bool = False,
+        explorer_assets: bool = False,
+        explorer_gzip: bool = False,
+        search_records: bool = False,
+        interpreters: Mapping[str, str] | None = None,
+        examples_processes: int = 4,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.pretty = pretty
         self.engine = engine
+        self.compact = compact
+        self.explorer = explorer
+        self.explorer_gzip = explorer_gzip
+        # Explorer models to write as files, by site path; the MkDocs plugin
+        # (``explorer_assets``) writes them at the end of a build. ``None``
+        # inlines every model in its page instead.
+        self.explorer_models: dict[str, Asset] | None = {} if explorer_assets else None
+        # Search records of each page's ``typer-docs`` blocks, in page order,
+        # by page; the MkDocs plugin works them into what search indexes.
+        self.search_records: dict[str, list[list[SearchRecord]]] | None = (
+            {} if search_records else None
+        )
         self.termynal = termynal
+        self.stub_imports = tuple(stub_imports)
+        self.isolate_imports = isolate_imports
+        self.render_budget_ms = render_budget_ms
+        self.full_docs_url = full_docs_url
+        self.use_directory_urls = use_directory_urls
+        self.cache = OutputCache(Path(cache_dir)) if cache_dir else None
+        self.snapshots = SnapshotStore(Path(snapshot_dir)) if snapshot_dir else None
+        self.update_snapshots = update_snapshots
+        # Shared by every processor of this extension; the MkDocs plugin closes
+        # it at the end of a build.
+        self.isolation = IsolatedRenderer()
+        # ``:python:`` names (``interpreters``) and the workers for them, shared
+        # like ``isolation``.
+        self.interpreters = dict(interpreters or {})
+        self.interpreter_pool = InterpreterPool()
+        # Results of ``:examples:`` by CLI fingerprint and arguments, kept under
+        # ``cache_dir`` across builds.
+        self.example_cache = ExampleCache(
+            Path(cache_dir) / "examples" if cache_dir else None
+        )
+        self.examples_processes = examples_processes
+        # HTML of every command subtree by structural hash, kept under
+        # ``cache_dir`` across builds.
+        self.fragment_cache = FragmentCache(
+            Path(cache_dir) / "fragments" if cache_dir else None
+        )
         # Termynal render options are bundled so they thread through as one
         # object instead of a kwarg list duplicated across Extension/Processor.
         self.termynal_options = TermynalOptions(
@@ -83,21 +639,83 @@ class TyperExtension(markdown.Extension):
             line_delay=line_delay,
             start_delay=start_delay,
             subcommands=subcommands,
+            lazy=lazy,
+            max_lines=max_lines,
+            static=static,
+            widths=tuple(widths),
+        )
+        self.diagnostics = DiagnosticsOptions(
+            profile_imports=profile_imports,
+            track_memory=track_memory,
+            trace_file=trace_file,
+            profile_threshold_ms=profile_threshold_ms,
+            profile_dir=profile_dir,
+            render_profile=render_profile,
         )
+        # Installed when the extension is registered; the MkDocs plugin writes
+        # its events to ``trace_file`` at the end of each build.
+        self.tracer = Tracer() if trace_file else None
+        # Filled in by the processor as directives render; the MkDocs plugin
+        # resets it per build and logs its summary.
+        self.report = BuildReport()
+        # The processor of the last Markdown instance extended (MkDocs makes
+        # one per page).
+        self.processor: TyperProcessor | None = None
 
     def extendMarkdown(self, md: markdown.Markdown) -> None:
-        md.parser.blockprocessors.register(
-            TyperProcessor(
-                md.parser,
-                pretty=self.pretty,
-                engine=self.engine,
-                termynal=self.termynal,
-                options=self.termynal_options,
-            ),
-            "typer",
-            175,
+        if self.tracer is not None:
+            install(self.tracer)
+        self.processor = TyperProcessor(
+            md.parser,
+            pretty=self.pretty,
+            engine=self.engine,
+            compact=self.compact,
+            explorer=self.explorer,
+            explorer_models=self.explorer_models,
+            explorer_gzip=self.explorer_gzip,
+            search_records=self.search_records,
+            termynal=self.termynal,
+            stub_imports=self.stub_imports,
+            isolate_imports=self.isolate_imports,
+            isolation=self.isolation,
+            interpreters=self.interpreters,
+            interpreter_pool=self.interpreter_pool,
+            example_cache=self.example_cache,
+            examples_processes=self.examples_processes,
+            fragment_cache=self.fragment_cache,
+            render_budget_ms=self.render_budget_ms,
+            cache=self.cache,
+            snapshots=self.snapshots,
+            update_snapshots=self.update_snapshots,
+            full_docs_url=self.full_docs_url,
+            use_directory_urls=self.use_directory_urls,
+            options=self.termynal_options,
+            diagnostics=self.diagnostics,
+            report=self.report,
+        )
+        md.parser.blockprocessors.register(self.processor, "typer", 175)
+
+    @property
+    def defaults(self) -> DirectiveDefaults:
+        """The settings this extension's directives start from."""
+        return DirectiveDefaults(
+            pretty=self.pretty,
+            engine=self.engine,
+            termynal=self.termynal,
+            compact=self.compact,
+            explorer=self.explorer,
+            stub_imports=self.stub_imports,
+            isolate_imports=self.isolate_imports,
+            render_budget_ms=self.render_budget_ms,
+            termynal_options=self.termynal_options,
+            interpreters=self.interpreters,
         )
 
+    def prefetch(self, text: str) -> None:
+        """``prefetch_trees`` for the page about to be converted."""
+        if ":python:" in text:
+            prefetch_trees(self.defaults, self.interpreter_pool, text)
+
 
 class TyperProcessor(BlockProcessor):
     def __init__(
@@ -105,121 +723,633 @@ class TyperProcessor(BlockProcessor):
         *args,
         pretty: bool | None = None,
         engine: str = "legacy",
+        compact: bool = False,
+        explorer: bool = False,
+        explorer_models: dict[str, Asset] | None = None,
+        explorer_gzip: bool = False,
+        search_records: dict[str, list[list[SearchRecord]]] | None = None,
         termynal: bool = False,
+        stub_imports: Sequence[str] = (),
+        isolate_imports: bool = False,
+        isolation: IsolatedRenderer | None = None,
+        interpreters: Mapping[str, str] | None = None,
+        interpreter_pool: InterpreterPool | None = None,
+        example_cache: ExampleCache | None = None,
+        examples_processes: int = 4,
+        fragment_cache: FragmentCache | None = None,
+        render_budget_ms: float | None = None,
+        cache: OutputCache | None = None,
+        snapshots: SnapshotStore | None = None,
+        update_snapshots: bool = False,
+        full_docs_url: str = "",
+        use_directory_urls: bool = True,
         options: TermynalOptions | None = None,
+        diagnostics: DiagnosticsOptions | None = None,
+        report: BuildReport | None = None,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.pretty = pretty
         self.engine = engine
+        self.compact = compact
+        self.explorer = explorer
+        self.explorer_models = explorer_models
+        self.explorer_gzip = explorer_gzip
+        self.search_records = search_records
         self.termynal = termynal
+        self.stub_imports = tuple(stub_imports)
+        self.isolate_imports = isolate_imports
+        self.isolation = isolation or IsolatedRenderer()
+        self.interpreters = dict(interpreters or {})
+        self.interpreter_pool = interpreter_pool or InterpreterPool()
+        self.example_cache = example_cache or ExampleCache()
+        self.examples_processes = examples_processes
+        self.fragment_cache = fragment_cache or FragmentCache()
+        self.render_budget_ms = render_budget_ms
+        self.cache = cache
+        self.snapshots = snapshots
+        self.update_snapshots = update_snapshots
+        self.full_docs_url = full_docs_url
+        self.use_directory_urls = use_directory_urls
         self.options = options or TermynalOptions()
+        self.diagnostics = diagnostics or DiagnosticsOptions()
+        self.report = report if report is not None else BuildReport()
 
     def test(self, parent, block):
-        return block.strip().startswith(":::") and "mkdocs-typer2" in block
+        return is_directive(block)
 
-    def _resolve_termynal_options(self, block: str) -> TermynalOptions:
-        """Build per-block options from the globals plus directive overrides."""
-        base = self.options
-        return TermynalOptions(
-            width=_as_int(_directive_value(block, "width"), base.width),
-            scheme=_directive_value(block, "scheme") or base.scheme,
-            dark_bg=_as_bool(_directive_value(block, "dark_bg"), base.dark_bg),
-            buttons=_directive_value(block, "buttons") or base.buttons,
-            # Capture the rest of the line so a multi-word prompt (e.g. ``my $``)
-            # is kept whole rather than truncated at the first token.
-            prompt=_directive_line(block, "prompt") or base.prompt,
-            type_delay=_as_int(_directive_value(block, "type_delay"), base.type_delay),
-            line_delay=_as_int(_directive_value(block, "line_delay"), base.line_delay),
-            start_delay=_as_int(
-                _directive_value(block, "start_delay"), base.start_delay
-            ),
-            subcommands=_as_int(
-                _directive_value(block, "subcommands"), base.subcommands
-            ),
+    def run(self, parent, blocks):
+        label = (
+            _directive_value(blocks[0], "module")
+            or ", ".join(_directive_lines(blocks[0], "apps"))
+            or "?"
         )
+        command = _directive_line(blocks[0], "command")
+        if command:
+            label = f"{label} {command}"
+        directives = self.resolve_directives(blocks.pop(0))
+        # Outside the directive's timings: its subprocess is no render cost.
+        self._profile_imports(directives)
+        with span("directive", module=label), self._profile_if_slow(label):
+            if not self.diagnostics.track_memory:
+                return self._run(parent, directives)
+            with measure_memory(label) as usage:
+                result = self._run(parent, directives)
+            self.report.memory.append(usage)
+            return result
 
-    def run(self, parent, blocks):
-        block = blocks.pop(0)
+    @property
+    def defaults(self) -> DirectiveDefaults:
+        """This processor's settings, which directives start from."""
+        return DirectiveDefaults(
+            pretty=self.pretty,
+            engine=self.engine,
+            termynal=self.termynal,
+            compact=self.compact,
+            explorer=self.explorer,
+            stub_imports=self.stub_imports,
+            isolate_imports=self.isolate_imports,
+            render_budget_ms=self.render_budget_ms,
+            termynal_options=self.options,
+            interpreters=self.interpreters,
+        )
 
-        # Extract options from the block
-        module_match = re.search(r":module:\s*(\S+)", block)
-        name_match = re.search(r":name:\s*(\S+)", block)
-        pretty_match = re.search(r":pretty:\s*(\S+)", block)
-        engine_match = re.search(r":engine:\s*(\S+)", block)
-        if not module_match:
-            raise ValueError("Module is required")
+    def resolve_directives(self, block: str) -> list[Directive]:
+        """``DirectiveDefaults.resolve_directives`` with this processor's."""
+        return self.defaults.resolve_directives(block)
+
+    def resolve_directive(self, block: str, module: str | None = None) -> Directive:
+        """``DirectiveDefaults.resolve_directive`` with this processor's."""
+        return self.defaults.resolve_directive(block, module)
+
+    def prefetch(self, text: str) -> None:
+        """``prefetch_trees`` for the page about to be converted."""
+        prefetch_trees(self.defaults, self.interpreter_pool, text)
+
+    def _profile_if_slow(self, label: str) -> AbstractContextManager:
+        threshold = self.diagnostics.profile_threshold_ms
+        if threshold is None:
+            return nullcontext()
+        return profile_if_slow(
+            label,
+            current_page(),
+            threshold,
+            Path(self.diagnostics.profile_dir),
+            self.report.slow_directives,
+        )
+
+    def _record_cost(self, mode: str, units: int, elapsed_ms: float, size: int):
+        if self.diagnostics.render_profile:
+            self.report.add_render_cost(mode, max(1, units), elapsed_ms, size)
 
-        module = module_match.group(1)
-        name = name_match.group(1) if name_match else ""
+    def _profile_imports(self, directives: list[Directive]) -> None:
+        if not self.diagnostics.profile_imports:
+            return
+        for directive in directives:
+            label = directive.module
+            if directive.python:
+                label = f"{label} ({directive.python})"
+            if label not in self.report.import_profiles:
+                self.report.import_profiles[label] = profile_imports(
+                    directive.module, directive.stubs, directive.python
+                )
 
-        use_termynal = _as_bool(_directive_value(block, "termynal"), self.termynal)
-        if use_termynal:
-            html = render_termynal_html(
+    def _run(self, parent, directives: list[Directive]):
+        started = time.perf_counter()
+        if len(directives) == 1:
+            output, over_budget = self._output(directives[0])
+            results = [(output, over_budget, (time.perf_counter() - started) * 1000)]
+        else:
+            results = self._outputs(directives)
+        for directive, (output, over_budget, elapsed_ms) in zip(directives, results):
+            self._place(parent, directive, output, over_budget, elapsed_ms)
+        return True
+
+    def _output(self, directive: Directive) -> tuple[CachedOutput | None, bool]:
+        """The directive's output, and whether it is an over-budget fallback."""
+        key = _cache_key(directive) if self.cache is not None else None
+        if _holds_process_state(directive):
+            _wait_for_abandoned()
+        if directive.render_budget_ms is None:
+            return self._render_and_store(directive, key), False
+        output = self._render_within_budget(directive, key)
+        if output is _OVER_BUDGET:
+            return self._budget_fallback(directive, key), True
+        return output, False
+
+    def _outputs(
+        self, directives: list[Directive]
+    ) -> list[tuple[CachedOutput | None, bool, float]]:
+        """``_output`` of each of an ``:apps:`` block's directives, in order.
+
+        Those that can (``_renders_concurrently``) render side by side in
+        threads, the rest one at a time after them. A module that several
+        targets import is imported once: the import system makes the others
+        wait for it.
+        """
+        results: list = [None] * len(directives)
+
+        def render(index: int) -> None:
+            started = time.perf_counter()
+            with profile_thread():
+                output, over_budget = self._output(directives[index])
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            results[index] = (output, over_budget, elapsed_ms)
+
+        concurrent = [
+            index
+            for index, directive in enumerate(directives)
+            if _renders_concurrently(directive)
+        ]
+        workers = max(1, min(len(concurrent), APPS_THREADS))
+        with ThreadPoolExecutor(workers, thread_name_prefix="mkdocs-typer2") as pool:
+            # A copy of the context per render keeps the page tag on its spans.
+            futures = [
+                pool.submit(contextvars.copy_context().run, render, index)
+                for index in concurrent
+            ]
+            for future in futures:
+                future.result()
+        # Only once the pool is done: they swap state the threads would see.
+        for index in range(len(directives)):
+            if index not in concurrent:
+                render(index)
+        return results
+
+    def _place(
+        self,
+        parent,
+        directive: Directive,
+        output: CachedOutput | None,
+        over_budget: bool,
+        elapsed_ms: float,
+    ) -> None:
+        """Insert the directive's output and report on it."""
+        if over_budget:
+            self._insert(parent, output, directive)
+            self._add_search_records(output)
+            return
+
+        if output is not None:
+            self._insert(parent, output, directive)
+            self._add_search_records(output)
+            if directive.engine == "auto":
+                label = f"{directive.module} {directive.command}".strip()
+                self.report.engine_choices.append(
+                    EngineChoice(label, current_page(), output.engine)
+                )
+            if output.engine not in ("cache", "snapshot"):
+                self._record_cost(
+                    output.engine, output.units, elapsed_ms, len(output.html)
+                )
+
+    def _render(self, directive: Directive) -> CachedOutput | None:
+        """Produce the directive's HTML (``None`` if the legacy engine fails).
+
+        With ``search_records`` on, the records of the command trees built for
+        it travel with the output (and so into the cache).
+        """
+        with collecting(self.search_records is not None) as records:
+            output = self._render_output(directive)
+        if output is not None and records:
+            output.records = [asdict(record) for record in records]
+        return output
+
+    def _render_output(self, directive: Directive) -> CachedOutput | None:
+        module, name, stubs = directive.module, directive.name, directive.stubs
+        if directive.examples:
+            return self._examples(directive)
+        if directive.python:
+            return self._interpreter_output(directive)
+
+        if directive.termynal:
+            termynal_args = (
                 module,
                 name,
-                self._resolve_termynal_options(block),
-                command=_directive_line(block, "command") or "",
+                directive.termynal_options,
+                directive.command,
+                stubs,
+            )
+            if directive.isolate:
+                html = self.isolation.run(module, _termynal_html, *termynal_args)
+            else:
+                html = _termynal_html(*termynal_args)
+            return CachedOutput(
+                "termynal", html, html.count("data-termynal"), engine="termynal"
             )
-            placeholder = self.parser.md.htmlStash.store(html)
-            div = etree.SubElement(parent, "div")
-            div.set("class", "termynal-typer-docs")
-            div.text = placeholder
-            return True
+        if directive.explorer:
+            return self._explorer(directive)
 
-        # Determine if pretty formatting should be used
-        # Block-level setting overrides global setting if present
-        use_pretty = self.pretty  # Start with global setting
-        if pretty_match:
-            # Parse the block-level setting as a boolean
-            block_pretty_value = pretty_match.group(1).lower()
-            if block_pretty_value in ["true", "1", "yes"]:
-                use_pretty = True
-            elif block_pretty_value in ["false", "0", "no"]:
-                use_pretty = False
+        engine = directive.engine
+        if engine == "legacy":
+            md_content = self._legacy(directive)
+        elif engine == "static":
+            md_content = self.static_output(
+                module,
+                name,
+                directive.pretty,
+                stubs,
+                directive.isolate,
+                directive.compact,
+            )
+        elif engine == "auto":
+            engine, md_content = self._auto(directive)
+        else:
+            md_content = self._native(
+                module,
+                name,
+                directive.pretty,
+                stubs,
+                directive.isolate,
+                directive.compact,
+            )
+        if md_content is None:
+            return None
 
-        # Determine engine (legacy or native)
-        use_engine = self.engine or "legacy"
-        if engine_match:
-            block_engine_value = engine_match.group(1).lower()
-            if block_engine_value in ["legacy", "native"]:
-                use_engine = block_engine_value
-            else:
-                raise ValueError("Engine must be 'legacy' or 'native'")
+        html_output = self._markdown_html(md_content)
+        # ``legacy`` is costed per directive (see ``RenderCost``).
+        units = 1 if engine == "legacy" else len(_USAGE_RE.findall(md_content))
+        return CachedOutput("markdown", html_output, units, engine=engine)
 
-        if use_engine == "legacy":
-            # Run typer command
-            cmd = f"typer {module} utils docs --name {name}"
-            # print(cmd)
-            result = subprocess.run(cmd.split(), capture_output=True, text=True)
+    def _examples(self, directive: Directive) -> CachedOutput:
+        """Termynal blocks showing what each of ``directive.examples`` prints.
 
-            if result.returncode == 0:
-                if use_pretty:
-                    md_content = self.pretty_output(result.stdout)
-                else:
-                    md_content = result.stdout
+        ``:command:`` is put before every example's own arguments.
+        """
+        if directive.python:
+            raise ValueError(":python: does not support :examples:")
+        program = directive.name or directive.module.rsplit(".", 1)[-1]
+        command_args = directive.command.split()
+        examples = [
+            [*command_args, *example_args(example, program)]
+            for example in directive.examples
+        ]
+        options = directive.termynal_options
+        results = cached_examples(
+            directive.module,
+            directive.name,
+            examples,
+            options.width,
+            directive.stubs,
+            self.example_cache,
+            self.examples_processes,
+            self.isolation if directive.isolate else None,
+        )
+        command_lines = [
+            " ".join([program, *map(shlex.quote, args)]) for args in examples
+        ]
+        html = examples_html(program, command_lines, results, options)
+        return CachedOutput("termynal", html, len(results), engine="examples")
+
+    def _interpreter_output(self, directive: Directive) -> CachedOutput:
+        """Output from the tree ``directive.python``'s worker builds."""
+        if directive.termynal:
+            raise ValueError(":python: does not support termynal output")
+        tree = CommandNode.model_validate(
+            self.interpreter_pool.tree(
+                directive.python, directive.module, directive.name
+            )
+        )
+        if directive.explorer:
+            collect(tree)
+            model = model_json(tree)
+            units = count_commands(json.loads(model)["root"])
+            return CachedOutput("explorer", model, units, engine="explorer")
+        md_content = _tree_markdown(tree, directive.pretty, directive.compact)
+        html_output = self._markdown_html(md_content)
+        return CachedOutput(
+            "markdown",
+            html_output,
+            len(_USAGE_RE.findall(md_content)),
+            engine="interpreter",
+        )
+
+    def _markdown_html(self, md_content: str) -> str:
+        """Convert ``md_content``; a tree's Markdown subtree by subtree."""
+        with span("markdown.markdown"):
+            if isinstance(md_content, TreeMarkdown):
+                html_output, _ = tree_html(
+                    md_content.tree,
+                    md_content.pretty,
+                    md_content.compact,
+                    self.fragment_cache,
+                )
+                return html_output
+            return markdown.markdown(md_content, extensions=["tables"])
+
+    def _fingerprint(self, directive: Directive) -> str:
+        """``source_fingerprint`` of the module, seen by the directive's interpreter."""
+        if directive.python:
+            return self.interpreter_pool.fingerprint(directive.python, directive.module)
+        return source_fingerprint(directive.module)
+
+    def _legacy(self, directive: Directive) -> str | None:
+        # Run typer command
+        cmd = _legacy_command(directive.module, directive.name, directive.stubs)
+        with span("typer utils docs", module=directive.module):
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        if directive.pretty:
+            return self.pretty_output(result.stdout, directive.compact)
+        if is_collecting():
+            collect(parse_markdown_to_tree(result.stdout))
+        return result.stdout
+
+    def _explorer(self, directive: Directive) -> CachedOutput | None:
+        """The directive's explorer model, from its engine's command tree.
+
+        ``static`` and ``auto`` try static analysis first, ``auto`` falls back
+        to ``legacy`` when the import fails, and ``legacy`` parses the Markdown
+        of ``typer utils docs``. ``None`` if the legacy engine fails.
+        """
+        module, name, stubs = directive.module, directive.name, directive.stubs
+        engine = directive.engine
+        model = None
+        if engine in ("static", "auto"):
+            try:
+                tree = build_tree_from_source(module, name)
+            except StaticAnalysisError as exc:
+                log.debug("explorer: static analysis of %s failed (%s)", module, exc)
             else:
-                return True
+                collect(tree)
+                model = model_json(tree)
+        if model is None and engine != "legacy":
+            try:
+                if directive.isolate:
+                    model, records = self.isolation.run(
+                        module, _explorer_model, module, name, stubs, is_collecting()
+                    )
+                else:
+                    model, records = _explorer_model(
+                        module, name, stubs, is_collecting()
+                    )
+                add_records(records)
+            except Exception as exc:
+                if engine != "auto":
+                    raise
+                log.debug("explorer: importing %s failed (%r)", module, exc)
+        if model is None:
+            md_content = self._legacy(replace(directive, pretty=False))
+            if md_content is None:
+                return None
+            # ``_legacy`` has collected the tree's search records already.
+            model = model_json(parse_markdown_to_tree(md_content))
+        units = count_commands(json.loads(model)["root"])
+        return CachedOutput("explorer", model, units, engine="explorer")
+
+    def _auto(self, directive: Directive) -> tuple[str, str | None]:
+        """Markdown from the cheapest engine that works: static, native, legacy.
+
+        Returns the engine used along with it.
+        """
+        module, name, pretty = directive.module, directive.name, directive.pretty
+        try:
+            tree = build_tree_from_source(module, name)
+        except StaticAnalysisError as exc:
+            log.debug("engine auto: static analysis of %s failed (%s)", module, exc)
         else:
-            md_content = self.native_output(module, name, use_pretty)
+            return "static", _tree_markdown(tree, pretty, directive.compact)
+        try:
+            return "native", self._native(
+                module,
+                name,
+                pretty,
+                directive.stubs,
+                directive.isolate,
+                directive.compact,
+            )
+        except Exception as exc:
+            log.debug("engine auto: importing %s failed (%r)", module, exc)
+        return "legacy", self._legacy(directive)
+
+    def _stored(self, directive: Directive, key: str | None) -> CachedOutput | None:
+        """``engine: auto``'s shortcuts: a still-valid cache entry or a snapshot."""
+        if key is not None:
+            entry = self.cache.load(key)
+            if (
+                entry is not None
+                and entry.fingerprint
+                and entry.fingerprint == self._fingerprint(directive)
+            ):
+                return replace(entry, engine="cache")
+        if self.snapshots is not None:
+            return self.snapshots.load(_snapshot_name(directive), _kind(directive))
+        return None
+
+    def _render_and_store(
+        self, directive: Directive, key: str | None
+    ) -> CachedOutput | None:
+        if directive.engine == "auto":
+            output = self._stored(directive, key)
+            if output is not None:
+                return output
+        output = self._render(directive)
+        if output is None:
+            return None
+        if key is not None:
+            fingerprint = self._fingerprint(directive)
+            self.cache.store(key, replace(output, fingerprint=fingerprint))
+        if self.update_snapshots and self.snapshots is not None:
+            self.snapshots.write(_snapshot_name(directive), output)
+        return output
+
+    def _render_within_budget(self, directive: Directive, key: str | None):
+        """Render in a worker thread, waiting at most ``render_budget_ms``.
 
-        html_output = markdown.markdown(md_content, extensions=["tables"])
+        Returns the output, or ``_OVER_BUDGET``. An in-process render cannot be
+        interrupted, so an over-budget one is left to finish in the background
+        (still refreshing the cache for the next build) while the build moves
+        on; an isolated render's worker process is killed instead. The next
+        render that swaps process-wide state waits for a background one that
+        does (``_wait_for_abandoned``) before it starts.
+        """
+        outcome: dict = {}
+        # A copy of the context keeps the page tag on the render's spans.
+        context = contextvars.copy_context()
 
+        def render() -> None:
+            try:
+                outcome["output"] = context.run(self._profiled_render, directive, key)
+            except BaseException as exc:
+                outcome["error"] = exc
+
+        thread = threading.Thread(
+            target=render, name=f"mkdocs-typer2 {directive.module}", daemon=True
+        )
+        thread.start()
+        thread.join(directive.render_budget_ms / 1000)
+        if thread.is_alive():
+            if directive.isolate:
+                self.isolation.kill()
+            elif _holds_process_state(directive):
+                with _ABANDONED_LOCK:
+                    _ABANDONED.append(thread)
+            return _OVER_BUDGET
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["output"]
+
+    def _profiled_render(
+        self, directive: Directive, key: str | None
+    ) -> CachedOutput | None:
+        with profile_thread():
+            return self._render_and_store(directive, key)
+
+    def _budget_fallback(self, directive: Directive, key: str | None) -> CachedOutput:
+        """The last good output, the directive's snapshot, or a placeholder
+        linking to the full page."""
+        page = current_page()
+        last_good = self.cache.load(key) if key is not None else None
+        if last_good is None and self.snapshots is not None:
+            last_good = self.snapshots.load(_snapshot_name(directive), _kind(directive))
+        if last_good is not None:
+            log.warning(
+                "%s on %s exceeded its %g ms render budget; using its last good output",
+                directive.module,
+                page or "?",
+                directive.render_budget_ms,
+            )
+            return last_good
+        log.warning(
+            "%s on %s exceeded its %g ms render budget; rendering a placeholder",
+            directive.module,
+            page or "?",
+            directive.render_budget_ms,
+        )
+        return CachedOutput(
+            "markdown",
+            _placeholder_html(
+                directive, page, self.full_docs_url, self.use_directory_urls
+            ),
+        )
+
+    def _insert(self, parent, output: CachedOutput, directive: Directive) -> None:
         div = etree.SubElement(parent, "div")
-        div.set("class", "typer-docs")
-        div.extend(etree.fromstring(f"<div>{html_output}</div>"))
+        if output.kind == "termynal":
+            div.set("class", TERMYNAL_CONTAINER_CLASS)
+            div.text = self.parser.md.htmlStash.store(output.html)
+        elif output.kind == "explorer":
+            div.set("class", "typer-docs")
+            div.text = self.parser.md.htmlStash.store(
+                self._explorer_html(output, directive)
+            )
+        else:
+            div.set("class", "typer-docs")
+            div.extend(etree.fromstring(f"<div>{output.html}</div>"))
 
-        return True
+    def _add_search_records(self, output: CachedOutput) -> None:
+        """Keep the records of a ``typer-docs`` block for the page's search view."""
+        if self.search_records is None or output.kind == "termynal":
+            return
+        blocks = self.search_records.setdefault(current_page(), [])
+        blocks.append([SearchRecord(**record) for record in output.records])
 
-    def pretty_output(self, md_content: str) -> str:
+    def _explorer_html(self, output: CachedOutput, directive: Directive) -> str:
+        """The viewer's container, registering the model as an asset if asked."""
+        if self.explorer_models is None:
+            return explorer_html(output.html)
+        asset = model_asset(_snapshot_name(directive), output.html)
+        self.explorer_models[asset.path] = asset
+        return explorer_html(output.html, asset, self.explorer_gzip)
+
+    def pretty_output(self, md_content: str, compact: bool = False) -> str:
         tree = parse_markdown_to_tree(md_content)
-        return tree_to_markdown(tree)
+        collect(tree)
+        return tree_to_markdown(tree, compact)
 
-    def native_output(self, module: str, name: str, pretty: bool) -> str:
+    def native_output(
+        self, module: str, name: str, pretty: bool, compact: bool = False
+    ) -> str:
         tree = build_tree_from_click_app(module, name)
-        if pretty:
-            return tree_to_markdown(tree)
-        return tree_to_markdown_list(tree)
+        return _tree_markdown(tree, pretty, compact)
+
+    def _native(
+        self,
+        module: str,
+        name: str,
+        pretty: bool,
+        stubs: Sequence[str],
+        isolate: bool,
+        compact: bool = False,
+    ) -> str:
+        if isolate:
+            md_content, records = self.isolation.run(
+                module,
+                _native_markdown,
+                module,
+                name,
+                pretty,
+                stubs,
+                compact,
+                is_collecting(),
+            )
+            add_records(records)
+            return md_content
+        with stubbed_imports(stubs):
+            return self.native_output(module, name, pretty, compact)
+
+    def static_output(
+        self,
+        module: str,
+        name: str,
+        pretty: bool,
+        stubs: Sequence[str] = (),
+        isolate: bool = False,
+        compact: bool = False,
+    ) -> str:
+        """Render from the module's source; fall back to native when unsure."""
+        try:
+            tree = build_tree_from_source(module, name)
+        except StaticAnalysisError as exc:
+            log.warning(
+                "static engine cannot document %s (%s); "
+                "importing it with the native engine instead",
+                module,
+                exc,
+            )
+            return self._native(module, name, pretty, stubs, isolate, compact)
+        return _tree_markdown(tree, pretty, compact)
 
 
 def makeExtension(**kwargs):
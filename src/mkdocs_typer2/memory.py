@@ -0,0 +1,86 @@
+"""Memory growth of the build, measured per directive.
+
+Every documented module stays in ``sys.modules`` once imported, so a site with
+many large CLIs grows steadily over a build. ``measure_memory`` records how much
+one directive added, both as process RSS (what an OOM killer sees) and as
+Python allocations still alive afterwards (``tracemalloc``), so the directives
+worth isolating (see ``isolation``) stand out.
+"""
+
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+_MIB = 1024 * 1024
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process, or 0 when unavailable.
+
+    Reads ``/proc/self/statm`` on Linux. Elsewhere it falls back to
+    ``getrusage``, which only reports the *peak* RSS; deltas then show growth
+    of the peak, which is still what matters for running out of memory.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ``ru_maxrss`` is in bytes on macOS and kibibytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class MemoryUsage:
+    """What one directive added to the build process, in bytes.
+
+    ``allocated`` counts Python allocations still alive after the directive
+    (imported modules, caches) and ``peak`` the highest point reached while
+    it rendered, both relative to its start.
+    """
+
+    label: str
+    rss_delta: int = 0
+    allocated: int = 0
+    peak: int = 0
+
+    def describe(self) -> str:
+        return (
+            f"RSS {self.rss_delta / _MIB:+.1f} MiB, "
+            f"Python heap {self.allocated / _MIB:+.1f} MiB "
+            f"(peak {self.peak / _MIB:+.1f} MiB)"
+        )
+
+
+@contextmanager
+def measure_memory(label: str) -> Iterator[MemoryUsage]:
+    """Fill in the yielded ``MemoryUsage`` when the ``with`` block exits.
+
+    Starts ``tracemalloc`` for the block unless something else already traces,
+    in which case that session is reused and left running. Tracing slows
+    allocation-heavy code down noticeably, which is why this is opt-in.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    traced_before, _ = tracemalloc.get_traced_memory()
+    rss_before = rss_bytes()
+    usage = MemoryUsage(label)
+    try:
+        yield usage
+    finally:
+        traced, peak = tracemalloc.get_traced_memory()
+        usage.rss_delta = rss_bytes() - rss_before
+        usage.allocated = traced - traced_before
+        usage.peak = peak - traced_before
+        if started:
+            tracemalloc.stop()
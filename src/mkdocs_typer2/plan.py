@@ -0,0 +1,295 @@
+"""Estimate what the docs' directives will cost, without rendering them.
+
+``python -m mkdocs_typer2.plan`` scans the docs for ``::: mkdocs-typer2``
+blocks, resolves each one's options exactly as ``TyperProcessor`` would (the
+plugin's configuration from ``mkdocs.yml`` plus the block's own overrides) and
+counts the commands, options and output blocks it will produce. Only the Click
+command tree is built — statically where ``static`` can, by importing the
+module otherwise — and no help is captured or converted to HTML.
+
+Output size and render time are estimated per *unit* (a termynal block, a
+documented command in the Markdown engines, or a whole ``legacy`` directive) from a render profile recorded by a
+real build (``render_profile``), or from rough built-in rates without one.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import click
+import markdown
+import typer
+
+from .markdown import Directive, TyperExtension, TyperProcessor, directive_blocks
+from .pretty import SUBCOMMAND_DEPTH, _is_click_group, resolve_click_command
+from .profiling import RenderCost, load_render_profile
+from .static import StaticAnalysisError, resolve_command_from_source
+from .stubs import stubbed_imports
+from .termynal_render import _normalized, _select_command, _subcommand_targets
+
+#: Rates used for modes the render profile has no record of: per termynal
+#: block or example, or per command in the Markdown engines and explorer models.
+#: ``legacy`` pays for a ``typer`` subprocess per directive, which dominates its
+#: time, so it is costed per directive (of some ten commands' output).
+DEFAULT_RENDER_COSTS: Dict[str, RenderCost] = {
+    "legacy": RenderCost(units=1, ms=50.0, bytes=6000),
+    "native": RenderCost(units=1, ms=2.0, bytes=600),
+    "static": RenderCost(units=1, ms=2.0, bytes=600),
+    "termynal": RenderCost(units=1, ms=35.0, bytes=2800),
+    "explorer": RenderCost(units=1, ms=1.0, bytes=250),
+    "interpreter": RenderCost(units=1, ms=2.0, bytes=600),
+    "examples": RenderCost(units=1, ms=20.0, bytes=1500),
+}
+
+
+@dataclass
+class DirectivePlan:
+    """What one directive will produce, and its estimated cost."""
+
+    page: str
+    label: str
+    mode: str
+    commands: int
+    options: int
+    blocks: int
+    estimated_bytes: int
+    estimated_ms: float
+    error: str = ""
+
+
+def find_directives(docs_dir: Path) -> Iterator[Tuple[str, str]]:
+    """Yield ``(page, block)`` for every directive under ``docs_dir``.
+
+    Blocks are split on blank lines like Python-Markdown's block parser does,
+    and matched with ``TyperProcessor.test``'s rule.
+    """
+    for path in sorted(docs_dir.rglob("*.md")):
+        page = path.relative_to(docs_dir).as_posix()
+        for block in directive_blocks(path.read_text(encoding="utf-8")):
+            yield page, block
+
+
+def _click_command(directive: Directive) -> Tuple[click.core.Command, bool]:
+    """The directive's Click command, and whether static analysis built it."""
+    try:
+        return resolve_command_from_source(directive.module, directive.name), True
+    except StaticAnalysisError:
+        with stubbed_imports(directive.stubs):
+            return resolve_click_command(directive.module, directive.name), False
+
+
+def _documented_commands(
+    command: click.core.Command, depth: Optional[int] = SUBCOMMAND_DEPTH
+) -> List[click.core.Command]:
+    """``command`` and its subcommands down to ``depth`` levels (``None``: all),
+    hidden ones included.
+
+    Unlike ``--help`` (and so termynal mode), the Markdown engines document
+    hidden commands too, though no deeper than ``SUBCOMMAND_DEPTH``; explorer
+    models hold every level.
+    """
+    commands = [command]
+    if _is_click_group(command) and depth != 0:
+        below = None if depth is None else depth - 1
+        for subcommand in command.commands.values():
+            commands.extend(_documented_commands(subcommand, below))
+    return commands
+
+
+def _tree_counts(
+    tree: dict, depth: Optional[int] = SUBCOMMAND_DEPTH
+) -> Tuple[int, int]:
+    """Commands and options of a ``CommandNode`` dict, like ``_documented_commands``."""
+    commands, options = 1, len(tree["options"])
+    if depth != 0:
+        below = None if depth is None else depth - 1
+        for subtree in tree["subcommands"]:
+            sub_commands, sub_options = _tree_counts(subtree, below)
+            commands += sub_commands
+            options += sub_options
+    return commands, options
+
+
+def plan_block(
+    processor: TyperProcessor,
+    page: str,
+    block: str,
+    costs: Dict[str, RenderCost],
+) -> List[DirectivePlan]:
+    """Plan a block's directive, or each of its ``:apps:`` targets.
+
+    Resolution errors end up in a single plan's ``error``.
+    """
+    try:
+        directives = processor.resolve_directives(block)
+    except Exception as exc:
+        return [DirectivePlan(page, page, "?", 0, 0, 0, 0, 0.0, error=str(exc))]
+    return [
+        plan_directive(processor, page, directive, costs) for directive in directives
+    ]
+
+
+def plan_directive(
+    processor: TyperProcessor,
+    page: str,
+    directive: Directive,
+    costs: Dict[str, RenderCost],
+) -> DirectivePlan:
+    """Count and estimate one directive; errors end up in ``error``."""
+    label = directive.module
+    if directive.command:
+        label = f"{label} {directive.command}"
+    try:
+        if directive.python and not directive.termynal:
+            # Built by the interpreter's worker: nothing is imported here.
+            tree = processor.interpreter_pool.tree(
+                directive.python, directive.module, directive.name
+            )
+            depth = None if directive.explorer else SUBCOMMAND_DEPTH
+            commands, options = _tree_counts(tree, depth)
+            mode = "explorer" if directive.explorer else "interpreter"
+            return _plan(page, label, mode, costs, commands, options, 1, commands)
+        root, static = _click_command(directive)
+        if directive.examples:
+            # Cached examples are not predicted either: assume they all run.
+            commands = [root]
+            mode, blocks = "examples", len(directive.examples)
+            units = blocks
+        elif directive.termynal:
+            options = _normalized(directive.termynal_options)
+            selected = root
+            if directive.command:
+                selected = _select_command(root, directive.command)
+            commands = [selected]
+            commands.extend(
+                command
+                for command, _ in _subcommand_targets(selected, "", options.subcommands)
+            )
+            mode, blocks = "termynal", len(commands) * max(1, len(options.widths))
+            units = blocks
+        else:
+            depth = None if directive.explorer else SUBCOMMAND_DEPTH
+            commands = _documented_commands(root, depth)
+            mode, blocks, units = directive.engine, 1, len(commands)
+            if mode == "legacy":
+                units = 1
+            if directive.explorer:
+                mode = "explorer"
+            elif mode == "auto":
+                # Cache hits and snapshots are not predicted: assume a render.
+                mode = "static" if static else "native"
+    except Exception as exc:
+        return DirectivePlan(page, label, "?", 0, 0, 0, 0, 0.0, error=str(exc))
+    options = sum(
+        getattr(param, "param_type_name", None) == "option"
+        for command in commands
+        for param in command.params
+    )
+    return _plan(page, label, mode, costs, len(commands), options, blocks, units)
+
+
+def _plan(
+    page: str,
+    label: str,
+    mode: str,
+    costs: Dict[str, RenderCost],
+    commands: int,
+    options: int,
+    blocks: int,
+    units: int,
+) -> DirectivePlan:
+    cost = costs.get(mode)
+    if cost is None or not cost.units:
+        cost = DEFAULT_RENDER_COSTS[mode]
+    return DirectivePlan(
+        page=page,
+        label=label,
+        mode=mode,
+        commands=commands,
+        options=options,
+        blocks=blocks,
+        estimated_bytes=round(units * cost.bytes_per_unit()),
+        estimated_ms=units * cost.ms_per_unit(),
+    )
+
+
+def plan_docs(
+    docs_dir: Path,
+    extension: Optional[TyperExtension] = None,
+    costs: Optional[Dict[str, RenderCost]] = None,
+) -> List[DirectivePlan]:
+    """Plan every directive under ``docs_dir`` with ``extension``'s settings."""
+    md = markdown.Markdown(extensions=[extension or TyperExtension()])
+    processor = md.parser.blockprocessors["typer"]
+    try:
+        return [
+            plan
+            for page, block in find_directives(docs_dir)
+            for plan in plan_block(processor, page, block, costs or {})
+        ]
+    finally:
+        processor.interpreter_pool.close()
+
+
+def _load_mkdocs_config(config_file: Path) -> Tuple[Path, TyperExtension]:
+    """``docs_dir`` and the plugin's extension, as configured in mkdocs.yml."""
+    from mkdocs.config import load_config
+
+    config = load_config(str(config_file))
+    plugin = config["plugins"].get("mkdocs-typer2")
+    extension = plugin.make_extension(config) if plugin else TyperExtension()
+    return Path(config["docs_dir"]), extension
+
+
+app = typer.Typer(add_completion=False)
+
+
+@app.command()
+def main(
+    config_file: Path = typer.Option(
+        Path("mkdocs.yml"), "--config", "-f", help="MkDocs configuration file."
+    ),
+    docs_dir: Optional[Path] = typer.Option(
+        None, help="Docs directory (default: the configuration's docs_dir)."
+    ),
+    profile: Optional[Path] = typer.Option(
+        None, help="Render profile (default: the plugin's render_profile)."
+    ),
+    max_ms: Optional[float] = typer.Option(
+        None, help="Exit with status 1 if the estimated total exceeds this."
+    ),
+):
+    """Print what each directive will produce and cost, without rendering."""
+    extension = TyperExtension()
+    if config_file.exists():
+        configured_docs_dir, extension = _load_mkdocs_config(config_file)
+        docs_dir = docs_dir or configured_docs_dir
+    docs_dir = docs_dir or Path("docs")
+    profile = profile or extension.diagnostics.render_profile
+    costs = load_render_profile(Path(profile)) if profile else {}
+
+    plans = plan_docs(docs_dir, extension, costs)
+    total_bytes = total_ms = 0.0
+    for plan in plans:
+        if plan.error:
+            typer.echo(f"{plan.page}  {plan.label}  error: {plan.error}")
+            continue
+        total_bytes += plan.estimated_bytes
+        total_ms += plan.estimated_ms
+        typer.echo(
+            f"{plan.page}  {plan.label}  {plan.mode}: {plan.commands} commands, "
+            f"{plan.options} options, {plan.blocks} blocks, "
+            f"~{plan.estimated_bytes / 1024:.0f} KiB, ~{plan.estimated_ms:.0f} ms"
+        )
+    source = f"profile {profile}" if costs else "built-in rates"
+    typer.echo(
+        f"total: {len(plans)} directives, ~{total_bytes / 1024:.0f} KiB, "
+        f"~{total_ms:.0f} ms ({source})"
+    )
+    if max_ms is not None and total_ms > max_ms:
+        typer.echo(f"estimate exceeds the {max_ms:.0f} ms budget", err=True)
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
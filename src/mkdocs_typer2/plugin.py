@@ -1,8 +1,43 @@
-from mkdocs.plugins import BasePlugin
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from mkdocs.plugins import BasePlugin, CombinedEvent, event_priority
 from mkdocs.config import config_options
 
-from .markdown import makeExtension
-from .termynal_render import TermynalOptions
+from .assets import (
+    Asset,
+    explorer_assets,
+    inject_assets,
+    inject_head,
+    termynal_assets,
+)
+from .discovery import discover
+from .explorer import EXPLORER_CLASS, gzipped
+from .interpreter import interpreter_path
+from .markdown import TERMYNAL_CONTAINER_CLASS, TyperExtension, makeExtension
+from .profiling import write_render_profile
+from .report import DiagnosticsOptions, log
+from .search import anchored_records, search_view
+from .xref import XrefIndex, read_inventory
+from .termynal_render import (
+    LAZY_BLOCK_CLASS,
+    RESPONSIVE_STYLE_ATTR,
+    TermynalOptions,
+    extract_responsive_styles,
+)
+from .tracing import install, set_page
+
+
+def _config_dir(config) -> Path:
+    """Directory holding mkdocs.yml; relative output paths start there."""
+    return Path(getattr(config, "config_file_path", None) or "mkdocs.yml").parent
+
+
+def _write_assets(config, assets: Iterable[Asset]) -> None:
+    for asset in assets:
+        target = Path(config["site_dir"], asset.path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(asset.content, encoding="utf-8")
 
 
 class MkdocsTyper(BasePlugin):
@@ -15,6 +50,58 @@ class MkdocsTyper(BasePlugin):
             "engine",
             config_options.Type(str, default="legacy"),
         ),
+        (
+            "compact",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "explorer",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "explorer_gzip",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "search_records",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "search_exclude_tables",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "xrefs",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "xref_inventory",
+            config_options.Optional(config_options.Type(str)),
+        ),
+        (
+            "xref_imports",
+            config_options.ListOfItems(config_options.Type(str), default=[]),
+        ),
+        (
+            "discover",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "discover_distributions",
+            config_options.ListOfItems(config_options.Type(str), default=[]),
+        ),
+        (
+            "discover_scripts",
+            config_options.ListOfItems(config_options.Type(str), default=[]),
+        ),
+        (
+            "discover_dir",
+            config_options.Type(str, default="cli"),
+        ),
+        (
+            "discover_processes",
+            config_options.Type(int, default=4),
+        ),
         (
             "termynal",
             config_options.Type(bool, default=False),
@@ -23,6 +110,10 @@ class MkdocsTyper(BasePlugin):
             "termynal_width",
             config_options.Type(int, default=TermynalOptions.width),
         ),
+        (
+            "termynal_widths",
+            config_options.ListOfItems(config_options.Type(int), default=[]),
+        ),
         (
             "termynal_scheme",
             config_options.Type(str, default=TermynalOptions.scheme),
@@ -55,26 +146,327 @@ class MkdocsTyper(BasePlugin):
             "termynal_subcommands",
             config_options.Type(int, default=TermynalOptions.subcommands),
         ),
+        (
+            "termynal_lazy",
+            config_options.Type(bool, default=TermynalOptions.lazy),
+        ),
+        (
+            "termynal_max_lines",
+            config_options.Optional(config_options.Type(int)),
+        ),
+        (
+            "termynal_static",
+            config_options.Type(bool, default=TermynalOptions.static),
+        ),
+        (
+            "termynal_assets",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "stub_imports",
+            config_options.ListOfItems(config_options.Type(str), default=[]),
+        ),
+        (
+            "isolate_imports",
+            config_options.Type(bool, default=False),
+        ),
+        (
+            "interpreters",
+            config_options.DictOfItems(config_options.Type(str), default={}),
+        ),
+        (
+            "examples_processes",
+            config_options.Type(int, default=4),
+        ),
+        (
+            "profile_imports",
+            config_options.Type(bool, default=DiagnosticsOptions.profile_imports),
+        ),
+        (
+            "track_memory",
+            config_options.Type(bool, default=DiagnosticsOptions.track_memory),
+        ),
+        (
+            "trace_file",
+            config_options.Optional(config_options.Type(str)),
+        ),
+        (
+            "profile_threshold_ms",
+            config_options.Optional(config_options.Type((int, float))),
+        ),
+        (
+            "profile_dir",
+            config_options.Type(str, default=DiagnosticsOptions.profile_dir),
+        ),
+        (
+            "render_profile",
+            config_options.Optional(config_options.Type(str)),
+        ),
+        (
+            "render_budget_ms",
+            config_options.Optional(config_options.Type((int, float))),
+        ),
+        (
+            "cache_dir",
+            config_options.Optional(config_options.Type(str)),
+        ),
+        (
+            "full_docs_url",
+            config_options.Type(str, default=""),
+        ),
+        (
+            "snapshot_dir",
+            config_options.Optional(config_options.Type(str)),
+        ),
+        (
+            "update_snapshots",
+            config_options.Type(bool, default=False),
+        ),
     )
 
+    def __init__(self) -> None:
+        super().__init__()
+        # src_uri of every page whose content contains a termynal block, mapped
+        # to whether any of its blocks animate. Only those pages get termynal's
+        # CSS when ``termynal_assets`` is on, and only animated ones its JS.
+        self._termynal_pages: Dict[str, bool] = {}
+        # Responsive termynal media queries by src_uri, moved out of the
+        # page content so search does not index them.
+        self._page_styles: Dict[str, List[str]] = {}
+        # src_uri of every page with a command explorer; they get its viewer.
+        self._explorer_pages: Set[str] = set()
+        # Rendered content of pages whose search view the search plugin is
+        # indexing, by src_uri, until it is put back.
+        self._page_content: Dict[str, str] = {}
+        # Commands and options rendered this build, plus imported inventories.
+        self._xrefs = XrefIndex()
+        self._extension: Optional[TyperExtension] = None
+
     def on_config(self, config, **kwargs) -> dict:
-        config["markdown_extensions"].append(
-            makeExtension(
-                pretty=self.config["pretty"],
-                engine=self.config["engine"],
-                termynal=self.config["termynal"],
-                width=self.config["termynal_width"],
-                scheme=self.config["termynal_scheme"],
-                dark_bg=self.config["termynal_dark_bg"],
-                buttons=self.config["termynal_buttons"],
-                prompt=self.config["termynal_prompt"],
-                type_delay=self.config["termynal_type_delay"],
-                line_delay=self.config["termynal_line_delay"],
-                start_delay=self.config["termynal_start_delay"],
-                subcommands=self.config["termynal_subcommands"],
-            )
-        )
+        for url in self.config["xref_imports"]:
+            count = self._xrefs.load_inventory(*read_inventory(url))
+            log.info("imported %d CLI references from %s", count, url)
+        self._extension = self.make_extension(config)
+        config["markdown_extensions"].append(self._extension)
         return config
 
+    def make_extension(self, config) -> TyperExtension:
+        """The Markdown extension configured by this plugin's options."""
+        render_profile = self.config["render_profile"]
+        cache_dir = self.config["cache_dir"]
+        snapshot_dir = self.config["snapshot_dir"]
+        return makeExtension(
+            pretty=self.config["pretty"],
+            engine=self.config["engine"],
+            compact=self.config["compact"],
+            explorer=self.config["explorer"],
+            # Models are written as files next to the viewer by on_post_build.
+            explorer_assets=True,
+            explorer_gzip=self.config["explorer_gzip"],
+            # Cross-references are indexed from the same per-command records.
+            search_records=(
+                self.config["search_records"]
+                or self.config["search_exclude_tables"]
+                or self._xrefs_enabled()
+            ),
+            termynal=self.config["termynal"],
+            width=self.config["termynal_width"],
+            widths=self.config["termynal_widths"],
+            scheme=self.config["termynal_scheme"],
+            dark_bg=self.config["termynal_dark_bg"],
+            buttons=self.config["termynal_buttons"],
+            prompt=self.config["termynal_prompt"],
+            type_delay=self.config["termynal_type_delay"],
+            line_delay=self.config["termynal_line_delay"],
+            start_delay=self.config["termynal_start_delay"],
+            subcommands=self.config["termynal_subcommands"],
+            lazy=self.config["termynal_lazy"],
+            max_lines=self.config["termynal_max_lines"],
+            static=self.config["termynal_static"],
+            stub_imports=self.config["stub_imports"],
+            isolate_imports=self.config["isolate_imports"],
+            # Virtualenvs and interpreters by ``:python:`` name; relative to
+            # mkdocs.yml.
+            interpreters={
+                name: interpreter_path(path, _config_dir(config))
+                for name, path in self.config["interpreters"].items()
+            },
+            examples_processes=self.config["examples_processes"],
+            render_budget_ms=self.config["render_budget_ms"],
+            cache_dir=str(_config_dir(config) / cache_dir) if cache_dir else None,
+            full_docs_url=self.config["full_docs_url"],
+            # Placeholders link to pages under ``full_docs_url`` as MkDocs
+            # serves them.
+            use_directory_urls=getattr(config, "use_directory_urls", True),
+            snapshot_dir=(
+                str(_config_dir(config) / snapshot_dir) if snapshot_dir else None
+            ),
+            update_snapshots=self.config["update_snapshots"],
+            profile_imports=self.config["profile_imports"],
+            track_memory=self.config["track_memory"],
+            trace_file=self.config["trace_file"],
+            profile_threshold_ms=self.config["profile_threshold_ms"],
+            # Relative to mkdocs.yml, like ``trace_file``.
+            profile_dir=str(_config_dir(config) / self.config["profile_dir"]),
+            render_profile=(
+                str(_config_dir(config) / render_profile) if render_profile else None
+            ),
+        )
+
+    def _xrefs_enabled(self) -> bool:
+        return self.config["xrefs"] or bool(self.config["xref_inventory"])
+
     def on_pre_build(self, config, **kwargs) -> None:
-        pass
+        self._xrefs.clear()
+        self._termynal_pages.clear()
+        self._page_styles.clear()
+        self._explorer_pages.clear()
+        if self._extension is not None:
+            self._extension.explorer_models.clear()
+            if self._extension.search_records is not None:
+                self._extension.search_records.clear()
+            self._extension.report.clear()
+            if self._extension.tracer is not None:
+                self._extension.tracer.clear()
+                install(self._extension.tracer)
+
+    def on_files(self, files, config, **kwargs):
+        """Add a generated page per discovered console script."""
+        if not self.config["discover"]:
+            return files
+        from mkdocs.structure.files import File
+
+        cache_dir = self.config["cache_dir"]
+        pages = discover(
+            self.config["discover_distributions"],
+            self.config["discover_scripts"],
+            pretty=self.config["pretty"],
+            compact=self.config["compact"],
+            processes=self.config["discover_processes"],
+            cache_dir=_config_dir(config) / cache_dir if cache_dir else None,
+        )
+        for name, md in pages.items():
+            src_uri = f"{self.config['discover_dir'].strip('/')}/{name}.md"
+            if files.get_file_from_path(src_uri) is not None:
+                log.info("discover: %s exists, not generating it", src_uri)
+                continue
+            files.append(File.generated(config, src_uri, content=md))
+        log.info("discover: documented %d console scripts", len(pages))
+        return files
+
+    def on_page_markdown(self, markdown: str, page, config, files, **kwargs) -> str:
+        set_page(page.file.src_uri)
+        if self._extension is not None:
+            self._extension.prefetch(markdown)
+        return markdown
+
+    def on_page_content(self, html: str, page, config, files, **kwargs) -> str:
+        set_page("")
+        if self.config.get("termynal_assets") and TERMYNAL_CONTAINER_CLASS in html:
+            animated = 'class="termy"' in html or LAZY_BLOCK_CLASS in html
+            self._termynal_pages[page.file.src_uri] = animated
+        if RESPONSIVE_STYLE_ATTR in html:
+            html, self._page_styles[page.file.src_uri] = extract_responsive_styles(html)
+        if EXPLORER_CLASS in html:
+            self._explorer_pages.add(page.file.src_uri)
+        if self._xrefs_enabled() and self._extension is not None:
+            blocks = self._extension.search_records.get(page.file.src_uri)
+            if blocks:
+                self._xrefs.add_records(page.url, anchored_records(html, blocks))
+        return html
+
+    @event_priority(60)
+    def _resolve_xrefs(self, context, page, config, nav, **kwargs):
+        """Resolve ``typer:`` links once every page has been indexed."""
+        if self.config["xrefs"] and "typer:" in page.content:
+            page.content, unresolved = self._xrefs.resolve_links(page.content, page.url)
+            for reference in unresolved:
+                log.warning(
+                    "unresolved CLI reference 'typer:%s' on %s",
+                    reference,
+                    page.file.src_uri,
+                )
+        return context
+
+    @event_priority(50)
+    def _show_search_view(self, context, page, config, nav, **kwargs):
+        """Before the search plugin indexes the page: swap in its search view."""
+        blocks = None
+        if self._extension is not None and self._extension.search_records:
+            blocks = self._extension.search_records.get(page.file.src_uri)
+        if blocks:
+            self._page_content[page.file.src_uri] = page.content
+            page.content = search_view(
+                page.content, blocks, self.config["search_exclude_tables"]
+            )
+        return context
+
+    @event_priority(-50)
+    def _restore_content(self, context, page, config, nav, **kwargs):
+        """After the search plugin: put the rendered content back."""
+        content = self._page_content.pop(page.file.src_uri, None)
+        if content is not None:
+            page.content = content
+        return context
+
+    on_page_context = CombinedEvent(_resolve_xrefs, _show_search_view, _restore_content)
+
+    def on_post_page(self, output: str, page, config, **kwargs) -> str:
+        styles = self._page_styles.pop(page.file.src_uri, None)
+        if styles:
+            output = inject_head(output, "\n".join(styles) + "\n")
+        assets = []
+        animated = self._termynal_pages.get(page.file.src_uri)
+        if animated is not None:
+            assets.extend(
+                asset
+                for asset in termynal_assets()
+                if animated or asset.name.endswith(".css")
+            )
+        if page.file.src_uri in self._explorer_pages:
+            assets.extend(explorer_assets())
+        if not assets:
+            return output
+        return inject_assets(output, assets, page.url)
+
+    def on_post_build(self, config, **kwargs) -> None:
+        if self._extension is not None:
+            self._extension.isolation.close()
+            self._extension.interpreter_pool.close()
+            for line in self._extension.report.summary_lines():
+                log.info(line)
+            self._write_trace(config)
+            self._write_render_profile()
+        if self.config["xref_inventory"]:
+            self._write_xref_inventory(config)
+        if self._termynal_pages:
+            _write_assets(config, termynal_assets())
+        if self._explorer_pages and self._extension is not None:
+            models = self._extension.explorer_models.values()
+            _write_assets(config, [*explorer_assets(), *models])
+            if self.config["explorer_gzip"]:
+                for asset in models:
+                    target = Path(config["site_dir"], asset.path + ".gz")
+                    target.write_bytes(gzipped(asset))
+
+    def _write_xref_inventory(self, config) -> None:
+        path = Path(config["site_dir"], self.config["xref_inventory"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self._xrefs.inventory(config["site_name"]))
+        log.info("inventory of %d CLI references written to %s", len(self._xrefs), path)
+
+    def _write_trace(self, config) -> None:
+        tracer = self._extension.tracer
+        if tracer is None:
+            return
+        path = _config_dir(config) / self.config["trace_file"]
+        tracer.write(path)
+        log.info("trace of %d events written to %s", len(tracer.events), path)
+
+    def _write_render_profile(self) -> None:
+        path = self._extension.diagnostics.render_profile
+        costs = self._extension.report.render_costs
+        if not path or not costs:
+            return
+        write_render_profile(Path(path), costs)
+        log.info("render profile of %d modes written to %s", len(costs), path)
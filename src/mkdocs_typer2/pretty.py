@@ -1,11 +1,28 @@
+import hashlib
 import importlib
+import json
 import re
-from typing import List, Optional
+import weakref
+from typing import AbstractSet, Dict, Iterator, List, Optional
 
 import click
 import typer
 from pydantic import BaseModel, Field
 
+from .clicktree import command_tree
+
+# The walk's helpers under the names the rest of the package (and its tests)
+# have always imported from here.
+from .clicktree import (  # noqa: F401
+    format_choice_metavar as _format_choice_metavar,
+    format_option_default as _format_option_default,
+    format_option_name as _format_option_name,
+    format_usage as _format_usage,
+    is_group as _is_click_group,
+    short_help as _get_short_help,
+)
+from .tracing import span
+
 
 class Option(BaseModel):
     name: str
@@ -35,6 +52,43 @@ class CommandNode(BaseModel):
     subcommands: List["CommandNode"] = Field(default_factory=list)
     commands: List[CommandEntry] = Field(default_factory=list)
 
+    def structural_hash(self) -> str:
+        """Hash of everything documented about the command and its subtree.
+
+        Covers the command's own fields (help, usage, arguments, options and
+        command entries) and, Merkle-style, its subcommands' hashes: two
+        subtrees with the same hash render the same, wherever they sit, and in
+        any process. See ``structural_hashes`` to hash a whole tree at once.
+        """
+        return structural_hashes(self)[id(self)]
+
+
+#: The address in a default ``repr`` (``<FuncParamType object at 0x7f…>``),
+#: which ``Option.type`` carries for callable parameter types.
+_ADDRESS_RE = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def structural_hashes(command_node: CommandNode) -> Dict[int, str]:
+    """``CommandNode.structural_hash`` of every node of the tree, by ``id``.
+
+    Each node is hashed once, from its children's hashes.
+    """
+    hashes: Dict[int, str] = {}
+
+    def visit(node: CommandNode) -> str:
+        fields = node.model_dump(exclude={"subcommands"})
+        for option in fields["options"]:
+            if option["type"]:
+                option["type"] = _ADDRESS_RE.sub("", option["type"])
+        digest = hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8"))
+        for subcommand in node.subcommands:
+            digest.update(visit(subcommand).encode("ascii"))
+        hashes[id(node)] = digest.hexdigest()[:32]
+        return hashes[id(node)]
+
+    visit(command_node)
+    return hashes
+
 
 def resolve_click_command(module: str, name: str) -> click.core.Command:
     """Import ``module`` and resolve its Typer/Click app to a Click command.
@@ -42,7 +96,8 @@ def resolve_click_command(module: str, name: str) -> click.core.Command:
     Uses the attribute named ``name`` when given, otherwise falls back to a
     module-level ``app``. Shared by the native engine and termynal output mode.
     """
-    module_ref = importlib.import_module(module)
+    with span("import", module=module):
+        module_ref = importlib.import_module(module)
     app = getattr(module_ref, name, None) if name else None
     if app is None:
         app = getattr(module_ref, "app", None)
@@ -53,17 +108,25 @@ def resolve_click_command(module: str, name: str) -> click.core.Command:
 
 def build_tree_from_click_app(module: str, name: str) -> CommandNode:
     command = resolve_click_command(module, name)
-    return _build_tree_from_click_command(command, display_name=name or None)
+    with span("tree build"):
+        return _build_tree_from_click_command(command, display_name=name or None)
 
 
-def _is_click_group(command: object) -> bool:
-    commands = getattr(command, "commands", None)
-    return isinstance(commands, dict)
+#: Click command built for each Typer app. ``typer.main.get_command`` builds a
+#: fresh command on every call, so without this two directives for the same app
+#: would never share the per-command caches keyed on it (see termynal_render).
+_TYPER_COMMANDS: "weakref.WeakKeyDictionary[typer.Typer, click.core.Command]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def _resolve_click_command(app: object) -> click.core.Command:
     if isinstance(app, typer.Typer):
-        return typer.main.get_command(app)
+        command = _TYPER_COMMANDS.get(app)
+        if command is None:
+            with span("get_command"):
+                command = _TYPER_COMMANDS[app] = typer.main.get_command(app)
+        return command
     if isinstance(app, click.core.Command) or (
         callable(getattr(app, "get_params", None)) and getattr(app, "name", None)
     ):
@@ -71,60 +134,6 @@ def _resolve_click_command(app: object) -> click.core.Command:
     raise ValueError("Resolved object is not a Typer or Click command.")
 
 
-def _format_usage(usage_text: str) -> Optional[str]:
-    if not usage_text:
-        return None
-    first_line = usage_text.splitlines()[0]
-    if first_line.startswith("Usage: "):
-        return first_line.replace("Usage: ", "", 1).strip()
-    return first_line.strip()
-
-
-def _format_choice_metavar(option: click.Option) -> Optional[str]:
-    param_types = [option.type, getattr(option.type, "func", None)]
-    for param_type in param_types:
-        if param_type is None:
-            continue
-        choices = getattr(param_type, "choices", None)
-        if choices is not None:
-            return f"[{'|'.join(str(choice) for choice in choices)}]"
-    return None
-
-
-def _format_option_name(option: click.Option, ctx: click.Context) -> str:
-    choice_metavar = _format_choice_metavar(option)
-    if choice_metavar:
-        primary = ", ".join(option.opts)
-        if option.secondary_opts:
-            secondary = " / ".join(option.secondary_opts)
-            return f"{primary} / {secondary}"
-        return f"{primary} {choice_metavar}"
-
-    help_record = option.get_help_record(ctx)
-    if help_record:
-        return help_record[0]
-    primary = ", ".join(option.opts)
-    if option.secondary_opts:
-        secondary = " / ".join(option.secondary_opts)
-        return f"{primary} / {secondary}"
-    return primary
-
-
-def _format_option_default(option: click.Option) -> Optional[str]:
-    if option.default is None:
-        return None
-    if isinstance(option.default, bool) and option.secondary_opts:
-        if option.default is False:
-            return option.secondary_opts[0].lstrip("-")
-        return option.opts[0].lstrip("-") if option.opts else None
-    return str(option.default)
-
-
-def _get_short_help(command: click.core.Command) -> str:
-    short_help = command.get_short_help_str()
-    return short_help.strip() if short_help else ""
-
-
 _PARAM_SUFFIX_RE = re.compile(
     r"\s+\[(required|default:\s*(?P<default_value>[^\]]+))\]\s*$"
 )
@@ -156,50 +165,10 @@ def _build_tree_from_click_command(
     parent_ctx: Optional[click.Context] = None,
     display_name: Optional[str] = None,
 ) -> CommandNode:
-    info_name = display_name or command.name or ""
-    ctx = click.Context(command, info_name=info_name, parent=parent_ctx)
-    node = CommandNode(
-        name=info_name,
-        description=(command.help or "").strip(),
-        usage=_format_usage(ctx.get_usage()),
+    return CommandNode.model_validate(
+        command_tree(command, parent_ctx=parent_ctx, display_name=display_name)
     )
 
-    for param in command.params:
-        param_type = getattr(param, "param_type_name", None)
-        if param_type == "argument":
-            arg_name = getattr(param, "human_readable_name", None) or param.name
-            node.arguments.append(
-                Argument(
-                    name=arg_name,
-                    description=(getattr(param, "help", "") or "").strip(),
-                    required=param.required,
-                )
-            )
-        elif param_type == "option":
-            node.options.append(
-                Option(
-                    name=_format_option_name(param, ctx),
-                    description=(param.help or "").strip(),
-                    required=param.required,
-                    default=_format_option_default(param),
-                    type=str(param.type) if param.type else None,
-                )
-            )
-
-    if _is_click_group(command):
-        for subcommand in command.commands.values():
-            node.commands.append(
-                CommandEntry(
-                    name=subcommand.name, description=_get_short_help(subcommand)
-                )
-            )
-        for subcommand in command.commands.values():
-            node.subcommands.append(
-                _build_tree_from_click_command(subcommand, parent_ctx=ctx)
-            )
-
-    return node
-
 
 def parse_markdown_to_tree(content: str) -> CommandNode:
     lines = content.split("\n")
@@ -380,243 +349,254 @@ def parse_markdown_to_tree(content: str) -> CommandNode:
     return root
 
 
-def tree_to_markdown(command_node: CommandNode) -> str:
-    def format_table_row(*cells):
-        return f"| {' | '.join(cells)} |"
+#: Sections that ``compact`` output leaves out when they would be empty.
+_EMPTY_SECTION_RE = re.compile(
+    r"\n\n#{2,6} (Arguments|Options|Commands)\n\n?"
+    r"\*No (arguments|options|commands) available\*(?=\n|$)"
+)
 
-    def format_arguments_table(arguments: list[Argument]) -> str:
-        if not arguments:
-            return "*No arguments available*"
+#: Anchor of the "Common options" heading (the ``toc`` slug of its text).
+COMMON_OPTIONS_ANCHOR = "common-options"
 
-        rows = [format_table_row("Name", "Description", "Required")]
-        rows.append(format_table_row("---", "---", "---"))
 
-        for arg in arguments:
-            rows.append(
-                format_table_row(
-                    f"`{arg.name}`", arg.description, "Yes" if arg.required else "No"
-                )
-            )
+def _walk(command_node: CommandNode) -> Iterator[CommandNode]:
+    yield command_node
+    for subcommand in command_node.subcommands:
+        yield from _walk(subcommand)
 
-        return "\n".join(rows)
 
-    def format_options_table(options: list[Option]) -> str:
-        if not options:
-            return "*No options available*"
-
-        rows = [format_table_row("Name", "Description", "Required", "Default")]
-        rows.append(format_table_row("---", "---", "---", "---"))
-
-        for opt in options:
-            rows.append(
-                format_table_row(
-                    f"`{opt.name}`",
-                    opt.description,
-                    "Yes" if opt.required else "No",
-                    f"`{opt.default}`" if opt.default else "-",
-                )
-            )
+def _option_key(option: Option) -> str:
+    return option.model_dump_json()
 
-        return "\n".join(rows)
 
-    def format_commands_table(commands: list[CommandEntry]) -> str:
-        if not commands:
-            return "*No commands available*"
-        rows = [format_table_row("Name", "Description"), format_table_row("---", "---")]
-        for cmd in commands:
-            rows.append(format_table_row(f"`{cmd.name}`", cmd.description))
-        return "\n".join(rows)
+def common_options(command_node: CommandNode, min_commands: int = 2) -> List[Option]:
+    """Options identical in every field on at least ``min_commands`` commands.
 
-    def format_usage(cmd_name: str, usage: Optional[str]) -> str:
-        if not usage:
-            return "*No usage specified*"
+    Shared callbacks and parameter lists (and ``--help`` in Typer's own
+    Markdown) repeat the same option on every command of a tree; ``compact``
+    output documents these once instead.
+    """
+    counts: Dict[str, int] = {}
+    first: Dict[str, Option] = {}
+    for node in _walk(command_node):
+        for key, option in {_option_key(o): o for o in node.options}.items():
+            counts[key] = counts.get(key, 0) + 1
+            first.setdefault(key, option)
+    return [option for key, option in first.items() if counts[key] >= min_commands]
 
-        return f"`{usage}`"
 
-    # Build the markdown content
-    parts = [
-        f"# {command_node.name}",
-        "",
-        command_node.description
-        if command_node.description
-        else "*No description available*",
-        "",
-        "## Usage\n",
-        format_usage(command_node.name, command_node.usage),
-        "",
-        "## Arguments\n",
-        format_arguments_table(command_node.arguments),
-        "",
-        "## Options\n",
-        format_options_table(command_node.options),
-        "",
-        "## Commands\n",
-        format_commands_table(command_node.commands),
-    ]
+def _common_options_reference(shared: List[Option]) -> str:
+    names = ", ".join(f"`{option.name}`" for option in shared)
+    return f"[Common options](#{COMMON_OPTIONS_ANCHOR}): {names}"
+
+
+def _compacted(markdown_text: str) -> str:
+    return _EMPTY_SECTION_RE.sub("", markdown_text)
+
+
+#: Deepest subcommand level the Markdown renderers document (the root is 0).
+SUBCOMMAND_DEPTH = 2
+
 
-    # Add subcommands if they exist
-    if command_node.subcommands:
-        parts.extend(["", "## Subcommands"])
-
-        for subcmd in command_node.subcommands:
-            parts.extend(
-                [
-                    "",
-                    f"### {subcmd.name}",
-                    "",
-                    subcmd.description
-                    if subcmd.description
-                    else "*No description available*",
-                    "",
-                    "#### Usage",
-                    format_usage(f"{command_node.name} {subcmd.name}", subcmd.usage),
-                    "",
-                    "#### Arguments",
-                    format_arguments_table(subcmd.arguments),
-                    "",
-                    "#### Options",
-                    format_options_table(subcmd.options),
-                ]
+def _table_row(*cells):
+    return f"| {' | '.join(cells)} |"
+
+
+def _arguments_table(arguments: list[Argument]) -> str:
+    if not arguments:
+        return "*No arguments available*"
+
+    rows = [_table_row("Name", "Description", "Required")]
+    rows.append(_table_row("---", "---", "---"))
+
+    for arg in arguments:
+        rows.append(
+            _table_row(
+                f"`{arg.name}`", arg.description, "Yes" if arg.required else "No"
             )
-            # Recursively render nested subcommands
-            if subcmd.subcommands:
-                parts.extend(["", "#### Subcommands"])
-                for nested_subcmd in subcmd.subcommands:
-                    parts.extend(
-                        [
-                            "",
-                            f"##### {nested_subcmd.name}",
-                            "",
-                            nested_subcmd.description
-                            if nested_subcmd.description
-                            else "*No description available*",
-                            "",
-                            "###### Usage",
-                            format_usage(
-                                f"{command_node.name} {subcmd.name} {nested_subcmd.name}",
-                                nested_subcmd.usage,
-                            ),
-                            "",
-                            "###### Arguments",
-                            format_arguments_table(nested_subcmd.arguments),
-                            "",
-                            "###### Options",
-                            format_options_table(nested_subcmd.options),
-                        ]
-                    )
+        )
 
-    return "\n".join(parts)
+    return "\n".join(rows)
 
 
-def tree_to_markdown_list(command_node: CommandNode) -> str:
-    def format_arguments_list(arguments: list[Argument]) -> str:
-        if not arguments:
-            return "*No arguments available*"
-        lines = []
-        for arg in arguments:
-            line = f"* `{arg.name}`"
-            if arg.description:
-                line += f": {arg.description}"
-            if arg.required:
-                line += "  [required]"
-            lines.append(line)
-        return "\n".join(lines)
-
-    def format_options_list(options: list[Option]) -> str:
+def _options_table(
+    options: list[Option], common: AbstractSet[str] = frozenset(), factor: bool = True
+) -> str:
+    shared = [opt for opt in options if factor and _option_key(opt) in common]
+    if shared:
+        options = [opt for opt in options if _option_key(opt) not in common]
+        reference = _common_options_reference(shared)
         if not options:
-            return "*No options available*"
-        lines = []
-        for opt in options:
-            line = f"* `{opt.name}`"
-            if opt.description:
-                line += f": {opt.description}"
-            if opt.required:
-                line += "  [required]"
-            elif opt.default:
-                line += f"  [default: {opt.default}]"
-            lines.append(line)
-        return "\n".join(lines)
-
-    def format_commands_list(commands: list[CommandEntry]) -> str:
-        if not commands:
-            return "*No commands available*"
-        lines = []
-        for cmd in commands:
-            line = f"* `{cmd.name}`"
-            if cmd.description:
-                line += f": {cmd.description}"
-            lines.append(line)
-        return "\n".join(lines)
-
-    def format_usage(usage: Optional[str]) -> str:
-        if not usage:
-            return "*No usage specified*"
-        return f"`{usage}`"
-
+            return reference
+        return f"{_options_table(options)}\n\n{reference}"
+    if not options:
+        return "*No options available*"
+
+    rows = [_table_row("Name", "Description", "Required", "Default")]
+    rows.append(_table_row("---", "---", "---", "---"))
+
+    for opt in options:
+        rows.append(
+            _table_row(
+                f"`{opt.name}`",
+                opt.description,
+                "Yes" if opt.required else "No",
+                f"`{opt.default}`" if opt.default else "-",
+            )
+        )
+
+    return "\n".join(rows)
+
+
+def _commands_table(commands: list[CommandEntry]) -> str:
+    if not commands:
+        return "*No commands available*"
+    rows = [_table_row("Name", "Description"), _table_row("---", "---")]
+    for cmd in commands:
+        rows.append(_table_row(f"`{cmd.name}`", cmd.description))
+    return "\n".join(rows)
+
+
+def _arguments_list(arguments: list[Argument]) -> str:
+    if not arguments:
+        return "*No arguments available*"
+    lines = []
+    for arg in arguments:
+        line = f"* `{arg.name}`"
+        if arg.description:
+            line += f": {arg.description}"
+        if arg.required:
+            line += "  [required]"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _options_list(
+    options: list[Option], common: AbstractSet[str] = frozenset(), factor: bool = True
+) -> str:
+    shared = [opt for opt in options if factor and _option_key(opt) in common]
+    if shared:
+        options = [opt for opt in options if _option_key(opt) not in common]
+        reference = _common_options_reference(shared)
+        if not options:
+            return reference
+        return f"{_options_list(options)}\n\n{reference}"
+    if not options:
+        return "*No options available*"
+    lines = []
+    for opt in options:
+        line = f"* `{opt.name}`"
+        if opt.description:
+            line += f": {opt.description}"
+        if opt.required:
+            line += "  [required]"
+        elif opt.default:
+            line += f"  [default: {opt.default}]"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _commands_list(commands: list[CommandEntry]) -> str:
+    if not commands:
+        return "*No commands available*"
+    lines = []
+    for cmd in commands:
+        line = f"* `{cmd.name}`"
+        if cmd.description:
+            line += f": {cmd.description}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _usage_markdown(usage: Optional[str]) -> str:
+    if not usage:
+        return "*No usage specified*"
+    return f"`{usage}`"
+
+
+def section_markdown(
+    command_node: CommandNode,
+    depth: int = 0,
+    pretty: bool = True,
+    common: AbstractSet[str] = frozenset(),
+) -> str:
+    """One command's own section, without its subcommands.
+
+    ``depth`` is the command's level below the root (0), which sets its heading
+    levels; ``common`` holds the ``_option_key`` of the options that compact
+    output documents once, under "Common options".
+    """
+    if pretty:
+        arguments, options, commands = _arguments_table, _options_table, _commands_table
+    else:
+        arguments, options, commands = _arguments_list, _options_list, _commands_list
+    title, heading = "#" * (1 + 2 * depth), "#" * (2 + 2 * depth)
+    # The root's section headings are followed by a blank line, a subcommand's
+    # are not.
+    gap = "" if depth else "\n"
     parts = [
-        f"# {command_node.name}",
+        f"{title} {command_node.name}",
         "",
         command_node.description
         if command_node.description
         else "*No description available*",
         "",
-        "## Usage\n",
-        format_usage(command_node.usage),
-        "",
-        "## Arguments\n",
-        format_arguments_list(command_node.arguments),
+        f"{heading} Usage{gap}",
+        _usage_markdown(command_node.usage),
         "",
-        "## Options\n",
-        format_options_list(command_node.options),
+        f"{heading} Arguments{gap}",
+        arguments(command_node.arguments),
         "",
-        "## Commands\n",
-        format_commands_list(command_node.commands),
+        f"{heading} Options{gap}",
+        options(command_node.options, common),
     ]
+    if not depth:
+        parts.extend(["", "## Commands\n", commands(command_node.commands)])
+    return "\n".join(parts)
 
-    if command_node.subcommands:
-        parts.extend(["", "## Subcommands"])
-
-        for subcmd in command_node.subcommands:
-            parts.extend(
-                [
-                    "",
-                    f"### {subcmd.name}",
-                    "",
-                    subcmd.description
-                    if subcmd.description
-                    else "*No description available*",
-                    "",
-                    "#### Usage",
-                    format_usage(subcmd.usage),
-                    "",
-                    "#### Arguments",
-                    format_arguments_list(subcmd.arguments),
-                    "",
-                    "#### Options",
-                    format_options_list(subcmd.options),
-                ]
-            )
-            if subcmd.subcommands:
-                parts.extend(["", "#### Subcommands"])
-                for nested_subcmd in subcmd.subcommands:
-                    parts.extend(
-                        [
-                            "",
-                            f"##### {nested_subcmd.name}",
-                            "",
-                            nested_subcmd.description
-                            if nested_subcmd.description
-                            else "*No description available*",
-                            "",
-                            "###### Usage",
-                            format_usage(nested_subcmd.usage),
-                            "",
-                            "###### Arguments",
-                            format_arguments_list(nested_subcmd.arguments),
-                            "",
-                            "###### Options",
-                            format_options_list(nested_subcmd.options),
-                        ]
-                    )
 
-    return "\n".join(parts)
+def subcommands_heading(depth: int) -> str:
+    """The heading over the subcommands of a command at ``depth``."""
+    return f"{'#' * (2 + 2 * depth)} Subcommands"
+
+
+def common_options_markdown(shared: List[Option], pretty: bool = True) -> str:
+    """The "Common options" section that compact output ends with."""
+    options = _options_table if pretty else _options_list
+    return f"## Common options\n\n{options(shared, factor=False)}"
+
+
+def _subtree_markdown(
+    command_node: CommandNode, depth: int, pretty: bool, common: AbstractSet[str]
+) -> str:
+    text = section_markdown(command_node, depth, pretty, common)
+    if command_node.subcommands and depth < SUBCOMMAND_DEPTH:
+        text += f"\n\n{subcommands_heading(depth)}" + "".join(
+            "\n\n" + _subtree_markdown(subcommand, depth + 1, pretty, common)
+            for subcommand in command_node.subcommands
+        )
+    return text
+
+
+def _tree_markdown(command_node: CommandNode, pretty: bool, compact: bool) -> str:
+    shared_options = common_options(command_node) if compact else []
+    common = {_option_key(option) for option in shared_options}
+    markdown_text = _subtree_markdown(command_node, 0, pretty, common)
+    if shared_options:
+        markdown_text += "\n\n" + common_options_markdown(shared_options, pretty)
+    return _compacted(markdown_text) if compact else markdown_text
+
+
+def tree_to_markdown(command_node: CommandNode, compact: bool = False) -> str:
+    """Render the tree as Markdown tables.
+
+    ``compact`` documents options shared by several commands once, in a
+    "Common options" table that the commands reference, and leaves out empty
+    Arguments, Options and Commands sections.
+    """
+    return _tree_markdown(command_node, True, compact)
+
+
+def tree_to_markdown_list(command_node: CommandNode, compact: bool = False) -> str:
+    """Render the tree as Markdown lists; ``compact`` as in ``tree_to_markdown``."""
+    return _tree_markdown(command_node, False, compact)
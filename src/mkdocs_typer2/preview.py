@@ -0,0 +1,356 @@
+"""Serve one CLI's docs on localhost and refresh them as its source changes.
+
+``python -m mkdocs_typer2.preview mycli.main:app`` renders the app's reference
+(the ``native`` engine's Markdown, or ``--termynal`` help blocks) on a single
+page, then watches every ``.py`` file of its package (``source_files``). When
+one changes, only the modules that need it are imported again: the changed
+ones, the app's own module, and every module that holds an object defined in
+one of those (found by identity, to a fixed point). Third-party imports and the
+rest of the package stay loaded. Markdown is converted through a
+``FragmentCache`` that lives as long as the server, so only the commands whose
+subtree changed are converted again. The page receives the new HTML over
+server-sent events and swaps it in without reloading.
+
+A change that fails to import or render shows its traceback on the page until
+the next change fixes it.
+"""
+
+import html
+import importlib
+import importlib.util
+import json
+import sys
+import threading
+import time
+import traceback
+import types
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
+
+import typer
+
+from .assets import termynal_assets
+from .cache import source_files
+from .fragments import FragmentCache, tree_html
+from .pretty import build_tree_from_click_app
+from .report import log
+from .termynal_render import TermynalOptions, render_termynal_html
+
+#: Values never identified with the module that holds them.
+_SHARED_TYPES = (
+    types.ModuleType,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    bool,
+    tuple,
+    frozenset,
+    type(None),
+)
+
+#: ``id`` of the container the page swaps updates into.
+CONTENT_ID = "typer-preview"
+
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; max-width: 60rem; margin: 2rem auto;
+  padding: 0 1rem; line-height: 1.5; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: .25rem .5rem; text-align: left; }}
+code, pre {{ background: #f4f4f4; }}
+.typer-preview-error {{ color: #a00; white-space: pre-wrap; }}
+{css}
+</style></head>
+<body>
+<div id="{content_id}">{content}</div>
+<script>
+new EventSource("/events").onmessage = (event) => {{
+  const update = JSON.parse(event.data);
+  document.getElementById("{content_id}").innerHTML = update.html;
+}};
+</script>
+</body></html>
+"""
+
+
+def _names(module: types.ModuleType) -> Iterable[Tuple[str, object]]:
+    return (
+        (key, value)
+        for key, value in vars(module).items()
+        if not (key.startswith("__") and key.endswith("__"))
+    )
+
+
+def _owned(module: types.ModuleType) -> Set[int]:
+    """``id`` of the module and of the objects it defines or holds.
+
+    Functions and classes count for the module they were defined in; other
+    objects (a ``typer.Typer()``, a shared console …) for every module holding
+    them, which at worst imports a module again needlessly.
+    """
+    owned = {id(module)}
+    for _, value in _names(module):
+        if isinstance(value, _SHARED_TYPES):
+            continue
+        if isinstance(value, (type, types.FunctionType)):
+            if getattr(value, "__module__", None) != module.__name__:
+                continue
+        owned.add(id(value))
+    return owned
+
+
+def _refers_to(module: types.ModuleType, owned: Set[int]) -> bool:
+    return any(id(value) in owned for _, value in _names(module))
+
+
+def affected_modules(
+    changed: Iterable[str], target: str, modules: Mapping[str, types.ModuleType]
+) -> Set[str]:
+    """``changed`` and ``target`` plus every one of ``modules`` that holds
+    something of theirs, to a fixed point."""
+    affected = set(changed) | {target}
+    while True:
+        owned: Set[int] = set()
+        for name in affected:
+            if name in modules:
+                owned |= _owned(modules[name])
+        more = {
+            name
+            for name, module in modules.items()
+            if name not in affected and _refers_to(module, owned)
+        }
+        if not more:
+            return affected
+        affected |= more
+
+
+def _stats(paths: Iterable[Path]) -> Dict[Path, Tuple[int, int]]:
+    stats = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stats[path.resolve()] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
+def _module_file(module: types.ModuleType) -> Optional[Path]:
+    filename = getattr(module, "__file__", None)
+    return Path(filename).resolve() if filename else None
+
+
+class Preview:
+    """One CLI's rendered docs, rendered again whenever its source changes."""
+
+    def __init__(
+        self,
+        module: str,
+        name: str = "",
+        termynal: bool = False,
+        pretty: bool = True,
+        options: Optional[TermynalOptions] = None,
+    ) -> None:
+        self.module = module
+        self.name = name
+        self.termynal = termynal
+        self.pretty = pretty
+        # Animation would restart on every update: show finished frames.
+        self.options = replace(options or TermynalOptions(), static=True)
+        self.fragment_cache = FragmentCache()
+        self.version = 0
+        self.html = ""
+        self._updated = threading.Condition()
+        self._stats = _stats(source_files(module) or ())
+        self.render()
+
+    def render(self) -> None:
+        """Render the docs and hand them to the waiting pages."""
+        started = time.perf_counter()
+        try:
+            if self.termynal:
+                content = render_termynal_html(self.module, self.name, self.options)
+            else:
+                tree = build_tree_from_click_app(self.module, self.name)
+                content, _ = tree_html(tree, self.pretty, cache=self.fragment_cache)
+                content = f'<div class="typer-docs">{content}</div>'
+        except Exception:
+            log.warning("preview of %s failed", self.module, exc_info=True)
+            content = (
+                '<pre class="typer-preview-error">'
+                f"{html.escape(traceback.format_exc())}</pre>"
+            )
+        log.info(
+            "rendered %s in %.0f ms", self.module, (time.perf_counter() - started) * 1e3
+        )
+        with self._updated:
+            self.html = content
+            self.version += 1
+            self._updated.notify_all()
+
+    def reload(self, paths: Iterable[Path]) -> Set[str]:
+        """Import the modules that changed ``paths`` affect again."""
+        paths = set(paths)
+        for path in paths:
+            # A same-size edit within the mtime's resolution would otherwise
+            # load the stale bytecode.
+            try:
+                Path(importlib.util.cache_from_source(str(path))).unlink()
+            except (OSError, NotImplementedError, ValueError):
+                pass
+        watched = set(self._stats) | paths
+        modules = {
+            name: module
+            for name, module in list(sys.modules.items())
+            if _module_file(module) in watched
+        }
+        changed = [
+            name for name, module in modules.items() if _module_file(module) in paths
+        ]
+        affected = affected_modules(changed, self.module, modules)
+        for name in affected:
+            sys.modules.pop(name, None)
+        importlib.invalidate_caches()
+        try:
+            importlib.import_module(self.module)
+        finally:
+            log.info("reloaded %s", ", ".join(sorted(affected)))
+        return affected
+
+    def poll(self) -> bool:
+        """Reload and render if a source file changed since the last poll."""
+        stats = _stats(source_files(self.module) or ())
+        paths = {
+            path
+            for path in set(stats) | set(self._stats)
+            if stats.get(path) != self._stats.get(path)
+        }
+        if not paths:
+            return False
+        self._stats = stats
+        try:
+            self.reload(paths)
+        except Exception:
+            # ``render`` shows the import error.
+            pass
+        self.render()
+        return True
+
+    def wait(self, version: int, timeout: float) -> Tuple[int, str]:
+        """The version and HTML once newer than ``version``, or at ``timeout``."""
+        with self._updated:
+            self._updated.wait_for(lambda: self.version != version, timeout)
+            return self.version, self.html
+
+    def page(self) -> str:
+        css = termynal_assets()[0].content if self.termynal else ""
+        return _PAGE.format(
+            title=html.escape(f"{self.module} preview"),
+            css=css,
+            content_id=CONTENT_ID,
+            content=self.html,
+        )
+
+
+def _handler(preview: Preview) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path == "/":
+                self._send("text/html", preview.page())
+            elif self.path == "/content":
+                self._send("text/html", preview.html)
+            elif self.path == "/events":
+                self._events()
+            else:
+                self.send_error(404)
+
+        def _send(self, content_type: str, body: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _events(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            version = -1
+            try:
+                while True:
+                    latest, content = preview.wait(version, 15)
+                    if latest == version:
+                        # Finds out when the page has gone.
+                        self.wfile.write(b": keep-alive\n\n")
+                    else:
+                        update = json.dumps({"version": latest, "html": content})
+                        self.wfile.write(f"data: {update}\n\n".encode("utf-8"))
+                        version = latest
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+        def log_message(self, format: str, *args) -> None:
+            log.debug(format, *args)
+
+    return Handler
+
+
+def make_server(preview: Preview, host: str, port: int) -> ThreadingHTTPServer:
+    """An HTTP server for ``preview``: the page, its content and its events."""
+    server = ThreadingHTTPServer((host, port), _handler(preview))
+    server.daemon_threads = True
+    return server
+
+
+def watch(preview: Preview, interval: float, stop: threading.Event) -> None:
+    """Poll ``preview``'s source every ``interval`` seconds until ``stop``."""
+    while not stop.wait(interval):
+        preview.poll()
+
+
+app = typer.Typer(add_completion=False)
+
+
+@app.command()
+def main(
+    target: str = typer.Argument(..., help="The CLI, as module:app."),
+    termynal: bool = typer.Option(False, help="Show --help as termynal blocks."),
+    pretty: bool = typer.Option(True, help="Markdown tables, else lists."),
+    subcommands: int = typer.Option(
+        -1, help="Termynal subcommand depth (-1: every level)."
+    ),
+    host: str = typer.Option("127.0.0.1", help="Address to serve on."),
+    port: int = typer.Option(8000, help="Port to serve on."),
+    interval: float = typer.Option(0.2, help="Seconds between source checks."),
+):
+    """Serve a CLI's docs and refresh them as its source changes."""
+    module, _, name = target.partition(":")
+    # Modules are imported the way ``python -m`` would find them.
+    if "" not in sys.path:
+        sys.path.insert(0, "")
+    preview = Preview(
+        module, name, termynal, pretty, TermynalOptions(subcommands=subcommands)
+    )
+    server = make_server(preview, host, port)
+    stop = threading.Event()
+    threading.Thread(target=watch, args=(preview, interval, stop), daemon=True).start()
+    typer.echo(f"Serving {module} on http://{host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,294 @@
+"""Profiling of the modules and directives documented by a build.
+
+Importing the documented CLI module is often the most expensive step of a docs
+build, and the cost usually hides in transitive imports. ``profile_imports``
+imports the module in a fresh interpreter under ``-X importtime`` and folds the
+per-module timings into a per-package breakdown, so a CLI author can see what
+is worth importing lazily.
+
+For everything else, ``profile_if_slow`` runs a directive under ``cProfile``
+and keeps a ``.pstats`` file only when the directive turned out slower than a
+threshold, so a slow page can be investigated without re-running the whole
+build under a profiler. Work the directive hands to other threads runs under
+``profile_thread``, which adds it to the same file.
+
+``RenderCost`` totals what directives of one output mode cost in a real build
+(time and output size per rendered unit). Saved as a *render profile*, they
+let ``plan`` estimate a change's cost without rendering anything.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Written to stderr right before the profiled import, so everything the
+# interpreter imported during startup (``site``, ``encodings`` …) can be
+# dropped from the breakdown.
+_IMPORT_MARKER = "mkdocs-typer2: begin profiled import"
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+
+
+@dataclass
+class ImportProfile:
+    """Per-package import cost of one module, in microseconds.
+
+    ``packages`` maps each top-level package (``rich`` for ``rich.console``) to
+    the summed *self* time of its modules, so the values add up to ``total_us``.
+    """
+
+    module: str
+    total_us: int = 0
+    packages: Dict[str, int] = field(default_factory=dict)
+    error: str = ""
+
+    def slowest(self, count: int) -> List[Tuple[str, int]]:
+        ranked = sorted(self.packages.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:count]
+
+
+def _parse_importtime(stderr: str) -> Dict[str, int]:
+    """Sum ``-X importtime`` self times per top-level package after the marker."""
+    packages: Dict[str, int] = {}
+    lines = stderr.splitlines()
+    if _IMPORT_MARKER in lines:
+        lines = lines[lines.index(_IMPORT_MARKER) + 1 :]
+    for line in lines:
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        package = match.group(3).split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + int(match.group(1))
+    return packages
+
+
+def profile_imports(
+    module: str, stub_imports: Sequence[str] = (), python: str = ""
+) -> ImportProfile:
+    """Import ``module`` in a child interpreter and profile its imports.
+
+    The child runs the same executable with this interpreter's ``sys.path``, so
+    it resolves the module exactly as the build does but starts from a cold
+    ``sys.modules`` (an in-process measurement would miss anything the build
+    already imported). ``stub_imports`` are stubbed in the child just as they
+    are during rendering. With ``python`` (a ``:python:`` interpreter) the child
+    is that interpreter with its own ``sys.path``, the working directory first,
+    as its tree worker imports the module. A failed import is reported through
+    ``error`` rather than raised: profiling must never break the build it is
+    observing.
+    """
+    code = "import sys"
+    if stub_imports:
+        code += (
+            "; from mkdocs_typer2.stubs import StubFinder"
+            f"; sys.meta_path.insert(0, StubFinder({list(stub_imports)!r}))"
+        )
+    code += f"; print({_IMPORT_MARKER!r}, file=sys.stderr); import {module}"
+    env = None
+    if not python:
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    try:
+        result = subprocess.run(
+            [python or sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+    except OSError as exc:
+        return ImportProfile(module=module, error=f"cannot start '{python}': {exc}")
+    packages = _parse_importtime(result.stderr)
+    profile = ImportProfile(
+        module=module, total_us=sum(packages.values()), packages=packages
+    )
+    if result.returncode != 0:
+        profile.error = result.stderr.strip().splitlines()[-1] if result.stderr else ""
+    return profile
+
+
+#: Characters kept in ``.pstats`` file names; anything else becomes ``_``.
+_FILENAME_UNSAFE_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+@dataclass
+class SlowDirective:
+    """A directive that exceeded ``profile_threshold_ms``.
+
+    ``path`` is its ``.pstats`` file, or empty when another profiler was
+    already active and only the timing could be recorded.
+    """
+
+    label: str
+    page: str
+    elapsed_ms: float
+    path: str = ""
+
+
+def _stats_path(
+    directory: Path, page: str, label: str, slow: List[SlowDirective]
+) -> Path:
+    """``<page>--<module>.pstats`` in ``directory``, numbered if ``slow``
+    already holds it.
+
+    Only this build's records count, so a rebuild overwrites the last one's
+    files instead of adding more.
+    """
+    page_part = page.rsplit(".", 1)[0] if page else "no-page"
+    stem = _FILENAME_UNSAFE_RE.sub("_", f"{page_part}--{label}")
+    taken = {record.path for record in slow}
+    path = directory / f"{stem}.pstats"
+    counter = 2
+    while str(path) in taken:
+        path = directory / f"{stem}-{counter}.pstats"
+        counter += 1
+    return path
+
+
+#: The thread running the ``profile_if_slow`` block the context runs in, and
+#: the finished profilers of the other threads it used (``profile_thread``);
+#: ``None`` outside one.
+_THREAD_PROFILERS: ContextVar[Optional[Tuple[int, List[cProfile.Profile]]]] = (
+    ContextVar("mkdocs_typer2_thread_profilers", default=None)
+)
+
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """Profile the ``with`` block for the enclosing ``profile_if_slow``.
+
+    For a directive's work in another thread (run with a copy of the block's
+    context): before Python 3.12 a profiler only sees the thread that enabled
+    it. From 3.12 the block's own profiler sees every thread, and this one
+    fails to start and is left out.
+    """
+    session = _THREAD_PROFILERS.get()
+    profiler = None
+    # The block's own thread is profiled already.
+    if session is not None and session[0] != threading.get_ident():
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            session[1].append(profiler)
+
+
+@contextmanager
+def profile_if_slow(
+    label: str,
+    page: str,
+    threshold_ms: float,
+    directory: Path,
+    slow: List[SlowDirective],
+) -> Iterator[None]:
+    """Profile the ``with`` block; keep the stats only if it was slow.
+
+    Whether a directive is slow is only known once it has run, so the whole
+    block runs under ``cProfile`` (which inflates its time somewhat), and a
+    ``SlowDirective`` is appended to ``slow`` when it took ``threshold_ms`` or
+    longer.
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler (e.g. the whole build's) is active
+        profiler = None
+    thread_profilers: List[cProfile.Profile] = []
+    token = _THREAD_PROFILERS.set(
+        (threading.get_ident(), thread_profilers) if profiler is not None else None
+    )
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        _THREAD_PROFILERS.reset(token)
+        if profiler is not None:
+            profiler.disable()
+        if elapsed_ms >= threshold_ms:
+            record = SlowDirective(label=label, page=page, elapsed_ms=elapsed_ms)
+            if profiler is not None:
+                directory.mkdir(parents=True, exist_ok=True)
+                path = _stats_path(directory, page, label, slow)
+                stats = pstats.Stats(profiler)
+                # A render abandoned over budget is still running: left out.
+                for thread_profiler in list(thread_profilers):
+                    stats.add(thread_profiler)
+                stats.dump_stats(path)
+                record.path = str(path)
+            slow.append(record)
+
+
+@dataclass
+class RenderCost:
+    """Accumulated cost of the directives rendered in one output mode.
+
+    A *unit* is what the cost scales with: a termynal block in termynal mode,
+    a documented command in the Markdown engines, the directive itself in
+    ``legacy`` (whose ``typer`` subprocess dominates).
+    """
+
+    units: int = 0
+    ms: float = 0.0
+    bytes: int = 0
+
+    def add(self, units: int, ms: float, size: int) -> None:
+        self.units += units
+        self.ms += ms
+        self.bytes += size
+
+    def ms_per_unit(self) -> float:
+        return self.ms / self.units if self.units else 0.0
+
+    def bytes_per_unit(self) -> float:
+        return self.bytes / self.units if self.units else 0.0
+
+
+def load_render_profile(path: Path) -> Dict[str, RenderCost]:
+    """Per-mode costs saved by ``write_render_profile`` (empty if missing)."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {
+        mode: RenderCost(int(cost["units"]), float(cost["ms"]), int(cost["bytes"]))
+        for mode, cost in data.get("modes", {}).items()
+    }
+
+
+def write_render_profile(path: Path, costs: Dict[str, RenderCost]) -> None:
+    """Save ``costs``, replacing those modes and keeping the file's others.
+
+    Each build replaces a mode's totals rather than adding to them, so the
+    profile follows the CLI as it changes.
+    """
+    merged = {**load_render_profile(path), **costs}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "modes": {
+                    mode: {"units": cost.units, "ms": cost.ms, "bytes": cost.bytes}
+                    for mode, cost in sorted(merged.items())
+                }
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
@@ -0,0 +1,116 @@
+"""Build-wide diagnostics collected while directives render.
+
+``TyperExtension`` owns one ``BuildReport`` and hands it to its processor; the
+MkDocs plugin resets it before each build and logs ``summary_lines()`` at the
+end. Without the plugin (e.g. under Zensical) the report is still filled in and
+can be read from the extension instance.
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .memory import MemoryUsage
+from .profiling import ImportProfile, RenderCost, SlowDirective
+
+#: Shared logger, in MkDocs' plugin namespace so MkDocs shows its records.
+log = logging.getLogger("mkdocs.plugins.mkdocs_typer2")
+
+#: How many packages the summary lists per profiled module.
+SLOWEST_IMPORTS = 5
+
+#: How many directives the summary lists by memory growth.
+LARGEST_DIRECTIVES = 5
+
+
+@dataclass
+class DiagnosticsOptions:
+    """Opt-in build diagnostics (plugin config / extension kwargs).
+
+    ``profile_imports`` profiles each documented module's import once per
+    build (see ``profiling.profile_imports``); ``track_memory`` measures what
+    each directive adds to the build's memory (see ``memory.measure_memory``);
+    ``trace_file`` is where the MkDocs plugin writes the build's trace-event
+    timeline (see ``tracing``). Directives slower than ``profile_threshold_ms``
+    leave a ``.pstats`` file in ``profile_dir`` (see
+    ``profiling.profile_if_slow``). With ``render_profile`` set, what each
+    output mode cost is saved there for ``plan`` estimates.
+    """
+
+    profile_imports: bool = False
+    track_memory: bool = False
+    trace_file: Optional[str] = None
+    profile_threshold_ms: Optional[float] = None
+    profile_dir: str = "typer-profiles"
+    render_profile: Optional[str] = None
+
+
+@dataclass
+class EngineChoice:
+    """Which path ``engine: auto`` took for one directive."""
+
+    label: str
+    page: str
+    path: str
+
+
+@dataclass
+class BuildReport:
+    import_profiles: Dict[str, ImportProfile] = field(default_factory=dict)
+    memory: List[MemoryUsage] = field(default_factory=list)
+    slow_directives: List[SlowDirective] = field(default_factory=list)
+    render_costs: Dict[str, RenderCost] = field(default_factory=dict)
+    engine_choices: List[EngineChoice] = field(default_factory=list)
+
+    def clear(self) -> None:
+        self.import_profiles.clear()
+        self.memory.clear()
+        self.slow_directives.clear()
+        self.render_costs.clear()
+        self.engine_choices.clear()
+
+    def add_render_cost(self, mode: str, units: int, ms: float, size: int) -> None:
+        self.render_costs.setdefault(mode, RenderCost()).add(units, ms, size)
+
+    def summary_lines(self) -> List[str]:
+        """Human-readable end-of-build summary, one entry per line."""
+        lines: List[str] = []
+        for module, profile in sorted(self.import_profiles.items()):
+            if profile.error:
+                lines.append(f"import profile of {module} failed: {profile.error}")
+                continue
+            slowest = ", ".join(
+                f"{package} {us / 1000:.1f} ms"
+                for package, us in profile.slowest(SLOWEST_IMPORTS)
+            )
+            lines.append(
+                f"import {module}: {profile.total_us / 1000:.1f} ms "
+                f"(slowest: {slowest})"
+            )
+        if self.memory:
+            largest = sorted(self.memory, key=lambda usage: -usage.rss_delta)
+            for usage in largest[:LARGEST_DIRECTIVES]:
+                lines.append(f"memory {usage.label}: {usage.describe()}")
+            total = MemoryUsage(
+                f"total over {len(self.memory)} directives",
+                rss_delta=sum(usage.rss_delta for usage in self.memory),
+                allocated=sum(usage.allocated for usage in self.memory),
+                peak=max(usage.peak for usage in self.memory),
+            )
+            lines.append(f"memory {total.label}: {total.describe()}")
+        for slow in self.slow_directives:
+            line = (
+                f"slow directive {slow.label} on {slow.page or '?'}: "
+                f"{slow.elapsed_ms:.0f} ms"
+            )
+            if slow.path:
+                line += f", profile written to {slow.path}"
+            lines.append(line)
+        if self.engine_choices:
+            counts = Counter(choice.path for choice in self.engine_choices)
+            lines.append(
+                "engine auto: "
+                + ", ".join(f"{count} {path}" for path, count in counts.most_common())
+            )
+        return lines
@@ -0,0 +1,218 @@
+"""Compact search records for generated CLI docs.
+
+The search plugin indexes a page's full text, section by section, so every
+option table of a large CLI ends up in ``search_index.json``. With
+``search_records`` on, each rendered ``CommandNode`` also yields one
+``SearchRecord`` (command path, usage, short help and option names), and the
+MkDocs plugin shows the search plugin a *search view* of each page in which
+every command heading is followed by its record's text. With
+``search_exclude_tables``, the view replaces each block's own content with just
+its command headings and records, so table bodies stay out of the index while
+every command remains findable at its anchor. The rendered page is unchanged.
+
+Trees are turned into records where they are built: ``collect`` adds records to
+the list opened by the innermost ``collecting`` block of the current context,
+and does nothing outside one.
+"""
+
+import html
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Match, Optional, Tuple
+
+from .pretty import CommandNode
+
+#: Opening tag of the wrapper ``TyperProcessor`` puts around Markdown output.
+BLOCK_START = '<div class="typer-docs">'
+
+_DIV_RE = re.compile(r"<div\b|</div>")
+_HEADING_RE = re.compile(
+    r'<h([1-6])[^>]*\sid="([^"]+)"[^>]*>(.*?)</h\1>', re.DOTALL | re.IGNORECASE
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_OPTION_NAME_RE = re.compile(r"-{1,2}[\w-]+")
+
+_RECORDS: ContextVar[Optional[List["SearchRecord"]]] = ContextVar(
+    "mkdocs_typer2_search_records", default=None
+)
+
+
+@dataclass
+class SearchRecord:
+    """What the search index gets for one command."""
+
+    name: str
+    path: str
+    usage: str = ""
+    help: str = ""
+    options: List[str] = field(default_factory=list)
+
+    def text(self) -> str:
+        # Usage lines start with the command path already.
+        lead = (
+            [self.usage]
+            if self.usage.startswith(self.path)
+            else [self.path, self.usage]
+        )
+        return " ".join(part for part in (*lead, self.help, *self.options) if part)
+
+
+def _short_help(description: str) -> str:
+    """First paragraph of ``description``, on one line."""
+    return " ".join(description.strip().split("\n\n")[0].split())
+
+
+def search_records(node: CommandNode, parent: str = "") -> List[SearchRecord]:
+    """One record per command of ``node``'s tree, depth first."""
+    name = node.name.strip("` ")
+    path = f"{parent} {name}".strip()
+    records = [
+        SearchRecord(
+            name=name,
+            path=path,
+            usage=node.usage or "",
+            help=_short_help(node.description),
+            options=[
+                option_name
+                for option in node.options
+                for option_name in _OPTION_NAME_RE.findall(option.name)
+            ],
+        )
+    ]
+    for subcommand in node.subcommands:
+        records.extend(search_records(subcommand, path))
+    return records
+
+
+@contextmanager
+def collecting(enabled: bool = True) -> Iterator[List[SearchRecord]]:
+    """Collect the records of the trees built inside the block.
+
+    With ``enabled`` false the block collects nothing, even inside an
+    enclosing ``collecting`` block.
+    """
+    records: List[SearchRecord] = []
+    token = _RECORDS.set(records if enabled else None)
+    try:
+        yield records
+    finally:
+        _RECORDS.reset(token)
+
+
+def is_collecting() -> bool:
+    """Whether ``collect`` would keep anything."""
+    return _RECORDS.get() is not None
+
+
+def collect(tree: CommandNode) -> None:
+    """Add ``tree``'s records to the current collection, if any."""
+    add_records(search_records(tree) if is_collecting() else [])
+
+
+def add_records(records: List[SearchRecord]) -> None:
+    """Add already built ``records`` (e.g. from a worker) to the collection."""
+    collected = _RECORDS.get()
+    if collected is not None:
+        collected.extend(records)
+
+
+def _blocks(content: str) -> Iterator[Tuple[int, int]]:
+    """``(start, end)`` of the inner HTML of every ``typer-docs`` block."""
+    position = 0
+    while True:
+        start = content.find(BLOCK_START, position)
+        if start == -1:
+            return
+        inner = start + len(BLOCK_START)
+        depth = 1
+        for match in _DIV_RE.finditer(content, inner):
+            depth += -1 if match.group() == "</div>" else 1
+            if not depth:
+                yield inner, match.start()
+                position = match.end()
+                break
+        else:
+            return
+
+
+def _heading_text(markup: str) -> str:
+    return html.unescape(_TAG_RE.sub("", markup)).strip("` \n")
+
+
+def _record_html(record: SearchRecord) -> str:
+    return f"<p>{html.escape(record.text())}</p>"
+
+
+def _matched_headings(
+    block: str, records: List[SearchRecord]
+) -> Iterator[Tuple[SearchRecord, Optional[Match[str]]]]:
+    """Pair each record with the heading of its command in ``block``.
+
+    Each record is matched to the next heading that names its command (the
+    block's headings follow the tree's depth-first order), or to ``None``.
+    """
+    headings = list(_HEADING_RE.finditer(block))
+    index = 0
+    for record in records:
+        for candidate in range(index, len(headings)):
+            text = _heading_text(headings[candidate].group(3))
+            if text == record.name or text.endswith(" " + record.name):
+                yield record, headings[candidate]
+                index = candidate + 1
+                break
+        else:
+            yield record, None
+
+
+def anchored_records(
+    content: str, blocks: List[List[SearchRecord]]
+) -> Iterator[Tuple[SearchRecord, str]]:
+    """Every record of a page with the ``id`` of its command heading ("" if none).
+
+    ``blocks`` holds the records of the page's blocks, in page order.
+    """
+    for (start, end), records in zip(_blocks(content), blocks):
+        for record, heading in _matched_headings(content[start:end], records):
+            yield record, heading.group(2) if heading else ""
+
+
+def _block_view(block: str, records: List[SearchRecord], exclude: bool) -> str:
+    """``block`` as the search index should see it.
+
+    Each record's text goes after its command heading, or at the end of the
+    block if it has none.
+    """
+    parts: List[str] = []
+    position = 0
+    unmatched: List[SearchRecord] = []
+    for record, heading in _matched_headings(block, records):
+        if heading is None:
+            unmatched.append(record)
+            continue
+        parts.append(heading.group() if exclude else block[position : heading.end()])
+        parts.append(_record_html(record))
+        position = heading.end()
+    if not exclude:
+        parts.append(block[position:])
+    parts.extend(_record_html(record) for record in unmatched)
+    return "".join(parts)
+
+
+def search_view(
+    content: str, blocks: List[List[SearchRecord]], exclude: bool = False
+) -> str:
+    """``content`` with each ``typer-docs`` block's records worked in.
+
+    ``blocks`` holds the records of the page's blocks, in page order. With
+    ``exclude``, a block keeps only its command headings and records.
+    """
+    parts: List[str] = []
+    position = 0
+    for (start, end), records in zip(_blocks(content), blocks):
+        parts.append(content[position:start])
+        parts.append(_block_view(content[start:end], records, exclude))
+        position = end
+    parts.append(content[position:])
+    return "".join(parts)
@@ -0,0 +1,548 @@
+"""Document a Typer app from its source, without importing it (``engine: static``).
+
+The module's source is located on ``sys.path`` and parsed with ``ast``; none of
+its code (nor its parent packages' ``__init__``) runs. Module-level
+``typer.Typer()`` instances, ``@app.command()`` / ``@app.callback()`` functions,
+``add_typer`` calls (following imported sub-apps into their modules' source) and
+``typer.Option`` / ``typer.Argument`` parameters (plain defaults or
+``Annotated``) are read from the tree, and an equivalent app is rebuilt from
+*synthetic* callbacks that carry only the signatures and docstrings. That app
+goes through the same ``typer.main.get_command`` and
+``_build_tree_from_click_command`` as the native engine, so both engines
+produce identical ``CommandNode`` trees.
+
+Only literal values are evaluated (``ast.literal_eval``, module-level literal
+constants, members of enums defined in the module and ``Path("…")``). Anything
+else — a computed default or help text, a custom parameter type, a command
+registered inside a function or ``if`` block, an app built by a factory —
+raises ``StaticAnalysisError`` so the caller can fall back to importing the
+module.
+"""
+
+import ast
+import builtins
+import datetime
+import enum
+import inspect
+import sys
+import uuid
+from pathlib import Path
+from typing import Annotated, Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import click
+import typer
+
+from .pretty import CommandNode, _build_tree_from_click_command, _resolve_click_command
+from .tracing import span
+
+
+class StaticAnalysisError(ValueError):
+    """The app cannot be documented without importing its module."""
+
+
+#: Annotation types the synthetic callbacks may use, by qualified name.
+_TYPES: Dict[str, Any] = {
+    "builtins.str": str,
+    "builtins.int": int,
+    "builtins.float": float,
+    "builtins.bool": bool,
+    "pathlib.Path": Path,
+    "datetime.datetime": datetime.datetime,
+    "uuid.UUID": uuid.UUID,
+    "typer.Context": typer.Context,
+    "click.Context": typer.Context,
+}
+
+_GENERICS: Dict[str, Any] = {
+    "typing.List": List,
+    "builtins.list": List,
+    "typing.Tuple": Tuple,
+    "builtins.tuple": Tuple,
+    "typing.Optional": Optional,
+    "typing.Union": Union,
+}
+
+_ANNOTATED = frozenset({"typing.Annotated", "typing_extensions.Annotated"})
+
+_PARAMETER_FACTORIES: Dict[str, Callable[..., Any]] = {
+    "typer.Option": typer.Option,
+    "typer.Argument": typer.Argument,
+}
+
+#: ``Option`` / ``Argument`` keywords that only affect runtime behaviour, so
+#: non-literal values (typically functions) are dropped instead of rejected.
+_RUNTIME_ONLY_KWARGS = frozenset({"callback", "autocompletion", "shell_complete"})
+
+#: Value types built from literal arguments (``Path("out")``,
+#: ``click_type=click.Choice(["a", "b"])``).
+_VALUE_FACTORIES: Dict[str, Callable[..., Any]] = {
+    "pathlib.Path": Path,
+    "click.Choice": click.Choice,
+    "click.IntRange": click.IntRange,
+    "click.FloatRange": click.FloatRange,
+    "click.Path": click.Path,
+    "click.DateTime": click.DateTime,
+}
+
+#: How many ``from other_module import app`` hops are followed for sub-apps.
+_MAX_IMPORT_DEPTH = 8
+
+_ENUM_BASES: Dict[str, Any] = {
+    "enum.Enum": enum.Enum,
+    "enum.IntEnum": enum.IntEnum,
+    "enum.StrEnum": getattr(enum, "StrEnum", None),
+}
+
+
+def find_module_source(module: str) -> Path:
+    """Locate ``module``'s source file on ``sys.path`` without importing it.
+
+    Unlike ``importlib.util.find_spec`` this never imports parent packages.
+    """
+    parts = module.split(".")
+    for entry in sys.path:
+        base = Path(entry or ".").joinpath(*parts)
+        for candidate in (base / "__init__.py", base.with_name(f"{parts[-1]}.py")):
+            if candidate.is_file():
+                return candidate
+    raise StaticAnalysisError(f"cannot find the source of module '{module}'")
+
+
+def resolve_command_from_source(module: str, name: str) -> click.core.Command:
+    """Static counterpart of ``pretty.resolve_click_command``."""
+    with span("static analysis", module=module):
+        app = _ModuleAnalysis.of(module).app(name)
+    try:
+        return _resolve_click_command(app)
+    except Exception as exc:
+        # Typer rejects the rebuilt app; importing the real one decides.
+        raise StaticAnalysisError(f"typer cannot build the app: {exc}") from exc
+
+
+def build_tree_from_source(module: str, name: str) -> CommandNode:
+    """Static counterpart of ``pretty.build_tree_from_click_app``."""
+    command = resolve_command_from_source(module, name)
+    with span("tree build"):
+        return _build_tree_from_click_command(command, display_name=name or None)
+
+
+class _ModuleAnalysis:
+    """Module-level names of one parsed module, and the app rebuilt from them."""
+
+    def __init__(self, module: str, tree: ast.Module, package: str, depth: int = 0):
+        self.module = module
+        # Package that relative imports resolve against.
+        self.package = package
+        self.depth = depth
+        self.aliases: Dict[str, str] = {}
+        self.constants: Dict[str, Any] = {}
+        self.enums: Dict[str, Any] = {}
+        self.functions: Dict[str, ast.AST] = {}
+        self.apps: Dict[str, ast.Call] = {}
+        self.defined: Set[str] = set()
+        # (app variable, method, call, decorated function or None), in source
+        # order, replayed on the rebuilt apps.
+        self.registrations: List[Tuple[str, str, ast.Call, Optional[ast.AST]]] = []
+        self._apps: Optional[Dict[str, typer.Typer]] = None
+        for statement in tree.body:
+            self._visit(statement)
+        self._reject_unhandled_registrations(tree)
+
+    @classmethod
+    def of(cls, module: str, depth: int = 0) -> "_ModuleAnalysis":
+        path = find_module_source(module)
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except (OSError, SyntaxError, UnicodeDecodeError) as exc:
+            raise StaticAnalysisError(f"cannot parse {path}: {exc}") from exc
+        package = module if path.name == "__init__.py" else module.rpartition(".")[0]
+        return cls(module, tree, package, depth)
+
+    # -- collection ---------------------------------------------------------
+
+    def _visit(self, statement: ast.stmt) -> None:
+        if isinstance(statement, (ast.Import, ast.ImportFrom)):
+            self._import(statement)
+        elif isinstance(statement, ast.Try):
+            # ``try: from typing import Annotated`` / ``except ImportError: …``
+            for inner in [*statement.body, *statement.orelse]:
+                if isinstance(inner, (ast.Import, ast.ImportFrom)):
+                    self._import(inner)
+        elif isinstance(statement, (ast.Assign, ast.AnnAssign)):
+            self._assign(statement)
+        elif isinstance(statement, ast.ClassDef):
+            self.defined.add(statement.name)
+            self._enum(statement)
+        elif isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            self.defined.add(statement.name)
+            self.functions[statement.name] = statement
+            self._decorators(statement)
+        elif isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call):
+            self._call(statement.value)
+
+    def _import(self, statement: ast.stmt) -> None:
+        if isinstance(statement, ast.Import):
+            for alias in statement.names:
+                if alias.asname:
+                    self.aliases[alias.asname] = alias.name
+                else:
+                    top = alias.name.split(".", 1)[0]
+                    self.aliases[top] = top
+            return
+        source = statement.module or ""
+        if statement.level:
+            package = self.package.split(".") if self.package else []
+            if statement.level - 1 > len(package):
+                return
+            base = package[: len(package) - (statement.level - 1)]
+            source = ".".join([*base, *([source] if source else [])])
+        for alias in statement.names:
+            self.aliases[alias.asname or alias.name] = (
+                f"{source}.{alias.name}" if source else alias.name
+            )
+
+    def _assign(self, statement: ast.stmt) -> None:
+        targets = (
+            statement.targets
+            if isinstance(statement, ast.Assign)
+            else [statement.target]
+        )
+        if len(targets) != 1 or not isinstance(targets[0], ast.Name):
+            return
+        target, value = targets[0].id, statement.value
+        self.defined.add(target)
+        self.apps.pop(target, None)
+        self.constants.pop(target, None)
+        if value is None:
+            return
+        if isinstance(value, ast.Call) and self._qualname(value.func) == "typer.Typer":
+            self.apps[target] = value
+            return
+        try:
+            self.constants[target] = ast.literal_eval(value)
+        except (ValueError, TypeError, SyntaxError):
+            pass
+
+    def _enum(self, statement: ast.ClassDef) -> None:
+        bases = [self._qualname(base) for base in statement.bases]
+        enum_base = next(
+            (_ENUM_BASES[base] for base in bases if _ENUM_BASES.get(base)), None
+        )
+        if enum_base is None:
+            return
+        mixin = next(
+            (
+                _TYPES[base]
+                for base in bases
+                if base in ("builtins.str", "builtins.int")
+            ),
+            None,
+        )
+        members: List[Tuple[str, Any]] = []
+        for item in statement.body:
+            if not (
+                isinstance(item, ast.Assign)
+                and len(item.targets) == 1
+                and isinstance(item.targets[0], ast.Name)
+            ):
+                continue
+            member = item.targets[0].id
+            if member.startswith("_"):
+                continue
+            if (
+                isinstance(item.value, ast.Call)
+                and self._qualname(item.value.func) == "enum.auto"
+            ):
+                members.append((member, enum.auto()))
+            else:
+                members.append((member, self._value(item.value)))
+        kwargs = {"type": mixin} if mixin and enum_base is enum.Enum else {}
+        self.enums[statement.name] = enum_base(
+            statement.name, members, module=self.module, **kwargs
+        )
+
+    def _decorators(self, function: ast.AST) -> None:
+        # ``decorator_list`` is outermost first; decorators below the
+        # registration run before it and may replace the function typer sees.
+        for index, decorator in enumerate(function.decorator_list):
+            registration = self._registration(decorator)
+            if registration is None:
+                continue
+            for inner in function.decorator_list[index + 1 :]:
+                if self._registration(inner) is None:
+                    raise StaticAnalysisError(
+                        f"'{function.name}' is wrapped by "
+                        f"'{ast.unparse(inner)}' before typer registers it"
+                    )
+            self.registrations.append((*registration, function))
+
+    def _registration(self, node: ast.AST) -> Optional[Tuple[str, str, ast.Call]]:
+        """``(app, "command" | "callback", call)`` for ``app.command(…)`` nodes."""
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr in ("command", "callback")
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id in self.apps
+        ):
+            return node.func.value.id, node.func.attr, node
+        return None
+
+    def _call(self, call: ast.Call) -> None:
+        # ``app.add_typer(sub, …)``
+        if (
+            isinstance(call.func, ast.Attribute)
+            and call.func.attr == "add_typer"
+            and isinstance(call.func.value, ast.Name)
+            and call.func.value.id in self.apps
+        ):
+            self.registrations.append((call.func.value.id, "add_typer", call, None))
+            return
+        # ``app.command(…)(function)``
+        registration = self._registration(call.func)
+        if registration is not None:
+            if len(call.args) != 1 or not isinstance(call.args[0], ast.Name):
+                raise StaticAnalysisError(
+                    f"cannot resolve the command registered at line {call.lineno}"
+                )
+            function = self.functions.get(call.args[0].id)
+            if function is None:
+                raise StaticAnalysisError(
+                    f"'{call.args[0].id}' is not a module-level function"
+                )
+            self.registrations.append((*registration, function))
+
+    def _reject_unhandled_registrations(self, tree: ast.Module) -> None:
+        """Fail on registrations outside module-level statements.
+
+        A command added inside a function, loop or ``if`` block may or may not
+        exist at runtime; only importing the module can tell.
+        """
+        handled = {id(call) for _, _, call, _ in self.registrations}
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in ("command", "callback", "add_typer")
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id in self.apps
+                and id(node) not in handled
+            ):
+                raise StaticAnalysisError(
+                    f"'{ast.unparse(node.func)}' at line {node.lineno} is not a "
+                    "module-level registration"
+                )
+
+    # -- evaluation ---------------------------------------------------------
+
+    def _qualname(self, node: ast.AST) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            if node.id in self.aliases:
+                return self.aliases[node.id]
+            if node.id not in self.defined and hasattr(builtins, node.id):
+                return f"builtins.{node.id}"
+            return None
+        if isinstance(node, ast.Attribute):
+            base = self._qualname(node.value)
+            return f"{base}.{node.attr}" if base else None
+        return None
+
+    def _value(self, node: ast.AST) -> Any:
+        """Evaluate a default or keyword value, literals only."""
+        if isinstance(node, ast.Call):
+            qualname = self._qualname(node.func)
+            if qualname in _PARAMETER_FACTORIES:
+                return self._parameter_info(node)
+            if qualname in _VALUE_FACTORIES:
+                return _VALUE_FACTORIES[qualname](
+                    *self._positional(node), **self._keywords(node)
+                )
+        if (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in self.enums
+        ):
+            try:
+                return self.enums[node.value.id][node.attr]
+            except KeyError:
+                pass
+        if isinstance(node, ast.Name) and node.id in self.constants:
+            return self.constants[node.id]
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError):
+            raise StaticAnalysisError(
+                f"cannot evaluate '{ast.unparse(node)}' at line "
+                f"{getattr(node, 'lineno', '?')} without importing the module"
+            ) from None
+
+    def _positional(self, call: ast.Call) -> List[Any]:
+        if any(isinstance(arg, ast.Starred) for arg in call.args):
+            raise StaticAnalysisError(f"*args at line {call.lineno}")
+        return [self._value(arg) for arg in call.args]
+
+    def _keywords(
+        self,
+        call: ast.Call,
+        callbacks: bool = False,
+        skip: frozenset = frozenset(),
+    ) -> Dict[str, Any]:
+        """Evaluate a call's keywords, leaving out ``skip``.
+
+        With ``callbacks``, a ``callback=`` naming a module-level function
+        becomes that function's synthetic counterpart.
+        """
+        kwargs: Dict[str, Any] = {}
+        for keyword in call.keywords:
+            if keyword.arg is None:
+                raise StaticAnalysisError(f"**kwargs at line {call.lineno}")
+            if keyword.arg in skip:
+                continue
+            if (
+                callbacks
+                and keyword.arg == "callback"
+                and isinstance(keyword.value, ast.Name)
+                and keyword.value.id in self.functions
+            ):
+                kwargs["callback"] = self._callback(self.functions[keyword.value.id])
+            else:
+                kwargs[keyword.arg] = self._value(keyword.value)
+        return kwargs
+
+    def _parameter_info(self, call: ast.Call) -> Any:
+        factory = _PARAMETER_FACTORIES[self._qualname(call.func)]
+        return factory(
+            *self._positional(call), **self._keywords(call, skip=_RUNTIME_ONLY_KWARGS)
+        )
+
+    def _annotation(self, node: Optional[ast.AST]) -> Any:
+        if node is None:
+            return inspect.Parameter.empty
+        if isinstance(node, ast.Constant):
+            if node.value is None:
+                return type(None)
+            if isinstance(node.value, str):  # forward reference
+                return self._annotation(ast.parse(node.value, mode="eval").body)
+        if isinstance(node, ast.Name) and node.id in self.enums:
+            return self.enums[node.id]
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            return Union[self._annotation(node.left), self._annotation(node.right)]
+        if isinstance(node, ast.Subscript):
+            origin = self._qualname(node.value)
+            items = (
+                node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+            )
+            if origin in _ANNOTATED:
+                # Typer only reads its own Option/Argument metadata.
+                metadata = [
+                    self._parameter_info(item)
+                    for item in items[1:]
+                    if isinstance(item, ast.Call)
+                    and self._qualname(item.func) in _PARAMETER_FACTORIES
+                ]
+                annotation = self._annotation(items[0])
+                if not metadata:
+                    return annotation
+                return Annotated[(annotation, *metadata)]
+            if origin in _GENERICS:
+                args = tuple(
+                    ...
+                    if isinstance(item, ast.Constant) and item.value is Ellipsis
+                    else self._annotation(item)
+                    for item in items
+                )
+                return _GENERICS[origin][args if len(args) > 1 else args[0]]
+        qualname = self._qualname(node)
+        if qualname in _TYPES:
+            return _TYPES[qualname]
+        raise StaticAnalysisError(
+            f"unsupported annotation '{ast.unparse(node)}' at line {node.lineno}"
+        )
+
+    def _callback(self, function: ast.AST) -> Callable[..., None]:
+        """A stand-in for ``function`` with its signature and docstring only."""
+        arguments = function.args
+        if arguments.vararg or arguments.kwarg:
+            raise StaticAnalysisError(f"'{function.name}' takes *args or **kwargs")
+        positional = [*arguments.posonlyargs, *arguments.args]
+        defaults = [None] * (len(positional) - len(arguments.defaults)) + list(
+            arguments.defaults
+        )
+        parameters = [
+            inspect.Parameter(
+                arg.arg,
+                # Keyword-only avoids Signature's default-ordering rules; typer
+                # ignores parameter kinds.
+                inspect.Parameter.KEYWORD_ONLY,
+                default=(
+                    inspect.Parameter.empty if default is None else self._value(default)
+                ),
+                annotation=self._annotation(arg.annotation),
+            )
+            for arg, default in [
+                *zip(positional, defaults),
+                *zip(arguments.kwonlyargs, arguments.kw_defaults),
+            ]
+        ]
+
+        def callback(**kwargs: Any) -> None:
+            pass
+
+        callback.__name__ = callback.__qualname__ = function.name
+        callback.__module__ = self.module
+        callback.__doc__ = ast.get_docstring(function, clean=False)
+        callback.__signature__ = inspect.Signature(parameters)
+        callback.__annotations__ = {
+            parameter.name: parameter.annotation
+            for parameter in parameters
+            if parameter.annotation is not inspect.Parameter.empty
+        }
+        return callback
+
+    # -- rebuild ------------------------------------------------------------
+
+    def app(self, name: str) -> typer.Typer:
+        """Rebuild the app ``pretty.resolve_click_command`` would pick."""
+        if name and (name in self.defined or name in self.aliases):
+            return self._app_named(name)
+        return self._app_named("app")
+
+    def _app_named(self, variable: str) -> typer.Typer:
+        """Rebuild the module-level app ``variable``, local or imported."""
+        if variable in self.apps:
+            return self._rebuild()[variable]
+        qualname = self.aliases.get(variable)
+        if qualname is None or "." not in qualname:
+            raise StaticAnalysisError(
+                f"'{variable}' is not a module-level typer.Typer() in {self.module}"
+            )
+        if self.depth >= _MAX_IMPORT_DEPTH:
+            raise StaticAnalysisError(f"too many imports to follow for '{variable}'")
+        module, _, attr = qualname.rpartition(".")
+        return _ModuleAnalysis.of(module, self.depth + 1)._app_named(attr)
+
+    def _rebuild(self) -> Dict[str, typer.Typer]:
+        if self._apps is not None:
+            return self._apps
+        apps = self._apps = {
+            variable: typer.Typer(
+                *self._positional(call), **self._keywords(call, callbacks=True)
+            )
+            for variable, call in self.apps.items()
+        }
+        for variable, method, call, function in self.registrations:
+            if method == "add_typer":
+                if len(call.args) != 1 or not isinstance(call.args[0], ast.Name):
+                    raise StaticAnalysisError(
+                        f"cannot resolve the app added at line {call.lineno}"
+                    )
+                apps[variable].add_typer(
+                    self._app_named(call.args[0].id),
+                    **self._keywords(call, callbacks=True),
+                )
+                continue
+            register = getattr(apps[variable], method)(
+                *self._positional(call), **self._keywords(call)
+            )
+            register(self._callback(function))
+        return apps
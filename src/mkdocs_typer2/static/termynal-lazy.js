@@ -0,0 +1,29 @@
+// Deferred termynal initialisation for mkdocs-typer2 `:lazy:` blocks.
+//
+// Lazy blocks carry the `termy-lazy` class instead of `termy`, so termynal.js
+// skips them on page load. Each one is initialised (with the same options
+// termynal.js uses for `.termy`) the first time it scrolls into view. Must load
+// after termynal.js, which defines the global `Termynal` class.
+(function () {
+    'use strict';
+
+    const start = (node) => {
+        node.classList.replace('termy-lazy', 'termy');
+        new Termynal(node, { lineDelay: 500 });
+    };
+    const nodes = document.querySelectorAll('.termy-lazy');
+
+    if (!('IntersectionObserver' in window)) {
+        nodes.forEach(start);
+        return;
+    }
+    const observer = new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                start(entry.target);
+            }
+        }
+    }, { rootMargin: '200px 0px' });
+    nodes.forEach((node) => observer.observe(node));
+})();
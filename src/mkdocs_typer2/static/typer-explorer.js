@@ -0,0 +1,184 @@
+// Command explorer for mkdocs-typer2 `:explorer:` blocks.
+//
+// Each `.typer-explorer` container holds the CLI's compact JSON model, inline
+// (`<script type="application/json">`) or as a `data-model` path relative to
+// this script. The viewer renders a filterable command list and the selected
+// command's options as virtualised lists: only the rows in view are in the DOM,
+// however many options the CLI has. See `mkdocs_typer2/explorer.py` for the
+// model's layout.
+(function () {
+    'use strict';
+
+    const MODEL_VERSION = 1;
+    const OVERSCAN = 8;
+    const base = document.currentScript ? document.currentScript.src : document.baseURI;
+
+    const element = (tag, className, text) => {
+        const node = document.createElement(tag);
+        if (className) node.className = 'typer-explorer__' + className;
+        if (text) node.textContent = text;
+        return node;
+    };
+
+    const fetchModel = async (path) => {
+        const url = new URL(path, base);
+        if (path.endsWith('.gz')) {
+            if ('DecompressionStream' in window) {
+                const response = await fetch(url);
+                if (response.ok) {
+                    const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+                    return new Response(stream).json();
+                }
+            }
+            // The uncompressed model always sits next to the precompressed one.
+            return fetchModel(path.slice(0, -3));
+        }
+        const response = await fetch(url);
+        if (!response.ok) throw new Error(response.status + ' ' + url);
+        return response.json();
+    };
+
+    const loadModel = (container) => {
+        const inline = container.querySelector('script[type="application/json"]');
+        if (inline) return Promise.resolve(JSON.parse(inline.textContent));
+        return fetchModel(container.dataset.model);
+    };
+
+    // Every command with its full path, depth first, in the model's order.
+    const flatten = (node, prefix, out) => {
+        const path = prefix ? prefix + ' ' + node.n : node.n;
+        out.push({ path: path, node: node });
+        (node.c || []).forEach((child) => flatten(child, path, out));
+        return out;
+    };
+
+    // A fixed-row-height list that only renders the rows in view.
+    class VirtualList {
+        constructor(parent, renderRow) {
+            this.renderRow = renderRow;
+            this.items = [];
+            this.rowHeight = 0;
+            this.viewport = parent.appendChild(element('div', 'viewport'));
+            this.spacer = this.viewport.appendChild(element('div', 'spacer'));
+            this.viewport.addEventListener('scroll', () => this.draw(), { passive: true });
+        }
+
+        setItems(items) {
+            this.items = items;
+            this.viewport.scrollTop = 0;
+            this.draw();
+        }
+
+        draw() {
+            if (!this.rowHeight && this.items.length) {
+                const probe = this.renderRow(this.items[0]);
+                this.spacer.replaceChildren(probe);
+                this.rowHeight = probe.offsetHeight || 32;
+            }
+            const height = this.rowHeight || 32;
+            this.spacer.style.height = this.items.length * height + 'px';
+            const first = Math.max(0, Math.floor(this.viewport.scrollTop / height) - OVERSCAN);
+            const count = Math.ceil(this.viewport.clientHeight / height) + 2 * OVERSCAN;
+            const rows = this.items.slice(first, first + count).map((item, offset) => {
+                const row = this.renderRow(item);
+                row.style.top = (first + offset) * height + 'px';
+                return row;
+            });
+            this.spacer.replaceChildren(...rows);
+        }
+    }
+
+    const optionRow = (option) => {
+        const row = element('div', 'row');
+        row.appendChild(element('code', 'name', option[0]));
+        if (option[2]) row.appendChild(element('span', 'required', 'required'));
+        if (option[3] != null) row.appendChild(element('span', 'default', 'default: ' + option[3]));
+        const help = row.appendChild(element('span', 'help', option[1] || ''));
+        row.title = option[1] || '';
+        help.title = row.title;
+        return row;
+    };
+
+    const matches = (text, query) => text.toLowerCase().includes(query);
+
+    const explore = (container, model) => {
+        if (model.v !== MODEL_VERSION) throw new Error('unsupported model version ' + model.v);
+        const commands = flatten(model.root, '', []);
+        let selected = commands[0];
+        let query = '';
+
+        container.replaceChildren();
+        const filter = container.appendChild(element('input', 'filter'));
+        filter.type = 'search';
+        filter.placeholder = 'Filter commands and options';
+        filter.setAttribute('aria-label', filter.placeholder);
+        const panes = container.appendChild(element('div', 'panes'));
+        const commandPane = panes.appendChild(element('nav', 'commands'));
+        const detail = panes.appendChild(element('section', 'detail'));
+        const title = detail.appendChild(element('h4', 'title'));
+        const description = detail.appendChild(element('p', 'description'));
+        const usage = detail.appendChild(element('pre', 'usage'));
+        const argumentList = detail.appendChild(element('ul', 'arguments'));
+        const optionCount = detail.appendChild(element('p', 'count'));
+        const options = new VirtualList(detail, optionRow);
+
+        const commandList = new VirtualList(commandPane, (command) => {
+            const row = element('button', 'row', command.path);
+            row.type = 'button';
+            if (command === selected) row.classList.add('typer-explorer__selected');
+            row.addEventListener('click', () => select(command));
+            return row;
+        });
+
+        const showOptions = () => {
+            const all = selected.node.o || [];
+            const shown = query
+                ? all.filter((option) => matches(option[0], query) || matches(option[1] || '', query))
+                : all;
+            optionCount.textContent = shown.length === all.length
+                ? all.length + ' options'
+                : shown.length + ' of ' + all.length + ' options';
+            options.setItems(shown);
+        };
+
+        const select = (command) => {
+            selected = command;
+            const node = command.node;
+            title.textContent = command.path;
+            description.textContent = node.d || '';
+            usage.textContent = node.u ? 'Usage: ' + node.u : '';
+            usage.hidden = !node.u;
+            argumentList.replaceChildren(...(node.a || []).map((argument) => {
+                const item = element('li');
+                item.appendChild(element('code', 'name', argument[0].toUpperCase()));
+                item.append(' ' + (argument[1] || '') + (argument[2] ? ' (required)' : ''));
+                return item;
+            }));
+            showOptions();
+            commandList.draw();
+        };
+
+        const applyFilter = () => {
+            query = filter.value.trim().toLowerCase();
+            commandList.setItems(query
+                ? commands.filter((command) => matches(command.path, query)
+                    || (command.node.o || []).some((option) => matches(option[0], query)))
+                : commands);
+            showOptions();
+        };
+
+        filter.addEventListener('input', applyFilter);
+        commandList.setItems(commands);
+        select(selected);
+    };
+
+    document.querySelectorAll('.typer-explorer').forEach((container) => {
+        loadModel(container)
+            .then((model) => explore(container, model))
+            .catch((error) => {
+                container.replaceChildren(
+                    element('p', 'error', 'Could not load the command explorer: ' + error.message)
+                );
+            });
+    });
+})();
@@ -0,0 +1,129 @@
+"""Stub out heavy imports while a documented CLI module is imported.
+
+Building the docs only needs a CLI's Click/Typer metadata, yet importing its
+module may pull in ``torch``, ``boto3``, ``pandas`` … at import time. With
+``stubbed_imports(["torch"])`` active, a ``sys.meta_path`` finder answers any
+import of those packages (and their submodules) with a placeholder module whose
+attributes are lazy ``_StubObject`` placeholders, so the import costs next to
+nothing. Commands whose *definitions* (signatures, defaults, help) use the real
+libraries cannot be documented this way.
+
+The legacy engine renders in a ``typer`` subprocess, so this module is also
+runnable: ``python -m mkdocs_typer2.stubs torch,boto3 <typer CLI args>``
+installs the finder in the child and then runs the ``typer`` CLI.
+"""
+
+import importlib.abc
+import importlib.machinery
+import sys
+import types
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+
+class _StubObject:
+    """Placeholder for anything reached through a stubbed module.
+
+    Attribute access, calls and subscripts all return further placeholders, so
+    module-level code such as ``DEVICE = torch.device("cpu")`` runs. Used as a
+    decorator on a function it returns the function unchanged, and used as a
+    base class it yields an ordinary (empty) class.
+    """
+
+    def __init__(self, name: str = "stub") -> None:
+        self._stub_name = name
+
+    def __getattr__(self, attr: str) -> "_StubObject":
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        return _StubObject(f"{self._stub_name}.{attr}")
+
+    def __call__(self, *args, **kwargs):
+        if len(args) == 1 and not kwargs and callable(args[0]):
+            return args[0]
+        return _StubObject(f"{self._stub_name}()")
+
+    def __getitem__(self, key) -> "_StubObject":
+        return self
+
+    def __iter__(self) -> Iterator:
+        return iter(())
+
+    def __mro_entries__(self, bases: tuple) -> tuple:
+        return (_StubObject,)
+
+    def __repr__(self) -> str:
+        return f"<stub {self._stub_name}>"
+
+
+class _StubModule(types.ModuleType):
+    """A stubbed (sub)package: every public attribute is a ``_StubObject``."""
+
+    def __getattr__(self, attr: str) -> _StubObject:
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        return _StubObject(f"{self.__name__}.{attr}")
+
+
+class _StubLoader(importlib.abc.Loader):
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> _StubModule:
+        return _StubModule(spec.name)
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        # A package path (even empty) lets ``import torch.nn`` reach the finder.
+        module.__path__ = []
+
+
+class StubFinder(importlib.abc.MetaPathFinder):
+    """Meta-path finder resolving ``packages`` (and submodules) to stubs."""
+
+    def __init__(self, packages: Sequence[str]) -> None:
+        self.packages = tuple(packages)
+
+    def _matches(self, fullname: str) -> bool:
+        return any(
+            fullname == package or fullname.startswith(f"{package}.")
+            for package in self.packages
+        )
+
+    def find_spec(self, fullname, path=None, target=None):
+        if not self._matches(fullname):
+            return None
+        return importlib.machinery.ModuleSpec(fullname, _StubLoader(), is_package=True)
+
+
+@contextmanager
+def stubbed_imports(packages: Sequence[str]) -> Iterator[None]:
+    """Stub ``packages`` for imports made inside the ``with`` block.
+
+    Packages that are already imported keep their real module. On exit the
+    finder is removed and the stub modules are dropped from ``sys.modules``, so
+    other code in the build (or a later directive without stubs) imports the
+    real packages. Modules imported *against* the stubs keep their references.
+    """
+    if not packages:
+        yield
+        return
+    finder = StubFinder(packages)
+    sys.meta_path.insert(0, finder)
+    try:
+        yield
+    finally:
+        sys.meta_path.remove(finder)
+        for name, module in list(sys.modules.items()):
+            if isinstance(module, _StubModule):
+                del sys.modules[name]
+
+
+def main(argv: Sequence[str]) -> None:
+    """Run the ``typer`` CLI with ``argv[0]`` (comma-separated) stubbed."""
+    from typer.cli import main as typer_main
+
+    packages = [package for package in argv[0].split(",") if package]
+    sys.meta_path.insert(0, StubFinder(packages))
+    sys.argv = ["typer", *argv[1:]]
+    typer_main()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -6,12 +6,15 @@ coupling to termynal's markup contract.
 
 import contextlib
 import io
+import re
+import weakref
 from dataclasses import dataclass, replace
-from typing import Dict, List, Literal, Optional, Tuple, get_args
+from typing import Dict, Iterator, List, Literal, Optional, Tuple, get_args
 
 import click
 
 from .pretty import _is_click_group, resolve_click_command
+from .tracing import span
 
 # --- termynal contract --------------------------------------------------------
 # All option domains and the ``data-ty-*`` attribute names we emit live here as
@@ -52,6 +55,43 @@ TIMING_ATTRS: Dict[str, str] = {
 # boundary between the first/last block and surrounding page content.
 STACKED_BLOCK_STYLE = "margin-top: 1.5rem;"
 
+#: Class emitted instead of termynal's ``termy`` on deferred blocks.
+#: termynal.js auto-initialises every ``.termy`` on load; blocks with this class
+#: are left alone until ``termynal-lazy.js`` sees them scrolled into view.
+LAZY_BLOCK_CLASS = "termy-lazy"
+
+#: Class emitted on ``static`` blocks: the same ``data-ty`` markup, so termynal's
+#: CSS (and themes built on it) style them, but no script ever touches them.
+STATIC_BLOCK_CLASS = "termy-static"
+
+#: Responsive (multi-width) rendering: the wrapper holding one variant per
+#: width, and the class each variant carries. A ``<style>`` emitted with the
+#: wrapper shows exactly one variant per viewport width.
+RESPONSIVE_CLASS = "termynal-typer-responsive"
+RESPONSIVE_VARIANT_CLASS = "termynal-typer-width"
+
+#: Attribute of that ``<style>``. The MkDocs plugin moves such styles out of
+#: the page content (which search indexes) into ``<head>``.
+RESPONSIVE_STYLE_ATTR = "data-typer-responsive"
+_RESPONSIVE_STYLE_RE = re.compile(
+    rf"<style {RESPONSIVE_STYLE_ATTR}>.*?</style>", re.DOTALL
+)
+
+# Viewport width (in em) needed to show a ``width``-column capture without
+# horizontal scrolling: termynal sets 15px monospace text (a glyph is ~0.6em of
+# that, i.e. 0.5625 root em) inside 45px of padding per side, plus some slack
+# for the page's own content margins.
+_CHAR_WIDTH_EM = 0.5625
+_FRAME_EM = 8.0
+
+#: Class of the ``<details>`` that holds the output lines cut by ``max_lines``.
+OVERFLOW_CLASS = "termynal-typer-more"
+
+TERMYNAL_EXTRA_HINT = (
+    "Termynal output mode requires the 'termynal' extra. "
+    "Install it with: pip install 'mkdocs-typer2[termynal]'"
+)
+
 
 @dataclass
 class TermynalOptions:
@@ -63,6 +103,16 @@ class TermynalOptions:
     ``subcommands`` is a recursion depth: 0 renders only the root command's
     ``--help`` (the default), 1 adds its direct subcommands, 2 adds their
     subcommands, and so on; -1 renders every level (the full tree).
+
+    ``lazy`` defers each block's termynal initialisation until it scrolls into
+    view. ``max_lines`` caps the animated output; the remaining lines go in a
+    collapsed ``<details>`` below the block (``None`` keeps every line).
+    ``static`` renders each block as a finished terminal frame for termynal's
+    CSS alone: no animation script runs, and it takes precedence over ``lazy``.
+
+    ``widths`` requests responsive output: with two or more widths every block
+    is rendered once per width (overriding ``width``) and CSS media queries show
+    the variant that fits the viewport.
     """
 
     width: int = 80
@@ -74,6 +124,10 @@ class TermynalOptions:
     line_delay: Optional[int] = None
     start_delay: Optional[int] = None
     subcommands: int = 0
+    lazy: bool = False
+    max_lines: Optional[int] = None
+    static: bool = False
+    widths: Tuple[int, ...] = ()
 
 
 def _html_escape(text: str) -> str:
@@ -87,21 +141,21 @@ def _ansi_to_html(text: str, scheme: str, dark_bg: bool) -> str:
     """Convert ANSI output to balanced inline HTML spans joined with ``<br>``."""
     converter = None
     lines: List[str] = []
-    for line in text.split("\n"):
-        if "\x1b" not in line:
-            lines.append(_html_escape(line))
-            continue
-        if converter is None:
-            try:
-                from ansi2html import Ansi2HTMLConverter
-            except ModuleNotFoundError as exc:
-                raise ModuleNotFoundError(
-                    "Termynal output mode requires the 'termynal' extra. "
-                    "Install it with: pip install 'mkdocs-typer2[termynal]'"
-                ) from exc
-
-            converter = Ansi2HTMLConverter(inline=True, scheme=scheme, dark_bg=dark_bg)
-        lines.append(converter.convert(line, full=False))
+    with span("_ansi_to_html"):
+        for line in text.split("\n"):
+            if "\x1b" not in line:
+                lines.append(_html_escape(line))
+                continue
+            if converter is None:
+                try:
+                    from ansi2html import Ansi2HTMLConverter
+                except ModuleNotFoundError as exc:
+                    raise ModuleNotFoundError(TERMYNAL_EXTRA_HINT) from exc
+
+                converter = Ansi2HTMLConverter(
+                    inline=True, scheme=scheme, dark_bg=dark_bg
+                )
+            lines.append(converter.convert(line, full=False))
     return "<br>".join(lines)
 
 
@@ -116,6 +170,8 @@ def _termynal_block_html(
     line_delay: Optional[int] = None,
     start_delay: Optional[int] = None,
     style: str = "",
+    lazy: bool = False,
+    static: bool = False,
 ) -> str:
     """Wrap a prompt line and output in termynal's ``data-ty`` markup.
 
@@ -123,7 +179,9 @@ def _termynal_block_html(
     *stacked* blocks apart (a lone block gets none, so spacing against
     surrounding page content stays the theme's concern). The timing arguments
     emit the matching ``data-ty-*`` attributes only when set, deferring to
-    termynal's own defaults otherwise.
+    termynal's own defaults otherwise. ``lazy`` swaps the ``termy`` class for
+    ``LAZY_BLOCK_CLASS`` so termynal.js does not initialise the block on load;
+    ``static`` uses ``STATIC_BLOCK_CLASS`` and drops the (unused) timings.
     """
     extra = ""
     if style:
@@ -134,10 +192,15 @@ def _termynal_block_html(
         "start_delay": start_delay,
     }
     for field, value in delays.items():
-        if value is not None:
+        if value is not None and not static:
             extra += f'{TIMING_ATTRS[field]}="{int(value)}" '
+    css_class = "termy"
+    if static:
+        css_class = STATIC_BLOCK_CLASS
+    elif lazy:
+        css_class = LAZY_BLOCK_CLASS
     return (
-        f'<div class="termy" data-termynal data-ty-{buttons} '
+        f'<div class="{css_class}" data-termynal data-ty-{buttons} '
         f"{extra}"
         f'data-ty-title="{_html_escape(title)}">'
         f'<span data-ty="input" data-ty-prompt="{_html_escape(prompt)}">'
@@ -153,6 +216,38 @@ def _termynal_block_html(
 TYPER_RICH_CONSOLE_HOOK = "_get_rich_console"
 
 
+@contextlib.contextmanager
+def rich_console_into(buf: io.StringIO, width: int = 80) -> Iterator[bool]:
+    """Send everything Typer prints through rich to ``buf``, in color.
+
+    Swaps Typer's private console factory (see ``_colored_help``) for the
+    duration of the block; yields whether the hook was there to swap.
+    """
+    import typer.rich_utils as ru
+    from rich.console import Console
+
+    original = getattr(ru, TYPER_RICH_CONSOLE_HOOK, None)
+    if original is None:
+        yield False
+        return
+    setattr(
+        ru,
+        TYPER_RICH_CONSOLE_HOOK,
+        lambda stderr=False: Console(  # noqa: ARG005
+            force_terminal=True,
+            color_system="standard",
+            no_color=False,
+            width=width,
+            file=buf,
+            highlight=False,
+        ),
+    )
+    try:
+        yield True
+    finally:
+        setattr(ru, TYPER_RICH_CONSOLE_HOOK, original)
+
+
 def _colored_help(command: click.core.Command, info_name: str, width: int = 80) -> str:
     """Return the command's ``--help`` text, colored when the app uses rich.
 
@@ -172,36 +267,19 @@ def _colored_help(command: click.core.Command, info_name: str, width: int = 80)
     CI when the hook is gone, and the colored-render test catches the silent
     drop to monochrome.
     """
-    import typer.rich_utils as ru
-    from rich.console import Console
-
     buf = io.StringIO()
     ctx = click.Context(command, info_name=info_name)
     formatter = ctx.make_formatter()
 
-    original = getattr(ru, TYPER_RICH_CONSOLE_HOOK, None)
-    if original is not None:
-        setattr(
-            ru,
-            TYPER_RICH_CONSOLE_HOOK,
-            lambda stderr=False: Console(  # noqa: ARG005
-                force_terminal=True,
-                color_system="standard",
-                no_color=False,
-                width=width,
-                file=buf,
-                highlight=False,
-            ),
-        )
-        try:
-            command.format_help(ctx, formatter)
-        finally:
-            setattr(ru, TYPER_RICH_CONSOLE_HOOK, original)
-    else:
-        # Hook gone: render without it, but redirect stdout so any rich output
-        # that bypasses our buffer is captured (monochrome) rather than leaked.
-        with contextlib.redirect_stdout(buf):
+    with rich_console_into(buf, width) as hooked:
+        if hooked:
             command.format_help(ctx, formatter)
+        else:
+            # Hook gone: render without it, but redirect stdout so any rich
+            # output that bypasses our buffer is captured (monochrome) rather
+            # than leaked.
+            with contextlib.redirect_stdout(buf):
+                command.format_help(ctx, formatter)
 
     rich_text = buf.getvalue()
     if rich_text.strip():
@@ -209,24 +287,97 @@ def _colored_help(command: click.core.Command, info_name: str, width: int = 80)
     return formatter.getvalue()
 
 
+#: Captured ``--help`` text per command object, keyed by ``(info_name, width)``.
+#: Capture (``format_help`` through rich) is the expensive stage; everything
+#: downstream of it (scheme, ``dark_bg``, buttons, prompt) only re-converts this
+#: text. Weakly keyed so a command is not kept alive by the cache alone.
+_HelpTexts = Dict[Tuple[str, int], str]
+_HELP_CACHE: "weakref.WeakKeyDictionary[click.core.Command, _HelpTexts]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _captured_help(command: click.core.Command, info_name: str, width: int) -> str:
+    """``_colored_help`` memoised per command and ``(info_name, width)``."""
+    per_command = _HELP_CACHE.setdefault(command, {})
+    key = (info_name, width)
+    if key not in per_command:
+        with span("format_help", command=info_name, width=width):
+            help_text = _colored_help(command, info_name, width=width)
+        per_command[key] = help_text.rstrip("\n")
+    return per_command[key]
+
+
+def _overflow_html(title: str, output_html: str, hidden: int, buttons: str) -> str:
+    """Collapsed continuation of a block cut short by ``max_lines``.
+
+    The lines sit in a plain (non-``termy``) termynal frame, so termynal's CSS
+    styles them but termynal.js never animates them.
+    """
+    noun = "line" if hidden == 1 else "lines"
+    return (
+        f'<details class="{OVERFLOW_CLASS}">'
+        f"<summary>Show {hidden} more {noun}</summary>"
+        f'<div data-termynal data-ty-{buttons} data-ty-title="{_html_escape(title)}">'
+        f"<span data-ty>{output_html}</span>"
+        f"</div>"
+        f"</details>"
+    )
+
+
 def _one_block(
     command: click.core.Command,
     info_name: str,
     options: TermynalOptions,
     style: str = "",
 ) -> str:
-    help_text = _colored_help(command, info_name, width=options.width).rstrip("\n")
+    help_text = _captured_help(command, info_name, options.width)
+    return _help_block(help_text, info_name, options, style)
+
+
+def _help_block(
+    help_text: str,
+    info_name: str,
+    options: TermynalOptions,
+    style: str = "",
+    input_text: str = "",
+) -> str:
+    """Convert captured ANSI help to HTML and wrap it as a block (cheap stage).
+
+    ``input_text`` is the command line shown at the prompt, by default
+    ``<info_name> --help``.
+    """
+    overflow = ""
+    if options.max_lines is not None:
+        lines = help_text.split("\n")
+        if len(lines) > options.max_lines:
+            help_text = "\n".join(lines[: options.max_lines])
+            overflow = _overflow_html(
+                info_name,
+                _ansi_to_html(
+                    "\n".join(lines[options.max_lines :]),
+                    options.scheme,
+                    options.dark_bg,
+                ),
+                len(lines) - options.max_lines,
+                options.buttons,
+            )
     output_html = _ansi_to_html(help_text, options.scheme, options.dark_bg)
-    return _termynal_block_html(
-        title=info_name,
-        prompt=options.prompt,
-        input_text=f"{info_name} --help",
-        output_html=output_html,
-        buttons=options.buttons,
-        type_delay=options.type_delay,
-        line_delay=options.line_delay,
-        start_delay=options.start_delay,
-        style=style,
+    return (
+        _termynal_block_html(
+            title=info_name,
+            prompt=options.prompt,
+            input_text=input_text or f"{info_name} --help",
+            output_html=output_html,
+            buttons=options.buttons,
+            type_delay=options.type_delay,
+            line_delay=options.line_delay,
+            start_delay=options.start_delay,
+            style=style,
+            lazy=options.lazy,
+            static=options.static,
+        )
+        + overflow
     )
 
 
@@ -236,31 +387,47 @@ def _normalized(options: TermynalOptions) -> TermynalOptions:
     ``scheme``/``buttons`` are free-text directive input, so an unknown value
     falls back to its default; ``width`` is floored at 1 since a non-positive
     value would make ``rich.Console`` raise or render nothing; ``subcommands``
-    (a recursion depth) keeps any negative value as the -1 "all levels" sentinel.
+    (a recursion depth) keeps any negative value as the -1 "all levels" sentinel;
+    a non-positive ``max_lines`` means "no cap"; ``widths`` is floored like
+    ``width``, de-duplicated and sorted ascending, and a single entry simply
+    replaces ``width``.
     """
     scheme = options.scheme if options.scheme in ANSI_SCHEMES else DEFAULT_ANSI_SCHEME
     buttons = options.buttons if options.buttons in BUTTONS else DEFAULT_BUTTONS
     width = max(1, options.width)
     subcommands = options.subcommands if options.subcommands >= 0 else -1
+    max_lines = options.max_lines
+    if max_lines is not None and max_lines < 1:
+        max_lines = None
+    widths = tuple(sorted({max(1, value) for value in options.widths}))
+    if len(widths) == 1:
+        width, widths = widths[0], ()
     if (
         scheme == options.scheme
         and buttons == options.buttons
         and width == options.width
         and subcommands == options.subcommands
+        and max_lines == options.max_lines
+        and widths == options.widths
     ):
         return options
     return replace(
-        options, scheme=scheme, buttons=buttons, width=width, subcommands=subcommands
+        options,
+        scheme=scheme,
+        buttons=buttons,
+        width=width,
+        subcommands=subcommands,
+        max_lines=max_lines,
+        widths=widths,
     )
 
 
-def _subcommand_blocks(
+def _subcommand_targets(
     command: click.core.Command,
     display: str,
-    options: TermynalOptions,
     depth: int,
-) -> List[str]:
-    """Render up to ``depth`` levels of non-hidden subcommands, depth-first.
+) -> List[Tuple[click.core.Command, str]]:
+    """Collect up to ``depth`` levels of non-hidden subcommands, depth-first.
 
     Each subcommand is emitted as its own stacked block before its own children,
     so the output reads parent-then-descendants. Hidden commands are skipped at
@@ -269,16 +436,82 @@ def _subcommand_blocks(
     """
     if depth == 0 or not _is_click_group(command):
         return []
-    blocks: List[str] = []
+    targets: List[Tuple[click.core.Command, str]] = []
     for sub_name, subcommand in command.commands.items():
         if getattr(subcommand, "hidden", False):
             continue
         sub_display = f"{display} {sub_name}".strip()
-        blocks.append(
-            _one_block(subcommand, sub_display, options, style=STACKED_BLOCK_STYLE)
-        )
-        blocks.extend(_subcommand_blocks(subcommand, sub_display, options, depth - 1))
-    return blocks
+        targets.append((subcommand, sub_display))
+        targets.extend(_subcommand_targets(subcommand, sub_display, depth - 1))
+    return targets
+
+
+def _stacked_blocks(
+    targets: List[Tuple[click.core.Command, str]], options: TermynalOptions
+) -> str:
+    """Render each target's block; all but the first are spaced as stacked."""
+    return "\n".join(
+        _one_block(command, display, options, style=STACKED_BLOCK_STYLE if i else "")
+        for i, (command, display) in enumerate(targets)
+    )
+
+
+def _breakpoint_em(width: int) -> float:
+    return round(width * _CHAR_WIDTH_EM + _FRAME_EM, 2)
+
+
+def _responsive_style(scope: str, widths: Tuple[int, ...]) -> str:
+    """Media queries showing one width variant per viewport range.
+
+    Variant ``i`` is shown from its own breakpoint up to the next one; the
+    narrowest variant also covers every viewport below its breakpoint.
+    """
+    variant = f".{scope} > .{RESPONSIVE_VARIANT_CLASS}"
+    rules = [f"{variant} {{ display: none; }}"]
+    for i, width in enumerate(widths):
+        conditions = []
+        if i > 0:
+            conditions.append(f"(min-width: {_breakpoint_em(width)}em)")
+        if i + 1 < len(widths):
+            upper = _breakpoint_em(widths[i + 1]) - 0.01
+            conditions.append(f"(max-width: {round(upper, 2)}em)")
+        rule = f'{variant}[data-width="{width}"] {{ display: block; }}'
+        if conditions:
+            rule = f"@media {' and '.join(conditions)} {{ {rule} }}"
+        rules.append(rule)
+    return f"<style {RESPONSIVE_STYLE_ATTR}>" + " ".join(rules) + "</style>"
+
+
+def extract_responsive_styles(html: str) -> Tuple[str, List[str]]:
+    """``html`` without its responsive ``<style>`` elements, and those styles
+    (each once, in order)."""
+    styles = list(dict.fromkeys(_RESPONSIVE_STYLE_RE.findall(html)))
+    if not styles:
+        return html, []
+    return _RESPONSIVE_STYLE_RE.sub("", html), styles
+
+
+def _responsive_blocks(
+    targets: List[Tuple[click.core.Command, str]], options: TermynalOptions
+) -> str:
+    """Render the whole stack once per width and let CSS pick a variant.
+
+    Help capture is cached per ``(command, width)``, so each extra width costs
+    one capture per command; the command resolution is shared by all widths.
+    """
+    scope = "termynal-typer-w" + "-".join(str(width) for width in options.widths)
+    variants = [
+        f'<div class="{RESPONSIVE_VARIANT_CLASS}" data-width="{width}">'
+        f"{_stacked_blocks(targets, replace(options, width=width))}"
+        f"</div>"
+        for width in options.widths
+    ]
+    return (
+        _responsive_style(scope, options.widths)
+        + f'<div class="{RESPONSIVE_CLASS} {scope}">'
+        + "".join(variants)
+        + "</div>"
+    )
 
 
 def _select_command(root: click.core.Command, path: str) -> click.core.Command:
@@ -315,7 +548,9 @@ def render_termynal_html(
     and ``options.subcommands`` recursion applies relative to it. Each extra
     level of ``options.subcommands`` adds a stacked block per non-hidden
     subcommand at that depth; at the default of 0 only the selected block is
-    emitted (matching a bare ``<cmd> --help``).
+    emitted (matching a bare ``<cmd> --help``). With two or more
+    ``options.widths`` the stack is rendered once per width (see
+    ``_responsive_blocks``).
     """
     options = _normalized(options or TermynalOptions())
 
@@ -327,7 +562,10 @@ def render_termynal_html(
         selected = _select_command(root, command)
         display = f"{display} {command}".strip()
 
-    blocks: List[str] = [_one_block(selected, display, options)]
-    blocks.extend(_subcommand_blocks(selected, display, options, options.subcommands))
+    targets = [(selected, display)]
+    targets.extend(_subcommand_targets(selected, display, options.subcommands))
 
-    return "\n".join(blocks)
+    with span("render", blocks=len(targets)):
+        if len(options.widths) > 1:
+            return _responsive_blocks(targets, options)
+        return _stacked_blocks(targets, options)
@@ -0,0 +1,110 @@
+"""Chrome / Perfetto trace-event timeline of the render pipeline.
+
+With ``trace_file`` set, every directive and its phases (``import``,
+``get_command``, ``tree build``, ``render``, ``markdown.markdown``,
+``_ansi_to_html`` …) are recorded as complete (``"ph": "X"``) trace events and
+written as JSON at the end of the build. Load the file in ``chrome://tracing``
+or https://ui.perfetto.dev. Each span carries the page being rendered and the
+thread it ran on (one timeline row per worker thread).
+
+Instrumented code calls ``span(name, **args)``. With no tracer installed it
+returns a shared no-op context manager, so disabled tracing costs one global
+lookup per span.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Set, Union
+
+#: Page (``src_uri``) being rendered, set by the MkDocs plugin. A context
+#: variable so it follows the work into worker threads started with
+#: ``contextvars.copy_context()``.
+_PAGE: ContextVar[str] = ContextVar("mkdocs_typer2_page", default="")
+
+_NULL_SPAN = nullcontext()
+
+_tracer: Optional["Tracer"] = None
+
+
+class Tracer:
+    """Collects trace events; ``write`` saves them in Chrome's JSON format."""
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter_ns()
+        self._threads: Set[int] = set()
+
+    @contextmanager
+    def span(self, name: str, args: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            thread = threading.current_thread()
+            if thread.ident not in self._threads:
+                self._threads.add(thread.ident)
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": os.getpid(),
+                        "tid": thread.ident,
+                        "args": {"name": thread.name},
+                    }
+                )
+            page = _PAGE.get()
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": "mkdocs-typer2",
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": os.getpid(),
+                    "tid": thread.ident,
+                    "args": {**args, "page": page} if page else args,
+                }
+            )
+
+    def clear(self) -> None:
+        self.events.clear()
+        self._threads.clear()
+        self._origin = time.perf_counter_ns()
+
+    def write(self, path: Union[str, Path]) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(
+            json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}),
+            encoding="utf-8",
+        )
+
+
+def install(tracer: Optional[Tracer]) -> None:
+    """Route ``span`` calls to ``tracer`` (``None`` disables tracing)."""
+    global _tracer
+    _tracer = tracer
+
+
+def set_page(page: str) -> None:
+    """Tag the spans that follow with ``page`` (``""`` clears it)."""
+    _PAGE.set(page)
+
+
+def current_page() -> str:
+    """The page set by ``set_page``, or ``""`` outside a page."""
+    return _PAGE.get()
+
+
+def span(name: str, **args: Any) -> ContextManager[None]:
+    """Time the ``with`` block as ``name`` on the installed tracer, if any."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, args)
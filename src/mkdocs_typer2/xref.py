@@ -0,0 +1,172 @@
+"""Cross-references to documented commands and options.
+
+With ``xrefs`` on, the MkDocs plugin indexes every command it renders, and
+each of its options, under its path as written on the command line
+(``mycli deploy``, ``mycli deploy --force``), with the page and heading anchor
+it was rendered at. A Markdown link whose URL uses the ``typer:`` scheme is
+then resolved with one dictionary lookup:
+
+    See [](typer:mycli deploy --force) or [deploying](typer:mycli deploy).
+
+An empty link text becomes the reference itself, in code. Options link to
+their command's heading.
+
+The index can be exported as a Sphinx-style inventory (``xref_inventory``),
+which other projects load with ``xref_imports`` to link here without
+rebuilding anything; intersphinx and mkdocstrings read the same format.
+"""
+
+import html
+import re
+import urllib.request
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .search import SearchRecord
+
+#: URL scheme of a reference link.
+SCHEME = "typer:"
+
+#: Inventory domain; roles are ``command`` and ``option``.
+DOMAIN = "typer"
+
+_LINK_RE = re.compile(
+    rf'<a href="{re.escape(SCHEME)}([^"]*)"([^>]*)>(.*?)</a>', re.DOTALL
+)
+_INVENTORY_LINE_RE = re.compile(r"(.+?)\s+(\S+):(\S+)\s+(-?\d+)\s+(\S*)\s+(.*)")
+
+
+def xref_key(reference: str) -> str:
+    """Normalised form of ``reference``: words separated by single spaces."""
+    return " ".join(html.unescape(reference).split())
+
+
+@dataclass(frozen=True)
+class XrefTarget:
+    """Where a reference points.
+
+    ``url`` is a site-relative page URL, or an absolute one for targets loaded
+    from another project's inventory (``external``).
+    """
+
+    url: str
+    anchor: str
+    role: str
+    external: bool = False
+
+    def href(self, page_url: str) -> str:
+        """The link from the page at ``page_url``."""
+        if self.external:
+            url = self.url
+        else:
+            from mkdocs.utils import get_relative_url
+
+            url = get_relative_url(self.url, page_url)
+            # Directory URLs keep their slash ("" is the site root).
+            if self.url.endswith("/") or not self.url:
+                url = url.rstrip("/") + "/"
+        return f"{url}#{self.anchor}" if self.anchor else url
+
+
+class XrefIndex:
+    """References by key; this site's targets win over imported ones."""
+
+    def __init__(self) -> None:
+        self._local: Dict[str, XrefTarget] = {}
+        self._imported: Dict[str, XrefTarget] = {}
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def clear(self) -> None:
+        """Forget this site's targets (imported ones stay)."""
+        self._local.clear()
+
+    def add_records(
+        self, page_url: str, records: Iterable[Tuple[SearchRecord, str]]
+    ) -> None:
+        """Index ``(record, anchor)`` pairs rendered on ``page_url``.
+
+        The first page to document a command keeps it.
+        """
+        for record, anchor in records:
+            self._local.setdefault(
+                xref_key(record.path), XrefTarget(page_url, anchor, "command")
+            )
+            for option in record.options:
+                self._local.setdefault(
+                    xref_key(f"{record.path} {option}"),
+                    XrefTarget(page_url, anchor, "option"),
+                )
+
+    def resolve(self, reference: str) -> Optional[XrefTarget]:
+        key = xref_key(reference)
+        return self._local.get(key) or self._imported.get(key)
+
+    def resolve_links(self, content: str, page_url: str) -> Tuple[str, List[str]]:
+        """Turn ``typer:`` links in ``content`` into links to their targets.
+
+        Returns the new content and the references that did not resolve,
+        which are left as plain code.
+        """
+        unresolved: List[str] = []
+
+        def replace(match: "re.Match[str]") -> str:
+            reference, attributes, text = match.groups()
+            label = text or f"<code>{html.escape(xref_key(reference))}</code>"
+            target = self.resolve(reference)
+            if target is None:
+                unresolved.append(xref_key(reference))
+                return label
+            href = html.escape(target.href(page_url))
+            return f'<a href="{href}"{attributes}>{label}</a>'
+
+        return _LINK_RE.sub(replace, content), unresolved
+
+    def inventory(self, project: str, version: str = "") -> bytes:
+        """This site's targets as a Sphinx inventory (version 2)."""
+        header = (
+            "# Sphinx inventory version 2\n"
+            f"# Project: {project}\n"
+            f"# Version: {version}\n"
+            "# The remainder of this file is compressed using zlib.\n"
+        )
+        lines = []
+        for key, target in sorted(self._local.items()):
+            uri = f"{target.url}#{target.anchor}" if target.anchor else target.url
+            lines.append(f"{key} {DOMAIN}:{target.role} 1 {uri} -\n")
+        return header.encode("utf-8") + zlib.compress("".join(lines).encode("utf-8"))
+
+    def load_inventory(self, data: bytes, base_url: str) -> int:
+        """Import the ``typer`` entries of a Sphinx inventory; returns how many.
+
+        ``base_url`` is the URL the inventory's URIs are relative to.
+        """
+        header_end = 0
+        for _ in range(4):
+            header_end = data.index(b"\n", header_end) + 1
+        if not data.startswith(b"# Sphinx inventory version 2"):
+            raise ValueError("not a Sphinx inventory (version 2)")
+        body = zlib.decompress(data[header_end:]).decode("utf-8")
+        base_url = base_url.rstrip("/") + "/"
+        count = 0
+        for line in body.splitlines():
+            match = _INVENTORY_LINE_RE.match(line)
+            if not match or match.group(2) != DOMAIN:
+                continue
+            name, _, role, _, uri, _ = match.groups()
+            if uri.endswith("$"):
+                uri = uri[:-1] + name
+            url, _, anchor = uri.partition("#")
+            self._imported[xref_key(name)] = XrefTarget(
+                base_url + url, anchor, role, external=True
+            )
+            count += 1
+        return count
+
+
+def read_inventory(url: str) -> Tuple[bytes, str]:
+    """Fetch the inventory at ``url``; returns it and the URL its URIs start at."""
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read(), url.rsplit("/", 1)[0]
@@ -0,0 +1,156 @@
+"""Tests for ``:apps:``: several CLIs documented by one directive."""
+
+import sys
+import threading
+import time
+from dataclasses import replace
+
+import markdown
+import pytest
+
+from mkdocs_typer2.cache import CachedOutput
+from mkdocs_typer2.markdown import TyperExtension, TyperProcessor
+from mkdocs_typer2.plan import plan_docs
+
+BLOCK = """::: mkdocs-typer2
+    :apps:
+        - mkdocs_typer2.cli.cli:app :command: docs
+        - othertool:cli
+    :engine: native
+    :pretty: true
+    :command: ignored"""
+
+OTHER = '''
+import typer
+
+cli = typer.Typer()
+
+
+@cli.command()
+def ping(count: int = typer.Option(1, help="How many pings.")):
+    """Ping something."""
+'''
+
+
+@pytest.fixture
+def other_tool(tmp_path, monkeypatch):
+    (tmp_path / "othertool.py").write_text(OTHER, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    sys.modules.pop("othertool", None)
+
+
+def _output(module):
+    return CachedOutput("markdown", f"<p>{module}</p>", engine="native")
+
+
+def _markdown():
+    return markdown.Markdown(extensions=[TyperExtension()])
+
+
+def test_apps_resolve_to_one_directive_per_target():
+    processor = _markdown().parser.blockprocessors["typer"]
+
+    first, second = processor.resolve_directives(BLOCK)
+
+    assert (first.module, first.name, first.command) == (
+        "mkdocs_typer2.cli.cli",
+        "app",
+        "docs",
+    )
+    # The block's own :command: applies to targets without one.
+    assert (second.module, second.name, second.command) == (
+        "othertool",
+        "cli",
+        "ignored",
+    )
+    assert first.engine == second.engine == "native"
+    assert first.pretty and second.pretty
+
+
+def test_apps_render_in_target_order(other_tool):
+    html = _markdown().convert(BLOCK.replace("    :command: ignored", ""))
+
+    assert html.count('<div class="typer-docs">') == 2
+    assert html.index("Generate docs") < html.index("Ping something.")
+    assert "How many pings." in html
+
+
+def test_apps_render_concurrently_but_keep_their_order(monkeypatch):
+    block = "::: mkdocs-typer2\n    :apps:\n" + "".join(
+        f"        - tool{index}:app\n" for index in range(4)
+    )
+    running, overlap = set(), []
+    lock = threading.Lock()
+
+    def render(self, directive):
+        with lock:
+            running.add(directive.module)
+            overlap.append(len(running))
+        # Earlier targets finish last.
+        time.sleep(0.05 * (4 - int(directive.module[-1])))
+        with lock:
+            running.discard(directive.module)
+        return _output(directive.module)
+
+    monkeypatch.setattr(TyperProcessor, "_render", render)
+
+    html = _markdown().convert(block)
+
+    assert max(overlap) > 1
+    positions = [html.index(f"<p>tool{index}</p>") for index in range(4)]
+    assert positions == sorted(positions)
+
+
+def test_termynal_apps_render_one_at_a_time():
+    processor = _markdown().parser.blockprocessors["typer"]
+    block = BLOCK + "\n    :termynal: true"
+    active, seen = [], []
+
+    def render(directive):
+        active.append(directive)
+        seen.append(len(active))
+        time.sleep(0.02)
+        active.remove(directive)
+        return _output(directive.module)
+
+    processor._render = render
+    processor._outputs(processor.resolve_directives(block))
+
+    assert seen == [1, 1]
+
+
+def test_serial_apps_render_after_the_concurrent_ones():
+    processor = _markdown().parser.blockprocessors["typer"]
+    block = "::: mkdocs-typer2\n    :apps:\n" + "".join(
+        f"        - {module}:app\n" for module in ("first", "stubbed", "last")
+    )
+    events = []
+
+    def render(directive):
+        events.append(f"start {directive.module}")
+        time.sleep(0.02)
+        events.append(f"end {directive.module}")
+        return _output(directive.module)
+
+    processor._render = render
+    first, stubbed, last = processor.resolve_directives(block)
+    outputs = processor._outputs([first, replace(stubbed, stubs=["torch"]), last])
+
+    assert events[-2:] == ["start stubbed", "end stubbed"]
+    assert [output.html for output, _, _ in outputs] == [
+        "<p>first</p>",
+        "<p>stubbed</p>",
+        "<p>last</p>",
+    ]
+
+
+def test_plan_counts_each_target(tmp_path, other_tool):
+    (tmp_path / "index.md").write_text(BLOCK, encoding="utf-8")
+
+    first, second = plan_docs(tmp_path)
+
+    assert first.label == "mkdocs_typer2.cli.cli docs"
+    assert second.label == "othertool ignored"
+    assert (first.mode, second.mode) == ("native", "native")
+    assert second.commands == 1
@@ -0,0 +1,162 @@
+"""Tests for ``engine: auto`` and the paths it chooses between."""
+
+import os
+import sys
+import textwrap
+
+import markdown
+import pytest
+
+from mkdocs_typer2.markdown import TyperExtension, TyperProcessor
+from mkdocs_typer2.plan import plan_docs
+
+ANALYSABLE_CLI = textwrap.dedent(
+    '''
+    import typer
+
+    app = typer.Typer()
+
+
+    @app.command()
+    def run(count: int = typer.Option(1, help="How many")):
+        """Run it."""
+    '''
+)
+
+
+@pytest.fixture
+def cli_module(tmp_path, monkeypatch):
+    """A top-level module whose source the tests can edit."""
+    path = tmp_path / "auto_engine_cli.py"
+    path.write_text(ANALYSABLE_CLI)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield path
+    sys.modules.pop("auto_engine_cli", None)
+
+
+def _render(extension, module="auto_engine_cli"):
+    directive = f"::: mkdocs-typer2\n    :module: {module}\n    :engine: auto\n"
+    return markdown.markdown(directive, extensions=[extension])
+
+
+def _paths(extension):
+    return [choice.path for choice in extension.report.engine_choices]
+
+
+def test_auto_prefers_static_analysis(cli_module):
+    extension = TyperExtension()
+
+    html = _render(extension)
+
+    assert "How many" in html
+    assert _paths(extension) == ["static"]
+    assert "auto_engine_cli" not in sys.modules
+
+
+def test_auto_imports_what_static_analysis_cannot_decide(cli_module):
+    cli_module.write_text(ANALYSABLE_CLI.replace('"How many"', '"How " + "many"'))
+    extension = TyperExtension()
+
+    html = _render(extension)
+
+    assert "How many" in html
+    assert _paths(extension) == ["native"]
+
+
+def test_auto_falls_back_to_legacy(cli_module, monkeypatch):
+    cli_module.write_text(ANALYSABLE_CLI.replace('"How many"', '"How " + "many"'))
+
+    def broken(self, *args):
+        raise ImportError("missing dependency")
+
+    monkeypatch.setattr(TyperProcessor, "native_output", broken)
+    monkeypatch.setattr(
+        TyperProcessor, "_legacy", lambda self, directive: "# Legacy\n\n**Usage**:\n"
+    )
+    extension = TyperExtension()
+
+    assert "Legacy" in _render(extension)
+    assert _paths(extension) == ["legacy"]
+
+
+def test_auto_reuses_cache_entries_until_the_source_changes(cli_module, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = TyperExtension(cache_dir=cache_dir)
+    second = TyperExtension(cache_dir=cache_dir)
+
+    html = _render(first)
+    assert _render(second) == html
+    assert _paths(first) == ["static"] and _paths(second) == ["cache"]
+
+    stat = cli_module.stat()
+    os.utime(cli_module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    third = TyperExtension(cache_dir=cache_dir)
+    _render(third)
+    assert _paths(third) == ["static"]
+
+
+def test_auto_uses_snapshots(cli_module, tmp_path):
+    snapshot_dir = tmp_path / "snapshots"
+    writer = TyperExtension(snapshot_dir=str(snapshot_dir), update_snapshots=True)
+    html = _render(writer)
+    (snapshot,) = snapshot_dir.iterdir()
+    assert snapshot.name.startswith("auto_engine_cli.")
+    assert snapshot.suffix == ".html"
+
+    reader = TyperExtension(snapshot_dir=str(snapshot_dir))
+    assert _render(reader) == html
+    assert _paths(reader) == ["snapshot"]
+
+
+def test_snapshots_of_one_module_keep_a_file_per_target_and_settings(
+    cli_module, tmp_path
+):
+    cli_module.write_text(
+        ANALYSABLE_CLI
+        + textwrap.dedent(
+            '''
+
+            other = typer.Typer()
+
+
+            @other.command()
+            def stop(force: bool = typer.Option(False, help="Without asking")):
+                """Stop it."""
+            '''
+        )
+    )
+    blocks = [
+        f"::: mkdocs-typer2\n    :module: auto_engine_cli\n    :name: {name}\n"
+        f"    :engine: auto\n    :pretty: {pretty}\n"
+        for name in ("app", "other")
+        for pretty in ("true", "false")
+    ]
+    snapshot_dir = tmp_path / "snapshots"
+    writer = TyperExtension(snapshot_dir=str(snapshot_dir), update_snapshots=True)
+    rendered = [markdown.markdown(block, extensions=[writer]) for block in blocks]
+
+    assert len(set(rendered)) == 4
+    assert len(list(snapshot_dir.iterdir())) == 4
+    reader = TyperExtension(snapshot_dir=str(snapshot_dir))
+    assert [markdown.markdown(block, extensions=[reader]) for block in blocks] == (
+        rendered
+    )
+    assert _paths(reader) == ["snapshot"] * 4
+
+
+def test_summary_counts_auto_paths(cli_module, tmp_path):
+    extension = TyperExtension(cache_dir=str(tmp_path / "cache"))
+    _render(extension)
+    _render(extension)
+
+    assert "engine auto: 1 static, 1 cache" in extension.report.summary_lines()
+
+
+def test_plan_predicts_the_auto_path(cli_module, tmp_path):
+    (tmp_path / "index.md").write_text(
+        "::: mkdocs-typer2\n    :module: auto_engine_cli\n    :engine: auto\n"
+    )
+
+    (plan,) = plan_docs(tmp_path)
+
+    assert plan.mode == "static"
@@ -0,0 +1,203 @@
+"""Tests for ``render_budget_ms`` and the last-good output cache."""
+
+import logging
+import textwrap
+import time
+
+import markdown
+import pytest
+
+from mkdocs_typer2.cache import CachedOutput, OutputCache, cache_key
+from mkdocs_typer2.markdown import TyperExtension, TyperProcessor, _page_url
+from mkdocs_typer2.tracing import set_page
+
+MODULE = "mkdocs_typer2.cli.cli"
+DIRECTIVE = f"::: mkdocs-typer2\n    :module: {MODULE}\n    :name: sample\n"
+
+
+@pytest.fixture
+def slow_native(monkeypatch):
+    """Make the native engine take half a second longer."""
+    native_output = TyperProcessor.native_output
+
+    def slow(self, *args):
+        time.sleep(0.5)
+        return native_output(self, *args)
+
+    monkeypatch.setattr(TyperProcessor, "native_output", slow)
+
+
+@pytest.fixture
+def page():
+    set_page("reference/cli.md")
+    yield "reference/cli.md"
+    set_page("")
+
+
+def _render(extension, directive=DIRECTIVE):
+    return markdown.markdown(directive, extensions=[extension])
+
+
+def test_render_within_budget_fills_the_cache(tmp_path):
+    extension = TyperExtension(
+        engine="native", render_budget_ms=10_000, cache_dir=str(tmp_path)
+    )
+
+    html = _render(extension)
+
+    assert "Generate docs for a project" in html
+    (entry,) = tmp_path.glob("*.json")
+    assert OutputCache(tmp_path).load(entry.stem).kind == "markdown"
+
+
+def test_over_budget_uses_the_last_good_output(tmp_path, slow_native, caplog, page):
+    fresh = _render(TyperExtension(engine="native", cache_dir=str(tmp_path)))
+
+    extension = TyperExtension(
+        engine="native", render_budget_ms=50, cache_dir=str(tmp_path)
+    )
+    with caplog.at_level(logging.WARNING, logger="mkdocs.plugins.mkdocs_typer2"):
+        started = time.perf_counter()
+        html = _render(extension)
+        elapsed = time.perf_counter() - started
+
+    assert html == fresh
+    assert elapsed < 0.4
+    assert (
+        f"{MODULE} on reference/cli.md exceeded its 50 ms render budget; "
+        "using its last good output" in caplog.text
+    )
+
+
+def test_over_budget_falls_back_to_the_snapshot(tmp_path, slow_native, caplog, page):
+    snapshot_dir = str(tmp_path / "snapshots")
+    fresh = _render(
+        TyperExtension(
+            engine="native", snapshot_dir=snapshot_dir, update_snapshots=True
+        )
+    )
+
+    extension = TyperExtension(
+        engine="native", render_budget_ms=50, snapshot_dir=snapshot_dir
+    )
+    with caplog.at_level(logging.WARNING, logger="mkdocs.plugins.mkdocs_typer2"):
+        html = _render(extension)
+
+    assert html == fresh
+    assert "using its last good output" in caplog.text
+
+
+def test_over_budget_without_cache_renders_a_placeholder(slow_native, caplog, page):
+    extension = TyperExtension(
+        engine="native",
+        render_budget_ms=50,
+        full_docs_url="https://docs.example.com/",
+    )
+
+    with caplog.at_level(logging.WARNING, logger="mkdocs.plugins.mkdocs_typer2"):
+        html = _render(extension)
+
+    assert 'class="typer-docs-placeholder"' in html
+    assert 'href="https://docs.example.com/reference/cli/"' in html
+    assert "rendering a placeholder" in caplog.text
+
+
+def test_directive_budget_overrides_the_global_one(slow_native):
+    extension = TyperExtension(engine="native", render_budget_ms=50)
+
+    html = _render(extension, DIRECTIVE + "    :render_budget_ms: 10000\n")
+
+    assert "Generate docs for a project" in html
+
+
+def test_render_waits_for_an_abandoned_one_holding_process_state(monkeypatch):
+    events = []
+
+    def termynal_html(module, *args):
+        events.append(f"start {module}")
+        time.sleep(0.3 if module == "slow" else 0)
+        events.append(f"end {module}")
+        return "<div data-termynal></div>"
+
+    monkeypatch.setattr("mkdocs_typer2.markdown._termynal_html", termynal_html)
+    extension = TyperExtension(termynal=True)
+
+    _render(
+        extension, "::: mkdocs-typer2\n    :module: slow\n    :render_budget_ms: 50\n"
+    )
+    assert events == ["start slow"]
+    _render(extension, "::: mkdocs-typer2\n    :module: next\n")
+
+    # The abandoned render put sys.stdout and the console hook back first.
+    assert events == ["start slow", "end slow", "start next", "end next"]
+
+
+def test_over_budget_isolated_render_kills_its_worker(tmp_path, monkeypatch):
+    (tmp_path / "slow_isolated_cli.py").write_text(
+        textwrap.dedent(
+            """
+            import time
+
+            import typer
+
+            time.sleep(5)
+            app = typer.Typer()
+
+
+            @app.command()
+            def run():
+                pass
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    extension = TyperExtension(
+        engine="native", isolate_imports=True, render_budget_ms=300
+    )
+
+    html = _render(extension, "::: mkdocs-typer2\n    :module: slow_isolated_cli\n")
+
+    assert "typer-docs-placeholder" in html
+    assert extension.isolation._worker is None
+
+
+def test_cache_key_is_stable_and_setting_sensitive():
+    assert cache_key({"a": 1}) == cache_key({"a": 1})
+    assert cache_key({"a": 1}) != cache_key({"a": 2})
+
+
+def test_cache_tolerates_missing_and_corrupt_entries(tmp_path):
+    cache = OutputCache(tmp_path)
+    assert cache.load("missing") is None
+
+    (tmp_path / "corrupt.json").write_text("{")
+    assert cache.load("corrupt") is None
+
+    cache.store("key", CachedOutput("termynal", "<div></div>", 2))
+    assert cache.load("key") == CachedOutput("termynal", "<div></div>", 2)
+
+
+@pytest.mark.parametrize(
+    "page,url,flat_url",
+    [
+        ("index.md", "", "index.html"),
+        ("cli.md", "cli/", "cli.html"),
+        ("ref/index.md", "ref/", "ref/index.html"),
+    ],
+)
+def test_page_url(page, url, flat_url):
+    assert _page_url(page) == url
+    assert _page_url(page, use_directory_urls=False) == flat_url
+
+
+def test_placeholder_links_follow_use_directory_urls(slow_native, page):
+    extension = TyperExtension(
+        engine="native",
+        render_budget_ms=50,
+        full_docs_url="https://docs.example.com/",
+        use_directory_urls=False,
+    )
+
+    html = _render(extension)
+
+    assert 'href="https://docs.example.com/reference/cli.html"' in html
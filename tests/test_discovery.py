@@ -0,0 +1,84 @@
+"""Tests for ``discover``: documenting installed console scripts."""
+
+import pytest
+
+from mkdocs_typer2 import discovery
+from mkdocs_typer2.discovery import (
+    ConsoleScript,
+    console_scripts,
+    discover,
+    render_console_script,
+    render_console_scripts,
+)
+from mkdocs_typer2.plugin import MkdocsTyper
+
+SAMPLE = ConsoleScript("mkdocs-typer2", "mkdocs_typer2.cli.cli", "app", "mkdocs-typer2")
+
+
+def test_console_scripts_filters_by_distribution_and_name():
+    assert console_scripts(distributions=["mkdocs_typer2"]) == [SAMPLE]
+    assert console_scripts(scripts=["mkdocs-typer*"]) == [SAMPLE]
+    assert console_scripts(["mkdocs-typer2"], ["other-*"]) == []
+
+
+def test_render_console_script_uses_the_script_name():
+    md = render_console_script("mkdocs_typer2.cli.cli", "app", "mytool", pretty=True)
+
+    assert md.startswith("# mytool\n")
+    assert "`mytool docs [OPTIONS]`" in md
+
+
+def test_render_console_scripts_drops_what_is_not_a_cli():
+    plain = ConsoleScript("plain", "os.path", "join", "x")
+
+    rendered = render_console_scripts([SAMPLE, plain], pretty=False, processes=2)
+
+    assert rendered["plain"] is None
+    assert rendered["mkdocs-typer2"].startswith("# mkdocs-typer2\n")
+
+
+def test_discover_caches_the_scan(tmp_path, monkeypatch):
+    plain = ConsoleScript("plain", "os.path", "join", "x")
+    monkeypatch.setattr(discovery, "console_scripts", lambda *args: [SAMPLE, plain])
+    rendered = []
+
+    def render(scripts, *args):
+        scripts = list(scripts)
+        rendered.append([script.name for script in scripts])
+        return {
+            script.name: "# page" if script is SAMPLE else None for script in scripts
+        }
+
+    monkeypatch.setattr(discovery, "render_console_scripts", render)
+
+    assert discover(cache_dir=tmp_path) == {"mkdocs-typer2": "# page"}
+    assert discover(cache_dir=tmp_path) == {"mkdocs-typer2": "# page"}
+    assert rendered == [["mkdocs-typer2", "plain"], ["mkdocs-typer2"]]
+
+    # Another installed set (here: other filters) scans everything again.
+    discover(scripts=["*"], cache_dir=tmp_path)
+    assert rendered[-1] == ["mkdocs-typer2", "plain"]
+
+
+def test_plugin_generates_a_page_per_script(tmp_path):
+    from mkdocs.config import load_config
+    from mkdocs.structure.files import Files
+
+    (tmp_path / "docs" / "cli").mkdir(parents=True)
+    (tmp_path / "mkdocs.yml").write_text("site_name: t\n")
+    config = load_config(str(tmp_path / "mkdocs.yml"))
+    # Set by MkDocs while it runs a plugin's event handler.
+    config.plugins._current_plugin = "mkdocs-typer2"
+    plugin = MkdocsTyper()
+    plugin.load_config({"discover": True, "discover_distributions": ["mkdocs-typer2"]})
+
+    files = plugin.on_files(Files([]), config=config)
+
+    (page,) = files.documentation_pages()
+    assert page.src_uri == "cli/mkdocs-typer2.md"
+    assert page.content_string.startswith("# mkdocs-typer2\n")
+
+
+@pytest.mark.parametrize("name", ["My.Tools", "my_tools", "MY-TOOLS"])
+def test_distribution_names_are_normalised(name):
+    assert discovery._normalized(name) == "my-tools"
@@ -0,0 +1,90 @@
+"""Tests for ``:examples:``: running example invocations of a CLI."""
+
+import markdown
+
+from mkdocs_typer2 import examples as examples_module
+from mkdocs_typer2.examples import ExampleCache, cached_examples, example_args
+from mkdocs_typer2.markdown import TERMYNAL_CONTAINER_CLASS, TyperExtension
+
+MODULE = "mkdocs_typer2.cli.cli"
+
+BLOCK = """::: mkdocs-typer2
+    :module: mkdocs_typer2.cli.cli
+    :name: app
+    :examples:
+        - app docs --name "my project"
+        nope
+    :scheme: dracula"""
+
+
+def _processor(**kwargs):
+    md = markdown.Markdown(extensions=[TyperExtension(**kwargs)])
+    return md, md.parser.blockprocessors["typer"]
+
+
+def test_examples_are_read_as_a_list():
+    _, processor = _processor()
+
+    directive = processor.resolve_directive(BLOCK)
+
+    assert directive.examples == ['app docs --name "my project"', "nope"]
+    assert directive.termynal_options.scheme == "dracula"
+    assert example_args(directive.examples[0], "app") == [
+        "docs",
+        "--name",
+        "my project",
+    ]
+
+
+def test_examples_capture_output_and_exit_code():
+    ok, error = cached_examples(MODULE, "app", [["docs", "--name", "x"], ["nope"]])
+
+    assert ok.output == "Generating docs for x"
+    assert ok.exit_code == 0
+    assert error.exit_code == 2
+    assert "No such command" in error.output
+    assert "\x1b[" in error.output  # rich's color is kept
+
+
+def test_examples_are_cached_by_arguments(tmp_path, monkeypatch):
+    ran = []
+    run_examples = examples_module.run_examples
+
+    def counting(module, name, examples, *args):
+        ran.extend(" ".join(example) for example in examples)
+        return run_examples(module, name, examples, *args)
+
+    monkeypatch.setattr(examples_module, "run_examples", counting)
+    args = [["docs", "--name", "x"]]
+
+    first = cached_examples(MODULE, "app", args, cache=ExampleCache(tmp_path))
+    # A new cache over the same directory: a later build.
+    again = cached_examples(MODULE, "app", args, cache=ExampleCache(tmp_path))
+    cached_examples(MODULE, "app", [["docs", "--name", "y"]], cache=ExampleCache())
+
+    assert again == first
+    assert ran == ["docs --name x", "docs --name y"]
+
+
+def test_examples_run_in_parallel_workers_in_order():
+    results = cached_examples(
+        MODULE,
+        "app",
+        [["docs", "--name", name] for name in "abc"],
+        processes=2,
+    )
+
+    assert [result.output for result in results] == [
+        f"Generating docs for {name}" for name in "abc"
+    ]
+
+
+def test_examples_directive_renders_termynal_blocks():
+    md, _ = _processor()
+
+    html = md.convert(BLOCK)
+
+    assert TERMYNAL_CONTAINER_CLASS in html
+    assert html.count("data-termynal") == 2
+    assert ">app docs --name 'my project'</span>" in html
+    assert "Generating docs for my project" in html
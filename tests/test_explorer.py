@@ -0,0 +1,125 @@
+"""Tests for ``:explorer:``: the compact JSON model and its viewer's assets."""
+
+import gzip
+import json
+import re
+from types import SimpleNamespace
+
+import markdown
+
+from mkdocs_typer2.explorer import command_model, model_json
+from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.plan import plan_docs
+from mkdocs_typer2.plugin import MkdocsTyper
+from mkdocs_typer2.pretty import build_tree_from_click_app
+
+MODULE = "mkdocs_typer2.cli.cli"
+DIRECTIVE = (
+    f"::: mkdocs-typer2\n    :module: {MODULE}\n    :name: sample\n"
+    "    :explorer: true\n"
+)
+
+
+def _inline_model(html):
+    match = re.search(r'<script type="application/json">(.*?)</script>', html)
+    return json.loads(match.group(1))
+
+
+def test_command_model_is_compact():
+    tree = build_tree_from_click_app(MODULE, "sample")
+
+    model = command_model(tree)
+
+    assert model["n"] == "sample"
+    assert [child["n"] for child in model["c"]] == [
+        "docs",
+        "export",
+        "hello",
+        "subapp",
+    ]
+    docs = model["c"][0]
+    # [name, description, required]; trailing empty fields are dropped.
+    assert docs["o"] == [["--name <str>", "The name of the project", True]]
+    export = model["c"][1]
+    assert export["o"][0] == [
+        "--detail [full|minimal]",
+        "Documentation detail level",
+        False,
+        "full",
+    ]
+    assert "a" not in docs and "c" not in docs
+    assert len(model_json(tree)) < len(tree.model_dump_json())
+
+
+def test_explorer_directive_inlines_the_model_without_the_plugin():
+    html = markdown.markdown(DIRECTIVE, extensions=[TyperExtension(engine="native")])
+
+    assert '<div class="typer-explorer">' in html
+    assert "<table" not in html and "<h1" not in html
+    model = _inline_model(html)
+    assert model["v"] == 1 and model["root"]["n"] == "sample"
+
+
+def test_explorer_model_escapes_closing_tags(tmp_path, monkeypatch):
+    (tmp_path / "explorer_html_cli.py").write_text(
+        "import typer\n\napp = typer.Typer()\n\n\n"
+        "@app.command()\ndef run():\n"
+        '    """Prints </script><b>bold</b>."""\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    html = markdown.markdown(
+        "::: mkdocs-typer2\n    :module: explorer_html_cli\n    :explorer: true\n",
+        extensions=[TyperExtension(engine="static")],
+    )
+
+    assert "</script><b>" not in html
+    assert _inline_model(html)["root"]["d"] == "Prints </script><b>bold</b>."
+
+
+def test_explorer_static_engine_matches_native():
+    native = markdown.markdown(DIRECTIVE, extensions=[TyperExtension(engine="native")])
+    static = markdown.markdown(DIRECTIVE, extensions=[TyperExtension(engine="static")])
+
+    assert _inline_model(static) == _inline_model(native)
+
+
+def test_plugin_writes_models_and_injects_the_viewer(tmp_path):
+    plugin = MkdocsTyper()
+    plugin.load_config({"engine": "native", "explorer": True, "explorer_gzip": True})
+    config = SimpleNamespace(config_file_path=str(tmp_path / "mkdocs.yml"))
+    plugin._extension = plugin.make_extension(config)
+    plugin.on_pre_build(config)
+    page = SimpleNamespace(file=SimpleNamespace(src_uri="ref/cli.md"), url="ref/cli/")
+    unused = SimpleNamespace(file=SimpleNamespace(src_uri="index.md"), url="")
+
+    html = markdown.markdown(DIRECTIVE, extensions=[plugin._extension])
+    plugin.on_page_content(html, page=page, config=config, files=None)
+    output = plugin.on_post_page("<head></head><body></body>", page=page, config={})
+    shell = "<head></head><body></body>"
+    assert plugin.on_post_page(shell, page=unused, config={}) == shell
+
+    path = re.search(r'data-model="([^"]+)"', html).group(1)
+    assert path.startswith("models/mkdocs_typer2.cli.cli.") and path.endswith(".gz")
+    assert "application/json" not in html
+    assert re.search(
+        r'href="../../assets/mkdocs-typer2/typer-explorer\.\w+\.css"', output
+    )
+    assert re.search(
+        r'src="../../assets/mkdocs-typer2/typer-explorer\.\w+\.js"', output
+    )
+
+    plugin.on_post_build({"site_dir": str(tmp_path / "site")})
+    assets = tmp_path / "site" / "assets" / "mkdocs-typer2"
+    plain = json.loads((assets / path[: -len(".gz")]).read_text())
+    assert plain["root"]["n"] == "sample"
+    assert json.loads(gzip.decompress((assets / path).read_bytes())) == plain
+    assert len(list(assets.glob("typer-explorer.*"))) == 2
+
+
+def test_plan_counts_explorer_directives(tmp_path):
+    (tmp_path / "index.md").write_text(DIRECTIVE)
+
+    (plan,) = plan_docs(tmp_path)
+
+    assert (plan.mode, plan.commands, plan.blocks) == ("explorer", 7, 1)
@@ -0,0 +1,79 @@
+"""Tests for the multi-format export."""
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from mkdocs_typer2 import export as export_module
+from mkdocs_typer2.export import _roff, app, export
+from mkdocs_typer2.pretty import _walk, build_tree_from_click_app, tree_to_markdown
+
+
+@pytest.fixture(scope="module")
+def tree():
+    return build_tree_from_click_app("mkdocs_typer2.cli.cli", "mycli")
+
+
+def test_export_writes_every_format(tree):
+    files = export(tree)
+
+    assert files["mycli.md"] == tree_to_markdown(tree)
+    assert '<section id="mycli-export">' in files["mycli.html"]
+    assert "man/mycli.1" in files and "man/mycli-subapp-sub-command.1" in files
+    document = json.loads(files["mycli.json"])
+    assert document["version"] == 1
+    export_command = document["root"]["commands"][1]
+    assert export_command["path"] == "mycli export"
+    assert export_command["options"][0]["flags"] == ["--detail"]
+    assert export_command["options"][0]["metavar"] == "[full|minimal]"
+
+
+def test_export_walks_the_tree_once(tree, monkeypatch):
+    calls = []
+    option_text = export_module._option_text
+
+    def counting(name, *args):
+        calls.append(name)
+        return option_text(name, *args)
+
+    monkeypatch.setattr(export_module, "_option_text", counting)
+
+    export(tree)
+
+    # Each option is split once, however many formats use it.
+    assert len(calls) == sum(len(node.options) for node in _walk(tree))
+
+
+def test_man_page_escapes_roff(tree):
+    page = export(tree, ["man"])["man/mycli-export.1"]
+
+    assert page.startswith('.TH "MYCLI\\-EXPORT" "1"')
+    assert "\\fB\\-\\-retries\\fR \\fI<int>\\fR" in page
+    assert ".SH SEE ALSO\n\\fBmycli\\fR(1)" in page
+    assert _roff(".hidden\n'quote \\ back") == "\\&.hidden\n\\&'quote \\e back"
+
+
+def test_export_rejects_unknown_formats(tree):
+    with pytest.raises(ValueError, match="Unknown export format 'pdf'"):
+        export(tree, ["pdf"])
+
+
+def test_export_command_writes_files(tmp_path):
+    result = CliRunner().invoke(
+        app,
+        [
+            "mkdocs_typer2.cli.cli:app",
+            "--format",
+            "json",
+            "--format",
+            "man",
+            "--output-dir",
+            str(tmp_path),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "app.json").exists()
+    assert (tmp_path / "man" / "app-docs.1").exists()
+    assert not (tmp_path / "app.md").exists()
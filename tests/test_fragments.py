@@ -0,0 +1,132 @@
+"""Tests for converting command trees to HTML a subtree at a time."""
+
+import subprocess
+import sys
+
+import markdown
+import pytest
+
+from mkdocs_typer2.fragments import FragmentCache, TreeMarkdown, tree_html
+from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.pretty import (
+    Argument,
+    CommandNode,
+    Option,
+    build_tree_from_click_app,
+    tree_to_markdown,
+    tree_to_markdown_list,
+)
+
+
+def _command(name, *subcommands):
+    return CommandNode(
+        name=name,
+        description=f"{name.title()} things.",
+        usage=f"cli {name} [OPTIONS]",
+        arguments=[Argument(name="PATH", description="Where.", required=True)],
+        options=[
+            Option(name="--verbose", description="Talk more."),
+            Option(name=f"--{name}", description="Its own.", default="1"),
+        ],
+        subcommands=list(subcommands),
+    )
+
+
+@pytest.fixture
+def tree():
+    return _command(
+        "cli",
+        _command("remote", _command("add"), _command("remove")),
+        _command("status"),
+    )
+
+
+def test_structural_hash_covers_the_subtree(tree):
+    before = [tree.structural_hash(), *(c.structural_hash() for c in tree.subcommands)]
+
+    tree.subcommands[0].subcommands[1].options[1].default = "2"
+
+    assert tree.structural_hash() != before[0]
+    assert tree.subcommands[0].structural_hash() != before[1]
+    assert tree.subcommands[1].structural_hash() == before[2]
+    assert _command("status").structural_hash() == before[2]
+
+
+def test_structural_hash_is_the_same_in_every_process(tmp_path):
+    # The sample CLI has an option with a callable type, whose repr carries an
+    # object address.
+    script = (
+        "from mkdocs_typer2.fragments import FragmentCache, tree_html\n"
+        "from mkdocs_typer2.pretty import build_tree_from_click_app\n"
+        "tree = build_tree_from_click_app('mkdocs_typer2.cli.cli', 'app')\n"
+        f"tree_html(tree, compact=True, cache=FragmentCache({str(tmp_path)!r}))\n"
+        "print(tree.structural_hash())\n"
+    )
+    hashes = {
+        subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout
+        for _ in range(2)
+    }
+
+    assert len(hashes) == 1
+    # The second build found every fragment the first one stored.
+    before = len(list(tmp_path.iterdir()))
+    subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+    assert len(list(tmp_path.iterdir())) == before
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("pretty", [True, False])
+def test_stitched_html_matches_whole_conversion(tree, pretty, compact):
+    app = build_tree_from_click_app("mkdocs_typer2.cli.cli", "app")
+    render = tree_to_markdown if pretty else tree_to_markdown_list
+
+    for command in (tree, app):
+        html, _ = tree_html(command, pretty, compact)
+
+        assert html == markdown.markdown(
+            render(command, compact), extensions=["tables"]
+        )
+
+
+def test_rebuild_converts_only_changed_subtrees(tree, tmp_path):
+    _, first = tree_html(tree, cache=FragmentCache(tmp_path))
+    # A later build: a new cache over the same directory.
+    _, unchanged = tree_html(tree, cache=FragmentCache(tmp_path))
+    tree.subcommands[0].subcommands[1].options[1].description = "Changed."
+    html, changed = tree_html(tree, cache=FragmentCache(tmp_path))
+
+    # Sections of cli, remote, status, add and remove plus two headings.
+    assert first == 7
+    assert unchanged == 0
+    # cli, remote and remove with their headings again; status and add are
+    # stitched in.
+    assert changed == 5
+    assert "Changed." in html
+
+
+def test_native_directive_reuses_fragments(monkeypatch):
+    extension = TyperExtension(engine="native", pretty=True)
+    block = "::: mkdocs-typer2\n    :module: mkdocs_typer2.cli.cli\n    :name: app"
+    converted = []
+
+    def counting(*args):
+        html, count = tree_html(*args)
+        converted.append(count)
+        return html, count
+
+    monkeypatch.setattr("mkdocs_typer2.markdown.tree_html", counting)
+
+    first = markdown.Markdown(extensions=[extension]).convert(block)
+    again = markdown.Markdown(extensions=[extension]).convert(block)
+
+    assert again == first
+    assert converted[0] > 0 and converted[1] == 0
+
+
+def test_tree_markdown_is_still_markdown(tree):
+    text = TreeMarkdown(tree_to_markdown(tree), tree, True)
+
+    assert text == tree_to_markdown(tree)
+    assert text.tree is tree
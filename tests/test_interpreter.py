@@ -0,0 +1,126 @@
+"""Tests for ``:python:``: building trees with another interpreter's worker."""
+
+import sys
+
+import markdown
+import pytest
+
+from mkdocs_typer2.interpreter import InterpreterPool, interpreter_path
+from mkdocs_typer2.markdown import TyperExtension, _cache_key, _snapshot_name
+from mkdocs_typer2.pretty import (
+    CommandNode,
+    build_tree_from_click_app,
+    tree_to_markdown,
+)
+
+OLD_CLI = '''
+import typer
+
+app = typer.Typer(help="Release 1 of the tool.")
+
+
+@app.command()
+def sync(force: bool = typer.Option(False, help="Overwrite changes.")):
+    """Sync everything."""
+
+
+@app.command()
+def status():
+    """Show the status."""
+'''
+
+
+@pytest.fixture
+def pool():
+    pool = InterpreterPool()
+    yield pool
+    pool.close()
+
+
+def test_worker_tree_matches_the_native_engine(pool):
+    tree = pool.tree(sys.executable, "mkdocs_typer2.cli.cli", "app")
+
+    native = build_tree_from_click_app("mkdocs_typer2.cli.cli", "app")
+    rendered = tree_to_markdown(CommandNode.model_validate(tree))
+    assert rendered == tree_to_markdown(native)
+
+
+def test_worker_imports_from_the_working_directory(pool, tmp_path, monkeypatch):
+    (tmp_path / "oldcli.py").write_text(OLD_CLI, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    tree = pool.tree(sys.executable, "oldcli")
+
+    assert tree["description"] == "Release 1 of the tool."
+    assert [command["name"] for command in tree["commands"]] == ["sync", "status"]
+    assert pool.fingerprint(sys.executable, "oldcli")
+    assert pool.fingerprint(sys.executable, "no_such_module") == ""
+
+
+def test_worker_errors_are_raised(pool):
+    with pytest.raises(RuntimeError, match="ModuleNotFoundError"):
+        pool.tree(sys.executable, "no_such_module")
+    # The worker survives a failed request.
+    assert pool.tree(sys.executable, "mkdocs_typer2.cli.cli", "app")["name"] == "app"
+
+
+def test_missing_interpreter_is_a_runtime_error(pool, tmp_path):
+    missing = str(tmp_path / "no-such-python")
+
+    with pytest.raises(RuntimeError, match="cannot start '.*no-such-python'"):
+        pool.tree(missing, "mkdocs_typer2.cli.cli", "app")
+
+
+def test_submit_reuses_the_request(pool):
+    first = pool.submit(sys.executable, "mkdocs_typer2.cli.cli", "app")
+
+    assert pool.submit(sys.executable, "mkdocs_typer2.cli.cli", "app") is first
+
+
+def test_interpreter_path_finds_a_virtualenv_python(tmp_path):
+    python = tmp_path / "venvs" / "v1" / "bin" / "python"
+    python.parent.mkdir(parents=True)
+    python.touch()
+
+    assert interpreter_path("venvs/v1", tmp_path) == str(python)
+    assert interpreter_path(str(python)) == str(python)
+    assert interpreter_path("python3.9") == "python3.9"
+    with pytest.raises(ValueError, match="No Python interpreter"):
+        interpreter_path(str(tmp_path))
+
+
+def test_python_directive_renders_with_the_named_interpreter():
+    extension = TyperExtension(interpreters={"v1": sys.executable}, pretty=True)
+    md = markdown.Markdown(extensions=[extension])
+    block = (
+        "::: mkdocs-typer2\n"
+        "    :module: mkdocs_typer2.cli.cli\n"
+        "    :name: app\n"
+        "    :python: v1"
+    )
+    try:
+        extension.prefetch(block)
+        html = md.convert(block)
+    finally:
+        extension.interpreter_pool.close()
+
+    assert '<div class="typer-docs">' in html
+    assert "docs" in html
+    processor = md.parser.blockprocessors["typer"]
+    directive = processor.resolve_directive(block)
+    assert directive.python == sys.executable
+    other = processor.resolve_directive(block.replace(":python: v1", ""))
+    assert _cache_key(directive) != _cache_key(other)
+    assert _snapshot_name(directive) != _snapshot_name(other)
+
+
+def test_prefetch_needs_no_markdown_instance():
+    extension = TyperExtension(interpreters={"v1": sys.executable})
+    block = "::: mkdocs-typer2\n    :module: mkdocs_typer2.cli.cli\n    :python: v1"
+    submitted = []
+    extension.interpreter_pool.submit = lambda *request: submitted.append(request)
+
+    extension.prefetch(block)
+
+    assert submitted == [(sys.executable, "mkdocs_typer2.cli.cli", "")]
+    assert extension.processor is None
@@ -0,0 +1,89 @@
+"""Tests for rendering directives in an isolated worker process."""
+
+import os
+import sys
+import textwrap
+import threading
+import time
+
+import markdown
+import pytest
+
+from mkdocs_typer2.isolation import IsolatedRenderer
+from mkdocs_typer2.markdown import TyperExtension
+
+ISOLATED_CLI = textwrap.dedent(
+    '''
+    import typer
+
+    app = typer.Typer()
+
+
+    @app.command()
+    def run(count: int = typer.Option(1, help="How many")):
+        """Run once in a worker."""
+    '''
+)
+
+
+@pytest.fixture
+def renderer():
+    renderer = IsolatedRenderer()
+    yield renderer
+    renderer.close()
+
+
+def test_worker_is_reused_per_module_group(renderer):
+    first = renderer.run("a", os.getpid)
+    assert renderer.run("a", os.getpid) == first
+    assert first != os.getpid()
+
+    assert renderer.run("b", os.getpid) != first
+
+
+def test_worker_errors_are_raised_in_the_build(renderer):
+    with pytest.raises(ZeroDivisionError):
+        renderer.run("a", divmod, 1, 0)
+
+    # The worker survives a failed request.
+    assert renderer.run("a", divmod, 7, 2) == (3, 1)
+
+
+def test_killed_worker_is_reaped_and_its_pipes_closed(renderer):
+    renderer.run("a", os.getpid)
+    worker = renderer._worker
+    errors = []
+
+    def request():
+        try:
+            renderer.run("a", time.sleep, 10)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    time.sleep(0.2)
+    renderer.kill()
+    thread.join(5)
+
+    assert worker.returncode is not None
+    assert worker.stdin.closed and worker.stdout.closed
+    assert "exited unexpectedly" in str(errors[0])
+
+
+def test_isolated_directives_leave_the_module_unimported(tmp_path, monkeypatch):
+    (tmp_path / "isolated_cli_for_tests.py").write_text(ISOLATED_CLI)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    extension = TyperExtension(engine="native", isolate_imports=True)
+    directive = "::: mkdocs-typer2\n    :module: isolated_cli_for_tests\n"
+
+    try:
+        html = markdown.markdown(
+            f"{directive}\n\n{directive}    :termynal: true\n",
+            extensions=[extension],
+        )
+    finally:
+        extension.isolation.close()
+
+    assert "Run once in a worker." in html and "--count" in html
+    assert "isolated_cli_for_tests" not in sys.modules
@@ -112,7 +112,9 @@ def test_typer_processor_invalid_engine_raises():
     parent = etree.Element("div")
     blocks = [":::mkdocs-typer2\n    :module: test_module\n    :engine: nope"]
 
-    with pytest.raises(ValueError, match="Engine must be 'legacy' or 'native'"):
+    with pytest.raises(
+        ValueError, match="Engine must be one of 'legacy', 'native', 'static', 'auto'"
+    ):
         processor.run(parent, blocks)
 
 
@@ -200,3 +202,24 @@ def test_typer_processor_engine_option(global_engine, block_engine, expected_eng
         else:
             mock_run.assert_called_once()
             mock_native_output.assert_not_called()
+
+
+@pytest.mark.parametrize("global_compact,block_compact", [(True, None), (False, True)])
+def test_compact_directive_factors_out_common_options(global_compact, block_compact):
+    directive = (
+        "::: mkdocs-typer2\n"
+        "    :module: mkdocs_typer2.cli.cli\n"
+        "    :name: sample\n"
+        "    :engine: native\n"
+        "    :pretty: true"
+    )
+    if block_compact is not None:
+        directive += f"\n    :compact: {str(block_compact).lower()}"
+
+    html = markdown.markdown(
+        directive, extensions=[TyperExtension(compact=global_compact)]
+    )
+
+    # subapp's two subcommands share ``--name``; it is documented once.
+    assert html.count("greet</td>\n<td>Yes</td>\n<td>-</td>") == 1
+    assert "Common options" in html and "No arguments available" not in html
@@ -0,0 +1,83 @@
+"""Tests for per-directive memory tracking."""
+
+import tracemalloc
+
+import markdown
+
+from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.memory import MemoryUsage, measure_memory, rss_bytes
+from mkdocs_typer2.report import LARGEST_DIRECTIVES, BuildReport
+
+MIB = 1024 * 1024
+
+
+def test_rss_bytes_reports_this_process():
+    assert rss_bytes() > MIB
+
+
+def test_measure_memory_records_retained_allocations():
+    retained = []
+
+    with measure_memory("block") as usage:
+        retained.append(bytearray(4 * MIB))
+
+    assert usage.label == "block"
+    assert usage.allocated >= 4 * MIB
+    assert usage.peak >= usage.allocated
+    assert not tracemalloc.is_tracing()
+
+
+def test_measure_memory_reuses_a_running_tracemalloc_session():
+    tracemalloc.start()
+    try:
+        with measure_memory("block"):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_summary_lists_largest_directives_and_total():
+    report = BuildReport()
+    for index in range(LARGEST_DIRECTIVES + 1):
+        report.memory.append(
+            MemoryUsage(f"m{index}", rss_delta=index * MIB, allocated=MIB, peak=MIB)
+        )
+
+    lines = report.summary_lines()
+
+    assert lines[0] == (
+        f"memory m{LARGEST_DIRECTIVES}: RSS +{LARGEST_DIRECTIVES}.0 MiB, "
+        "Python heap +1.0 MiB (peak +1.0 MiB)"
+    )
+    assert len(lines) == LARGEST_DIRECTIVES + 1
+    assert "m0:" not in "\n".join(lines)
+    assert lines[-1] == (
+        f"memory total over {LARGEST_DIRECTIVES + 1} directives: RSS +15.0 MiB, "
+        f"Python heap +{LARGEST_DIRECTIVES + 1}.0 MiB (peak +1.0 MiB)"
+    )
+
+
+def test_track_memory_option_records_each_directive():
+    extension = TyperExtension(engine="native", track_memory=True)
+    directive = (
+        "::: mkdocs-typer2\n"
+        "    :module: mkdocs_typer2.cli.cli\n"
+        "    :name: mkdocs-typer2\n"
+    )
+
+    markdown.markdown(f"{directive}\n\n{directive}", extensions=[extension])
+
+    assert [usage.label for usage in extension.report.memory] == [
+        "mkdocs_typer2.cli.cli",
+        "mkdocs_typer2.cli.cli",
+    ]
+
+
+def test_memory_is_not_tracked_by_default():
+    extension = TyperExtension(engine="native")
+    directive = "::: mkdocs-typer2\n    :module: mkdocs_typer2.cli.cli\n"
+
+    markdown.markdown(directive, extensions=[extension])
+
+    assert extension.report.memory == []
@@ -0,0 +1,192 @@
+"""Tests for ``plan``: directive counts and cost estimates without rendering."""
+
+import json
+import textwrap
+from types import SimpleNamespace
+
+import markdown
+import pytest
+from typer.testing import CliRunner
+
+from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.plan import (
+    DEFAULT_RENDER_COSTS,
+    app,
+    find_directives,
+    plan_docs,
+)
+from mkdocs_typer2.plugin import MkdocsTyper
+from mkdocs_typer2.profiling import (
+    RenderCost,
+    load_render_profile,
+    write_render_profile,
+)
+
+MODULE = "mkdocs_typer2.cli.cli"
+
+
+@pytest.fixture
+def docs_dir(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "reference").mkdir(parents=True)
+    (docs / "index.md").write_text(
+        textwrap.dedent(
+            f"""\
+            # CLI
+
+            ::: mkdocs-typer2
+                :module: {MODULE}
+                :name: sample
+                :engine: native
+
+            Some text.
+            """
+        )
+    )
+    (docs / "reference" / "terminal.md").write_text(
+        textwrap.dedent(
+            f"""\
+            ::: mkdocs-typer2
+                :module: {MODULE}
+                :termynal: true
+                :subcommands: 1
+                :width: 60, 100
+            """
+        )
+    )
+    return docs
+
+
+def test_find_directives_scans_every_page(docs_dir):
+    found = list(find_directives(docs_dir))
+
+    assert [page for page, _ in found] == ["index.md", "reference/terminal.md"]
+    assert found[0][1].startswith("::: mkdocs-typer2")
+
+
+def test_plan_counts_commands_options_and_blocks(docs_dir):
+    native, termynal = plan_docs(docs_dir)
+
+    # Root, docs, export, the hidden hello, subapp and its two subcommands.
+    assert (native.mode, native.commands, native.blocks) == ("native", 7, 1)
+    assert native.options == 11
+    # ``--help`` skips hello: root plus three subcommands, once per width.
+    assert (termynal.mode, termynal.commands, termynal.blocks) == ("termynal", 4, 8)
+    per_block = DEFAULT_RENDER_COSTS["termynal"]
+    assert termynal.estimated_ms == pytest.approx(8 * per_block.ms)
+    assert termynal.estimated_bytes == 8 * per_block.bytes
+
+
+def test_plan_costs_legacy_per_directive(docs_dir):
+    (docs_dir / "index.md").write_text(
+        f"::: mkdocs-typer2\n    :module: {MODULE}\n    :name: sample\n"
+    )
+
+    legacy, _ = plan_docs(docs_dir)
+
+    assert (legacy.mode, legacy.commands) == ("legacy", 7)
+    assert legacy.estimated_ms == pytest.approx(DEFAULT_RENDER_COSTS["legacy"].ms)
+
+
+def test_plan_estimates_from_a_render_profile(docs_dir):
+    costs = {"native": RenderCost(units=4, ms=8.0, bytes=4000)}
+
+    native, _ = plan_docs(docs_dir, costs=costs)
+
+    assert native.estimated_ms == pytest.approx(14.0)
+    assert native.estimated_bytes == 7000
+
+
+def test_plan_counts_only_the_levels_markdown_documents(tmp_path, monkeypatch):
+    (tmp_path / "deep_plan_cli.py").write_text(
+        textwrap.dedent(
+            """
+            import typer
+
+            app, remote, branch = typer.Typer(), typer.Typer(), typer.Typer()
+            app.add_typer(remote, name="remote")
+            remote.add_typer(branch, name="branch")
+
+
+            @app.command()
+            def status(): pass
+
+
+            @remote.command()
+            def add(): pass
+
+
+            @branch.command()
+            def track(): pass
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    block = "::: mkdocs-typer2\n    :module: deep_plan_cli\n    :engine: native\n"
+    (docs / "index.md").write_text(block + "\n" + block + "    :explorer: true\n")
+
+    native, explorer = plan_docs(docs)
+
+    # Root, status, remote, add and branch; branch's track is level 3.
+    assert native.commands == 5
+    assert explorer.commands == 6
+
+
+def test_plan_reports_directives_it_cannot_resolve(tmp_path):
+    (tmp_path / "broken.md").write_text(
+        "::: mkdocs-typer2\n    :module: mkdocs_typer2_no_such_module\n"
+    )
+
+    (plan,) = plan_docs(tmp_path)
+
+    assert plan.label == "mkdocs_typer2_no_such_module"
+    assert "mkdocs_typer2_no_such_module" in plan.error
+
+
+def test_build_records_a_render_profile(tmp_path):
+    extension = TyperExtension(engine="native", render_profile="unused")
+    directive = f"::: mkdocs-typer2\n    :module: {MODULE}\n    :name: sample\n"
+    markdown.markdown(directive, extensions=[extension])
+    markdown.markdown(
+        directive + "    :termynal: true\n    :subcommands: -1\n",
+        extensions=[extension],
+    )
+
+    costs = extension.report.render_costs
+    assert costs["native"].units == 7 and costs["native"].bytes > 0
+    assert costs["termynal"].units == 6 and costs["termynal"].ms > 0
+
+    # Saving replaces the modes this build rendered and keeps the others.
+    path = tmp_path / "render-profile.json"
+    write_render_profile(path, {"legacy": RenderCost(1, 100.0, 10)})
+    write_render_profile(path, costs)
+    saved = load_render_profile(path)
+    assert sorted(saved) == ["legacy", "native", "termynal"]
+    assert saved["native"] == costs["native"]
+
+
+def test_plugin_writes_render_profile(tmp_path):
+    plugin = MkdocsTyper()
+    plugin.load_config({"render_profile": "render-profile.json"})
+    config = SimpleNamespace(config_file_path=str(tmp_path / "mkdocs.yml"))
+    plugin._extension = plugin.make_extension(config)
+    plugin._extension.report.add_render_cost("static", 3, 9.0, 300)
+
+    plugin.on_post_build(config)
+
+    data = json.loads((tmp_path / "render-profile.json").read_text())
+    assert data["modes"]["static"] == {"units": 3, "ms": 9.0, "bytes": 300}
+
+
+def test_plan_command_enforces_a_budget(docs_dir, tmp_path):
+    args = ["--config", str(tmp_path / "missing.yml"), "--docs-dir", str(docs_dir)]
+
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0
+    assert "reference/terminal.md" in result.output
+    assert "total: 2 directives" in result.output
+
+    result = CliRunner().invoke(app, [*args, "--max-ms", "1"])
+    assert result.exit_code == 1
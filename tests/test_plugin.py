@@ -1,5 +1,12 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+
 from mkdocs_typer2.plugin import MkdocsTyper
 from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.profiling import ImportProfile
+from mkdocs_typer2.termynal_render import TermynalOptions, render_termynal_html
 
 
 def test_plugin_on_config():
@@ -59,9 +66,131 @@ def test_plugin_termynal_config_threads_through():
     assert options.line_delay is None
 
 
+def test_plugin_passes_use_directory_urls_to_the_extension():
+    plugin = MkdocsTyper()
+    plugin.load_config({})
+
+    extension = plugin.make_extension(SimpleNamespace(use_directory_urls=False))
+
+    assert extension.use_directory_urls is False
+
+
 def test_plugin_on_pre_build():
     plugin = MkdocsTyper()
     config = {}
 
     # Should not raise any exceptions
     plugin.on_pre_build(config)
+
+
+def _page(src_uri: str, url: str) -> SimpleNamespace:
+    return SimpleNamespace(file=SimpleNamespace(src_uri=src_uri), url=url)
+
+
+def test_plugin_termynal_assets_only_on_pages_that_use_them(tmp_path):
+    pytest.importorskip("termynal.markdown")
+    plugin = MkdocsTyper()
+    plugin.load_config({"termynal_assets": True})
+    plugin.on_pre_build({})
+
+    used = _page("cli/termynal.md", "cli/termynal/")
+    unused = _page("index.md", "")
+    termynal_html = (
+        '<div class="termynal-typer-docs"><div class="termy" data-termynal></div></div>'
+    )
+    plugin.on_page_content(termynal_html, page=used, config={}, files=None)
+    plugin.on_page_content("<p>no blocks</p>", page=unused, config={}, files=None)
+
+    shell = "<html><head></head><body></body></html>"
+    used_output = plugin.on_post_page(shell, page=used, config={})
+    assert plugin.on_post_page(shell, page=unused, config={}) == shell
+
+    # Fingerprinted, page-relative references: CSS in <head>, JS before </body>.
+    css = re.search(r'<link rel="stylesheet" href="([^"]+)">\n</head>', used_output)
+    js = re.search(r'<script src="([^"]+)"></script>\n', used_output)
+    assert css and css.group(1).startswith("../../assets/mkdocs-typer2/termynal.")
+    assert js and js.group(1).startswith("../../assets/mkdocs-typer2/termynal.")
+
+    # termynal.js must load before the lazy-init script that uses its class.
+    scripts = re.findall(r'<script src="[^"]+/([^"/]+)"></script>', used_output)
+    assert [name.split(".")[0] for name in scripts] == ["termynal", "termynal-lazy"]
+
+    plugin.on_post_build({"site_dir": str(tmp_path)})
+    written = sorted(p.name for p in (tmp_path / "assets" / "mkdocs-typer2").iterdir())
+    assert written == sorted([css.group(1).rsplit("/", 1)[1], *scripts])
+
+
+def test_plugin_termynal_assets_static_pages_get_css_only():
+    pytest.importorskip("termynal.markdown")
+    plugin = MkdocsTyper()
+    plugin.load_config({"termynal_assets": True})
+    page = _page("static.md", "static/")
+
+    plugin.on_page_content(
+        '<div class="termynal-typer-docs"><div class="termy-static" data-termynal>'
+        "</div></div>",
+        page=page,
+        config={},
+        files=None,
+    )
+    output = plugin.on_post_page("<head></head><body></body>", page=page, config={})
+
+    assert "<link rel=" in output
+    assert "<script" not in output
+
+
+def test_plugin_moves_responsive_styles_out_of_the_content():
+    plugin = MkdocsTyper()
+    plugin.load_config({})
+    page = _page("cli.md", "cli/")
+    html = render_termynal_html(
+        "mkdocs_typer2.cli.cli", "mkdocs-typer2", TermynalOptions(widths=(60, 100))
+    )
+    style = html[: html.index("</style>") + len("</style>")]
+
+    content = plugin.on_page_content(
+        f'<div class="termynal-typer-docs">{html}</div>' * 2,
+        page=page,
+        config={},
+        files=None,
+    )
+    output = plugin.on_post_page("<head></head><body></body>", page=page, config={})
+
+    # Search indexes the content: it keeps the blocks but not the CSS.
+    assert "<style" not in content
+    assert content.count('data-width="60"') == 2
+    assert output == f"<head>{style}\n</head><body></body>"
+
+
+def test_plugin_termynal_assets_off_by_default(tmp_path):
+    plugin = MkdocsTyper()
+    plugin.load_config({})
+    page = _page("cli.md", "cli/")
+
+    plugin.on_page_content(
+        '<div class="termynal-typer-docs"></div>', page=page, config={}, files=None
+    )
+    plugin.on_post_build({"site_dir": str(tmp_path)})
+
+    assert plugin.on_post_page("<body></body>", page=page, config={}) == (
+        "<body></body>"
+    )
+    assert not (tmp_path / "assets").exists()
+
+
+def test_plugin_logs_build_summary(caplog):
+    plugin = MkdocsTyper()
+    plugin.load_config({"profile_imports": True})
+    plugin.on_config({"markdown_extensions": []})
+    report = plugin._extension.report
+    report.import_profiles["mycli"] = ImportProfile(
+        "mycli", total_us=2000, packages={"torch": 2000}
+    )
+
+    with caplog.at_level("INFO", logger="mkdocs.plugins.mkdocs_typer2"):
+        plugin.on_post_build({"site_dir": "unused"})
+    assert "import mycli: 2.0 ms (slowest: torch 2.0 ms)" in caplog.text
+
+    # Each build starts from an empty report.
+    plugin.on_pre_build({})
+    assert report.import_profiles == {}
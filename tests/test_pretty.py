@@ -16,6 +16,7 @@ from mkdocs_typer2.pretty import (
     _parse_typer_param_line_description,
     _resolve_click_command,
     build_tree_from_click_app,
+    common_options,
     parse_markdown_to_tree,
     tree_to_markdown,
     tree_to_markdown_list,
@@ -480,6 +481,8 @@ def test_resolve_click_command_variants():
         return None
 
     assert _resolve_click_command(app).name == "hello"
+    # The Click command built for a Typer app is reused, not rebuilt per call.
+    assert _resolve_click_command(app) is _resolve_click_command(app)
     command = click.Command("cmd")
     assert _resolve_click_command(command) is command
     with pytest.raises(ValueError, match="Resolved object is not a Typer or Click"):
@@ -588,3 +591,52 @@ $ mycli orphan
     tree = parse_markdown_to_tree(markdown)
     assert len(tree.subcommands) == 1
     assert "Orphan description" in tree.subcommands[0].description
+
+
+def _shared_options_tree():
+    help_option = Option(name="--help", description="Show this message and exit.")
+    verbose = Option(name="--verbose", description="Verbose output")
+    return CommandNode(
+        name="mycli",
+        options=[help_option],
+        commands=[CommandEntry(name="run"), CommandEntry(name="stop")],
+        subcommands=[
+            CommandNode(
+                name="run",
+                usage="mycli run [OPTIONS]",
+                options=[Option(name="--fast", description="Go fast"), verbose],
+            ),
+            CommandNode(
+                name="stop",
+                usage="mycli stop [OPTIONS]",
+                options=[verbose, help_option],
+            ),
+        ],
+    )
+
+
+def test_common_options_are_identical_options_on_several_commands():
+    tree = _shared_options_tree()
+    # Same name, different help: not the same option.
+    tree.subcommands[0].options.append(Option(name="--help", description="Other"))
+
+    assert [option.name for option in common_options(tree)] == ["--help", "--verbose"]
+    assert common_options(tree, min_commands=3) == []
+
+
+@pytest.mark.parametrize("render", [tree_to_markdown, tree_to_markdown_list])
+def test_compact_output_documents_common_options_once(render):
+    tree = _shared_options_tree()
+
+    full = render(tree)
+    compact = render(tree, compact=True)
+
+    assert full.count("Verbose output") == 2
+    assert compact.count("Verbose output") == 1
+    assert compact.count("Go fast") == 1
+    assert "## Common options" in compact
+    assert "[Common options](#common-options): `--verbose`, `--help`" in compact
+    # Empty sections are left out rather than rendered as placeholders.
+    assert "*No arguments available*" in full
+    assert "Arguments" not in compact and "*No options available*" not in compact
+    assert len(compact) < len(full)
@@ -0,0 +1,116 @@
+"""Tests for the live-preview server."""
+
+import json
+import os
+import sys
+import threading
+import urllib.request
+
+import pytest
+
+from mkdocs_typer2.preview import Preview, affected_modules, make_server
+
+MAIN = """
+import typer
+
+from toolpkg import commands, util
+
+app = typer.Typer(help="The tool.")
+app.add_typer(commands.remote, name="remote")
+"""
+
+COMMANDS = '''
+import typer
+
+remote = typer.Typer()
+
+
+@remote.command()
+def add(url: str = typer.Option("", help="{help}")):
+    """Add a remote."""
+'''
+
+
+def _edit(path, text):
+    # Bump the mtime explicitly: edits can land within its resolution.
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "toolpkg"
+    root.mkdir()
+    (root / "__init__.py").write_text("", encoding="utf-8")
+    (root / "main.py").write_text(MAIN, encoding="utf-8")
+    (root / "commands.py").write_text(COMMANDS.format(help="Its URL."), "utf-8")
+    (root / "util.py").write_text("VERSION = 1\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield root
+    for name in [name for name in sys.modules if name.startswith("toolpkg")]:
+        del sys.modules[name]
+
+
+def test_edit_reloads_affected_modules_only(package):
+    preview = Preview("toolpkg.main", "app")
+    assert "Its URL." in preview.html
+    util = sys.modules["toolpkg.util"]
+
+    assert not preview.poll()
+    _edit(package / "commands.py", COMMANDS.format(help="Where it lives."))
+    assert preview.poll()
+
+    assert "Where it lives." in preview.html
+    assert "Its URL." not in preview.html
+    assert preview.version == 2
+    # The package's __init__ holds the old module objects; util holds nothing
+    # of theirs and stays loaded.
+    assert sys.modules["toolpkg.util"] is util
+
+
+def test_affected_modules_follow_references(package):
+    import toolpkg.main  # noqa: F401
+
+    modules = {name: sys.modules[name] for name in sys.modules if "toolpkg" in name}
+
+    affected = affected_modules(["toolpkg.commands"], "toolpkg.main", modules)
+
+    assert affected == {"toolpkg", "toolpkg.commands", "toolpkg.main"}
+
+
+def test_errors_show_until_fixed(package):
+    preview = Preview("toolpkg.main", "app")
+
+    _edit(package / "commands.py", "def broken(:\n")
+    preview.poll()
+    assert "typer-preview-error" in preview.html
+    assert "SyntaxError" in preview.html
+
+    _edit(package / "commands.py", COMMANDS.format(help="Fixed."))
+    preview.poll()
+    assert "Fixed." in preview.html
+
+
+def test_server_pushes_updates(package):
+    preview = Preview("toolpkg.main", "app")
+    server = make_server(preview, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        page = urllib.request.urlopen(f"{url}/").read().decode()
+        assert '<div id="typer-preview">' in page and "Its URL." in page
+
+        with urllib.request.urlopen(f"{url}/events", timeout=5) as events:
+            first = json.loads(events.readline().decode()[len("data: ") :])
+            events.readline()
+            _edit(package / "commands.py", COMMANDS.format(help="Pushed."))
+            preview.poll()
+            update = json.loads(events.readline().decode()[len("data: ") :])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first["version"] == 1
+    assert update["version"] == 2
+    assert "Pushed." in update["html"]
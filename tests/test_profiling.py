@@ -0,0 +1,235 @@
+"""Tests for the opt-in profiling of documented modules and directives."""
+
+import cProfile
+import pstats
+import sys
+import time
+from pathlib import Path
+
+import markdown
+import pytest
+
+from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.profiling import (
+    _IMPORT_MARKER,
+    ImportProfile,
+    SlowDirective,
+    _parse_importtime,
+    profile_if_slow,
+    profile_imports,
+)
+from mkdocs_typer2.report import BuildReport
+
+IMPORTTIME_STDERR = f"""\
+import time: self [us] | cumulative | imported package
+import time:       500 |        500 | encodings
+{_IMPORT_MARKER}
+import time:       120 |        120 |     rich.style
+import time:       300 |        420 |   rich.console
+import time:        80 |        500 | rich
+import time:        40 |        540 | mycli.main
+"""
+
+
+def test_parse_importtime_groups_self_time_by_package():
+    packages = _parse_importtime(IMPORTTIME_STDERR)
+
+    # Startup imports before the marker are dropped; nested modules fold into
+    # their top-level package.
+    assert packages == {"rich": 500, "mycli": 40}
+
+
+def test_import_profile_slowest_ranks_packages():
+    profile = ImportProfile("m", total_us=60, packages={"a": 10, "b": 30, "c": 20})
+
+    assert profile.slowest(2) == [("b", 30), ("c", 20)]
+
+
+def test_profile_imports_measures_a_cold_import():
+    profile = profile_imports("mkdocs_typer2.cli.cli")
+
+    assert not profile.error
+    assert "typer" in profile.packages and "mkdocs_typer2" in profile.packages
+    assert profile.total_us == sum(profile.packages.values())
+
+
+def test_profile_imports_reports_failures_without_raising():
+    profile = profile_imports("mkdocs_typer2_no_such_module")
+
+    assert "ModuleNotFoundError" in profile.error
+
+
+def test_profile_imports_uses_the_directives_interpreter(tmp_path, monkeypatch):
+    (tmp_path / "cwd_only_cli.py").write_text("import json\n")
+    monkeypatch.chdir(tmp_path)
+
+    profile = profile_imports("cwd_only_cli", python=sys.executable)
+    missing = profile_imports("cwd_only_cli", python=str(tmp_path / "no-python"))
+
+    assert not profile.error and "json" in profile.packages
+    assert "cannot start" in missing.error
+
+
+def test_summary_lists_slowest_imports_per_module():
+    report = BuildReport()
+    report.import_profiles["mycli"] = ImportProfile(
+        "mycli", total_us=3000, packages={"torch": 2500, "mycli": 500}
+    )
+    report.import_profiles["broken"] = ImportProfile("broken", error="ImportError")
+
+    assert report.summary_lines() == [
+        "import profile of broken failed: ImportError",
+        "import mycli: 3.0 ms (slowest: torch 2.5 ms, mycli 0.5 ms)",
+    ]
+
+
+def test_profile_imports_option_profiles_each_module_once(monkeypatch):
+    from mkdocs_typer2 import markdown as markdown_module
+
+    calls = []
+    monkeypatch.setattr(
+        markdown_module,
+        "profile_imports",
+        lambda module, stubs=(), python="": (
+            calls.append(module) or ImportProfile(module)
+        ),
+    )
+    extension = TyperExtension(engine="native", profile_imports=True)
+    directive = (
+        "::: mkdocs-typer2\n"
+        "    :module: mkdocs_typer2.cli.cli\n"
+        "    :name: mkdocs-typer2\n"
+    )
+
+    markdown.markdown(f"{directive}\n\n{directive}", extensions=[extension])
+
+    assert calls == ["mkdocs_typer2.cli.cli"]
+    assert list(extension.report.import_profiles) == ["mkdocs_typer2.cli.cli"]
+
+
+def test_import_profiling_is_not_counted_as_render_time(monkeypatch, tmp_path):
+    from mkdocs_typer2 import markdown as markdown_module
+
+    def slow_profile(module, stubs=(), python=""):
+        time.sleep(0.5)
+        return ImportProfile(module)
+
+    monkeypatch.setattr(markdown_module, "profile_imports", slow_profile)
+    extension = TyperExtension(
+        engine="native",
+        profile_imports=True,
+        render_profile=str(tmp_path / "profile.json"),
+        profile_threshold_ms=400,
+        profile_dir=str(tmp_path),
+    )
+
+    markdown.markdown(
+        "::: mkdocs-typer2\n    :module: mkdocs_typer2.cli.cli\n",
+        extensions=[extension],
+    )
+
+    assert extension.report.render_costs["native"].ms < 400
+    assert extension.report.slow_directives == []
+
+
+def test_profile_if_slow_keeps_stats_only_for_slow_blocks(tmp_path):
+    slow = []
+
+    with profile_if_slow("fast", "cli.md", 60_000, tmp_path, slow):
+        pass
+    with profile_if_slow("mycli", "reference/cli.md", 0, tmp_path, slow):
+        sum(range(1000))
+
+    assert [record.label for record in slow] == ["mycli"]
+    assert slow[0].page == "reference/cli.md"
+    assert slow[0].path == str(tmp_path / "reference_cli--mycli.pstats")
+    stats = pstats.Stats(slow[0].path)
+    assert stats.total_calls > 0
+
+
+def test_profile_if_slow_numbers_repeated_page_and_module(tmp_path):
+    slow = []
+
+    for _ in range(2):
+        with profile_if_slow("mycli", "cli.md", 0, tmp_path, slow):
+            pass
+
+    assert [Path(record.path).name for record in slow] == [
+        "cli--mycli.pstats",
+        "cli--mycli-2.pstats",
+    ]
+
+
+def test_profile_if_slow_overwrites_the_last_builds_files(tmp_path):
+    for _ in range(2):
+        slow = []
+        with profile_if_slow("mycli", "cli.md", 0, tmp_path, slow):
+            pass
+
+    assert [path.name for path in tmp_path.iterdir()] == ["cli--mycli.pstats"]
+
+
+def test_profile_if_slow_times_only_under_another_profiler(tmp_path):
+    slow = []
+    outer = cProfile.Profile()
+    try:
+        outer.enable()
+    except ValueError:
+        pytest.skip("another profiler is already active")
+    try:
+        with profile_if_slow("mycli", "cli.md", 0, tmp_path, slow):
+            pass
+    finally:
+        outer.disable()
+
+    assert slow[0].path == ""
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_slow_directives_listed_in_summary():
+    report = BuildReport()
+    report.slow_directives.append(
+        SlowDirective("mycli", "cli.md", 1234.4, "profiles/cli--mycli.pstats")
+    )
+    report.slow_directives.append(SlowDirective("other", "", 900.0))
+
+    assert report.summary_lines() == [
+        "slow directive mycli on cli.md: 1234 ms, "
+        "profile written to profiles/cli--mycli.pstats",
+        "slow directive other on ?: 900 ms",
+    ]
+
+
+def test_profile_threshold_profiles_slow_directives(tmp_path):
+    extension = TyperExtension(
+        engine="native", profile_threshold_ms=0, profile_dir=str(tmp_path)
+    )
+    directive = "::: mkdocs-typer2\n    :module: mkdocs_typer2.cli.cli\n"
+
+    markdown.markdown(directive, extensions=[extension])
+
+    [slow] = extension.report.slow_directives
+    assert slow.label == "mkdocs_typer2.cli.cli"
+    assert Path(slow.path).name == "no-page--mkdocs_typer2.cli.cli.pstats"
+
+
+def test_profile_covers_renders_in_budget_and_apps_threads(tmp_path):
+    extension = TyperExtension(
+        engine="native",
+        render_budget_ms=10_000,
+        profile_threshold_ms=0,
+        profile_dir=str(tmp_path),
+    )
+    directives = [
+        "::: mkdocs-typer2\n    :module: mkdocs_typer2.cli.cli\n",
+        "::: mkdocs-typer2\n    :apps:\n        - mkdocs_typer2.cli.cli:app\n"
+        "        - mkdocs_typer2.cli.cli:app :command: docs\n",
+    ]
+
+    for directive in directives:
+        markdown.markdown(directive, extensions=[extension])
+
+    assert len(extension.report.slow_directives) == 2
+    for slow in extension.report.slow_directives:
+        functions = {name for _, _, name in pstats.Stats(slow.path).stats}
+        assert "build_tree_from_click_app" in functions
@@ -0,0 +1,124 @@
+"""Tests for ``search_records``: compact per-command search records."""
+
+from types import SimpleNamespace
+
+import markdown
+
+from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.plugin import MkdocsTyper
+from mkdocs_typer2.pretty import build_tree_from_click_app
+from mkdocs_typer2.search import SearchRecord, search_records, search_view
+from mkdocs_typer2.tracing import set_page
+
+MODULE = "mkdocs_typer2.cli.cli"
+DIRECTIVE = f"::: mkdocs-typer2\n    :module: {MODULE}\n    :name: sample\n"
+
+BLOCK = (
+    '<div class="typer-docs"><h1 id="tool">tool</h1><p>A tool</p>'
+    '<h2 id="usage">Usage</h2><p><code>tool [OPTIONS]</code></p>'
+    "<table><tbody><tr><td><code>--verbose</code></td></tr></tbody></table>"
+    '<h3 id="run">run</h3><table><tbody><tr><td>--fast</td></tr></tbody></table>'
+    "</div>"
+)
+RECORDS = [
+    SearchRecord("tool", "tool", "tool [OPTIONS]", "A tool", ["--verbose"]),
+    SearchRecord("run", "tool run", "tool run [OPTIONS]", "", ["--fast"]),
+]
+
+
+def test_search_records_cover_every_command():
+    tree = build_tree_from_click_app(MODULE, "sample")
+
+    records = {record.path: record for record in search_records(tree)}
+
+    assert len(records) == 7
+    export = records["sample export"]
+    assert export.usage == "sample export [OPTIONS]"
+    assert export.help == "Export project documentation"
+    assert export.options == ["--detail", "--format", "--retries", "--config"]
+    assert records["sample hello"].options == ["--caps", "--no-caps", "--color"]
+    assert records["sample"].help == "A sample CLI"
+    assert "sample subapp sub-command" in records
+
+
+def test_record_text_does_not_repeat_the_path():
+    assert RECORDS[1].text() == "tool run [OPTIONS] --fast"
+
+
+def test_search_view_adds_records_after_command_headings():
+    view = search_view(f"<p>intro</p>{BLOCK}<p>outro</p>", [RECORDS])
+
+    assert view.startswith("<p>intro</p>") and view.endswith("<p>outro</p>")
+    assert '<h1 id="tool">tool</h1><p>tool [OPTIONS] A tool --verbose</p>' in view
+    assert '<h3 id="run">run</h3><p>tool run [OPTIONS] --fast</p><table>' in view
+
+
+def test_search_view_can_exclude_the_block_content():
+    view = search_view(BLOCK, [RECORDS], exclude=True)
+
+    assert "<table" not in view and "Usage" not in view
+    assert view == (
+        '<div class="typer-docs"><h1 id="tool">tool</h1>'
+        "<p>tool [OPTIONS] A tool --verbose</p>"
+        '<h3 id="run">run</h3><p>tool run [OPTIONS] --fast</p></div>'
+    )
+
+
+def test_search_view_appends_records_without_a_heading():
+    explorer = '<div class="typer-docs"><div class="typer-explorer"></div></div>'
+
+    view = search_view(explorer + BLOCK, [RECORDS[1:], []], exclude=True)
+
+    assert view.startswith(
+        '<div class="typer-docs"><p>tool run [OPTIONS] --fast</p></div>'
+    )
+    # The second block had no records: only its command headings remain.
+    assert view.endswith('<div class="typer-docs"></div>')
+
+
+def test_directives_record_their_commands_per_page(tmp_path):
+    directive = DIRECTIVE + "    :engine: auto\n"
+    rendered, cached = (
+        TyperExtension(search_records=True, cache_dir=str(tmp_path)) for _ in "ab"
+    )
+    set_page("cli.md")
+    try:
+        markdown.markdown(directive, extensions=[rendered])
+        markdown.markdown(directive, extensions=[cached])
+    finally:
+        set_page("")
+
+    (records,) = rendered.search_records["cli.md"]
+    assert [record.path for record in records][:2] == ["sample", "sample docs"]
+    # The second build's output came from the cache, records included.
+    assert [choice.path for choice in cached.report.engine_choices] == ["cache"]
+    assert cached.search_records["cli.md"] == [records]
+
+
+def test_isolated_renders_return_their_records():
+    extension = TyperExtension(
+        engine="native", search_records=True, isolate_imports=True
+    )
+
+    markdown.markdown(DIRECTIVE, extensions=[extension])
+    extension.isolation.close()
+
+    (records,) = extension.search_records[""]
+    assert len(records) == 7
+
+
+def test_plugin_shows_search_the_search_view_only():
+    plugin = MkdocsTyper()
+    plugin.load_config({"engine": "native", "search_exclude_tables": True})
+    config = SimpleNamespace(config_file_path="mkdocs.yml")
+    plugin._extension = plugin.make_extension(config)
+    plugin._extension.search_records["cli.md"] = [RECORDS]
+    page = SimpleNamespace(file=SimpleNamespace(src_uri="cli.md"), content=BLOCK)
+    indexed = []
+
+    plugin._show_search_view({}, page=page, config=config, nav=None)
+    indexed.append(page.content)  # what the search plugin sees
+    plugin._restore_content({}, page=page, config=config, nav=None)
+
+    assert "<table" not in indexed[0] and "--verbose" in indexed[0]
+    assert page.content == BLOCK
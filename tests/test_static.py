@@ -0,0 +1,245 @@
+"""Tests for the import-free ``static`` engine."""
+
+import logging
+import re
+import sys
+import textwrap
+
+import markdown
+import pytest
+
+from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.pretty import build_tree_from_click_app
+from mkdocs_typer2.static import (
+    StaticAnalysisError,
+    build_tree_from_source,
+    find_module_source,
+)
+
+SAMPLE_CLI = textwrap.dedent(
+    '''
+    from enum import Enum
+    from pathlib import Path
+    from typing import Annotated, List, Optional
+
+    import typer
+
+    from .db import app as db_app
+
+    DEFAULT_COUNT = 2
+
+
+    class Color(str, Enum):
+        red = "red"
+        blue = "blue"
+
+
+    def version_callback(value: bool):
+        pass
+
+
+    app = typer.Typer(help="Sample app.")
+    app.add_typer(db_app, name="db", help="Database commands.")
+
+
+    @app.callback()
+    def main(
+        version: bool = typer.Option(
+            None, "--version", callback=version_callback, is_eager=True
+        ),
+    ):
+        """Sample root."""
+
+
+    @app.command()
+    def hello(
+        name: str,
+        count: int = typer.Option(DEFAULT_COUNT, "--count", "-c", help="Times"),
+        force: bool = False,
+    ):
+        """Say hello.
+
+        More text.
+        """
+
+
+    @app.command("paint-it", hidden=False)
+    def paint(
+        color: Annotated[Color, typer.Option(help="The color")] = Color.red,
+        target: Annotated[Optional[Path], typer.Argument(help="Target")] = None,
+        tags: List[str] = typer.Option([], help="Tags"),
+        verbose: Annotated[bool, typer.Option("--verbose/--quiet")] = True,
+        out: Path = Path("out"),
+        ratio: "float | None" = 0.5,
+    ):
+        pass
+    '''
+)
+
+DB_CLI = textwrap.dedent(
+    '''
+    import typer
+
+    app = typer.Typer()
+
+
+    @app.command()
+    def migrate(dry_run: bool = typer.Option(False, "--dry-run", help="Dry")):
+        """Run migrations."""
+    '''
+)
+
+
+@pytest.fixture
+def sample_package(tmp_path, monkeypatch):
+    package = tmp_path / "static_sample_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("raise RuntimeError('never imported')\n")
+    (package / "cli.py").write_text(SAMPLE_CLI)
+    (package / "db.py").write_text(DB_CLI)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "static_sample_pkg"
+    for name in [m for m in sys.modules if m.startswith("static_sample_pkg")]:
+        del sys.modules[name]
+
+
+def _write_module(tmp_path, monkeypatch, name, source):
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return name
+
+
+def _comparable(tree):
+    # Path and ``click_type`` parameter types render with an object address.
+    return re.sub(r" at 0x[0-9a-f]+", "", tree.model_dump_json())
+
+
+def test_find_module_source_does_not_import_packages(sample_package):
+    path = find_module_source(f"{sample_package}.cli")
+
+    assert path.name == "cli.py"
+    assert sample_package not in sys.modules
+
+
+def test_static_tree_matches_native_tree(sample_package):
+    static_tree = build_tree_from_source(f"{sample_package}.cli", "sample")
+    assert sample_package not in sys.modules
+
+    # The package ``__init__`` refuses imports; empty it so native can compare.
+    find_module_source(sample_package).write_text("")
+    native_tree = build_tree_from_click_app(f"{sample_package}.cli", "sample")
+
+    assert _comparable(static_tree) == _comparable(native_tree)
+    assert [c.name for c in static_tree.commands] == ["hello", "paint-it", "db"]
+
+
+def test_static_tree_of_repo_cli_matches_native():
+    module = "mkdocs_typer2.cli.cli"
+    static_tree = build_tree_from_source(module, "mkdocs-typer2")
+    native_tree = build_tree_from_click_app(module, "mkdocs-typer2")
+
+    assert _comparable(static_tree) == _comparable(native_tree)
+
+
+@pytest.mark.parametrize(
+    "source,message",
+    [
+        (
+            """
+            import typer
+            app = typer.Typer()
+            @app.command()
+            def run(value: int = compute()):
+                pass
+            """,
+            "cannot evaluate 'compute",
+        ),
+        (
+            """
+            import typer
+            import numpy
+            app = typer.Typer()
+            @app.command()
+            def run(value: numpy.float64 = 1.0):
+                pass
+            """,
+            "unsupported annotation",
+        ),
+        (
+            """
+            import typer
+            app = typer.Typer()
+            if True:
+                @app.command()
+                def run():
+                    pass
+            """,
+            "not a module-level registration",
+        ),
+        (
+            """
+            import typer
+            app = make_app()
+            """,
+            "'app' is not a module-level typer.Typer",
+        ),
+        (
+            """
+            import functools, typer
+            app = typer.Typer()
+            @app.command()
+            @functools.cache
+            def run():
+                pass
+            """,
+            "before typer registers it",
+        ),
+    ],
+)
+def test_static_analysis_rejects_what_it_cannot_decide(
+    tmp_path, monkeypatch, source, message
+):
+    module = _write_module(tmp_path, monkeypatch, "static_undecidable", source)
+
+    with pytest.raises(StaticAnalysisError, match=message):
+        build_tree_from_source(module, "")
+
+
+def test_static_engine_renders_directive(sample_package):
+    directive = (
+        "::: mkdocs-typer2\n"
+        f"    :module: {sample_package}.cli\n"
+        "    :name: sample\n"
+        "    :engine: static\n"
+    )
+
+    html = markdown.markdown(directive, extensions=[TyperExtension()])
+
+    assert "Say hello." in html and "--dry-run" in html
+    assert sample_package not in sys.modules
+
+
+def test_static_engine_falls_back_to_native(tmp_path, monkeypatch, caplog):
+    module = _write_module(
+        tmp_path,
+        monkeypatch,
+        "static_fallback_cli",
+        """
+        import typer
+
+        HELP = "Computed " + "help"
+        app = typer.Typer()
+
+        @app.command()
+        def run(value: int = typer.Option(1, help=HELP)):
+            pass
+        """,
+    )
+    directive = f"::: mkdocs-typer2\n    :module: {module}\n    :engine: static\n"
+
+    with caplog.at_level(logging.WARNING, logger="mkdocs.plugins.mkdocs_typer2"):
+        html = markdown.markdown(directive, extensions=[TyperExtension()])
+
+    assert "Computed help" in html
+    assert "importing it with the native engine instead" in caplog.text
+    monkeypatch.delitem(sys.modules, module, raising=False)
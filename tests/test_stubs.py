@@ -0,0 +1,101 @@
+"""Tests for stubbing heavy imports while documented modules are imported."""
+
+import sys
+import textwrap
+
+import markdown
+
+from mkdocs_typer2.markdown import TyperExtension, _legacy_command
+from mkdocs_typer2.stubs import stubbed_imports
+
+HEAVY_CLI = textwrap.dedent(
+    '''
+    import typer
+
+    import heavy_pkg_for_stubs as hp
+    from heavy_pkg_for_stubs.nn import Module
+
+    DEVICE = hp.device("cpu")
+
+    app = typer.Typer()
+
+
+    class Model(Module):
+        pass
+
+
+    @hp.jit
+    @app.command()
+    def train(epochs: int = typer.Option(3, help="Number of epochs")):
+        """Train the model."""
+    '''
+)
+
+
+def test_stubbed_imports_resolve_missing_packages_and_clean_up():
+    with stubbed_imports(["heavy_pkg_for_stubs"]):
+        import heavy_pkg_for_stubs.nn.functional as functional
+
+        assert "heavy_pkg_for_stubs" in sys.modules
+        assert functional.relu(1) is not None
+
+    assert not any(name.startswith("heavy_pkg_for_stubs") for name in sys.modules)
+
+
+def test_stubbed_imports_keep_already_imported_packages():
+    import json
+
+    with stubbed_imports(["json"]):
+        import json as stubbed
+
+    assert stubbed is json
+
+
+def test_stub_objects_work_as_decorators_and_base_classes():
+    with stubbed_imports(["heavy_pkg_for_stubs"]):
+        import heavy_pkg_for_stubs as hp
+
+        @hp.jit
+        def fn():
+            return 42
+
+        class Model(hp.nn.Module):
+            pass
+
+    assert fn() == 42
+    assert isinstance(Model(), object)
+
+
+def test_legacy_command_runs_through_stub_wrapper_only_when_needed():
+    assert _legacy_command("mycli", "my", []) == [
+        "typer",
+        "mycli",
+        "utils",
+        "docs",
+        "--name",
+        "my",
+    ]
+    cmd = _legacy_command("mycli", "my", ["torch", "boto3"])
+    assert cmd[:4] == [sys.executable, "-m", "mkdocs_typer2.stubs", "torch,boto3"]
+    assert cmd[4:] == ["mycli", "utils", "docs", "--name", "my"]
+
+
+def test_directive_stub_imports_document_module_with_missing_dependency(
+    tmp_path, monkeypatch
+):
+    (tmp_path / "heavy_cli_for_stubs.py").write_text(HEAVY_CLI)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "heavy_cli_for_stubs", raising=False)
+    directive = (
+        "::: mkdocs-typer2\n"
+        "    :module: heavy_cli_for_stubs\n"
+        "    :name: heavy\n"
+        "    :engine: native\n"
+        "    :stub_imports: heavy_pkg_for_stubs\n"
+    )
+
+    html = markdown.markdown(directive, extensions=[TyperExtension()])
+
+    assert "Train the model." in html
+    assert "--epochs" in html
+    monkeypatch.delitem(sys.modules, "heavy_cli_for_stubs", raising=False)
@@ -6,7 +6,7 @@ termynal output mode and need no optional extra, so they run unconditionally.
 
 import pytest
 
-from mkdocs_typer2.markdown import _as_bool, _as_int
+from mkdocs_typer2.markdown import _as_bool, _as_int, _as_int_list
 
 
 @pytest.mark.parametrize(
@@ -31,3 +31,12 @@ def test_as_int_parses_and_falls_back():
     assert _as_int("abc", default=7) == 7
     assert _as_int(None, default=7) == 7
     assert _as_int("abc", default=None) is None
+
+
+def test_as_int_list_parses_comma_separated_widths():
+    assert _as_int_list("60,100") == [60, 100]
+    assert _as_int_list("60, 100 ,") == [60, 100]
+    assert _as_int_list("80") == [80]
+    # Any non-integer item (or no value) keeps the caller's default.
+    assert _as_int_list("60,wide") is None
+    assert _as_int_list(None) is None
@@ -7,6 +7,7 @@ full Python-Markdown pipeline.
 
 import sys
 import types
+import weakref
 
 import click
 import markdown
@@ -381,6 +382,194 @@ def test_scheme_option_through_directive():
     assert render() != render("    :scheme: osx\n")
 
 
+def test_help_captured_once_per_command_and_width(monkeypatch):
+    from mkdocs_typer2 import termynal_render
+
+    calls = []
+    real = termynal_render._colored_help
+
+    def counting(command, info_name, width=80):
+        calls.append((info_name, width))
+        return real(command, info_name, width=width)
+
+    monkeypatch.setattr(termynal_render, "_colored_help", counting)
+    monkeypatch.setattr(termynal_render, "_HELP_CACHE", weakref.WeakKeyDictionary())
+
+    variants = [
+        TermynalOptions(width=70),
+        TermynalOptions(width=70, scheme="osx", dark_bg=False),
+        TermynalOptions(width=70, buttons="windows", prompt=">"),
+    ]
+    rendered = [
+        render_termynal_html("mkdocs_typer2.cli.cli", "mkdocs-typer2", options)
+        for options in variants
+    ]
+
+    # Three differently styled renders, one capture.
+    assert len(set(rendered)) == 3
+    assert calls == [("mkdocs-typer2", 70)]
+
+    render_termynal_html(
+        "mkdocs_typer2.cli.cli", "mkdocs-typer2", TermynalOptions(width=90)
+    )
+    assert calls[-1] == ("mkdocs-typer2", 90)
+
+
+def test_multiple_widths_render_responsive_variants(monkeypatch):
+    from mkdocs_typer2 import termynal_render
+
+    calls = []
+    real = termynal_render._colored_help
+
+    def counting(command, info_name, width=80):
+        calls.append((info_name, width))
+        return real(command, info_name, width=width)
+
+    monkeypatch.setattr(termynal_render, "_colored_help", counting)
+    monkeypatch.setattr(termynal_render, "_HELP_CACHE", weakref.WeakKeyDictionary())
+
+    html = render_termynal_html(
+        "mkdocs_typer2.cli.cli",
+        "mkdocs-typer2",
+        TermynalOptions(widths=(100, 60, 60), subcommands=1),
+    )
+
+    # Deduplicated and ordered narrow-to-wide, one full stack per width.
+    assert html.index('data-width="60"') < html.index('data-width="100"')
+    assert html.count('class="termynal-typer-width"') == 2
+    per_width = len(calls) // 2
+    assert html.count("data-termynal") == 2 * per_width
+    assert sorted({width for _, width in calls}) == [60, 100]
+    # Media queries show exactly one variant per viewport range.
+    style = html[: html.index("</style>")]
+    assert "@media (max-width:" in style and "@media (min-width:" in style
+
+    # A second multi-width render reuses every per-width capture.
+    calls.clear()
+    render_termynal_html(
+        "mkdocs_typer2.cli.cli",
+        "mkdocs-typer2",
+        TermynalOptions(widths=(60, 100), subcommands=1, scheme="osx"),
+    )
+    assert calls == []
+
+
+def test_single_width_list_renders_plain_blocks():
+    html = render_termynal_html(
+        "mkdocs_typer2.cli.cli", "mkdocs-typer2", TermynalOptions(widths=(70,))
+    )
+
+    assert "<style" not in html
+    assert html.count("data-termynal") == 1
+
+
+def test_width_list_threads_through_directive():
+    directive = (
+        "::: mkdocs-typer2\n"
+        "    :module: mkdocs_typer2.cli.cli\n"
+        "    :name: mkdocs-typer2\n"
+        "    :termynal: true\n"
+        "    :width: 60, 100\n"
+    )
+
+    html = markdown.markdown(
+        directive, extensions=["tables", TyperExtension(engine="native")]
+    )
+
+    assert 'data-width="60"' in html and 'data-width="100"' in html
+
+
+def test_lazy_blocks_skip_termynal_autoinit():
+    eager = render_termynal_html(
+        "mkdocs_typer2.cli.cli", "mkdocs-typer2", TermynalOptions(subcommands=1)
+    )
+    lazy = render_termynal_html(
+        "mkdocs_typer2.cli.cli",
+        "mkdocs-typer2",
+        TermynalOptions(subcommands=1, lazy=True),
+    )
+
+    # termynal.js auto-starts every ``.termy``; lazy blocks must not carry it.
+    assert 'class="termy"' in eager and 'class="termy-lazy"' not in eager
+    assert 'class="termy"' not in lazy
+    assert lazy.count('class="termy-lazy"') == eager.count('class="termy"')
+
+
+def test_max_lines_collapses_the_rest_of_the_output():
+    full = render_termynal_html("mkdocs_typer2.cli.cli", "mkdocs-typer2")
+    capped = render_termynal_html(
+        "mkdocs_typer2.cli.cli", "mkdocs-typer2", TermynalOptions(max_lines=3)
+    )
+
+    total_lines = full.count("<br>") + 1
+    animated, overflow = capped.split('<details class="termynal-typer-more">')
+    assert animated.count("<br>") == 2
+    assert f"Show {total_lines - 3} more lines" in overflow
+    # The continuation is styled by termynal but never animated by it.
+    assert "data-termynal" in overflow and 'class="termy' not in overflow
+
+
+def test_max_lines_not_reached_or_non_positive_keeps_single_block():
+    for max_lines in (1000, 0, -5):
+        html = render_termynal_html(
+            "mkdocs_typer2.cli.cli",
+            "mkdocs-typer2",
+            TermynalOptions(max_lines=max_lines),
+        )
+        assert "<details" not in html
+
+
+def test_static_renders_finished_frame_without_animation_hooks():
+    html = render_termynal_html(
+        "mkdocs_typer2.cli.cli",
+        "mkdocs-typer2",
+        TermynalOptions(static=True, lazy=True, type_delay=5, subcommands=1),
+    )
+
+    # Same block contract, so termynal's CSS and themes still apply ...
+    assert 'data-ty="input" data-ty-prompt="$"' in html
+    assert "mkdocs-typer2 docs --help" in html
+    assert 'style="color:' in html
+    # ... but nothing termynal.js (or the lazy loader) would pick up.
+    assert 'class="termy"' not in html and "termy-lazy" not in html
+    assert html.count('class="termy-static"') == html.count("data-ty-title=")
+    assert "data-ty-typeDelay" not in html
+
+
+def test_lazy_and_max_lines_thread_through_directive():
+    directive = (
+        "::: mkdocs-typer2\n"
+        "    :module: mkdocs_typer2.cli.cli\n"
+        "    :name: mkdocs-typer2\n"
+        "    :termynal: true\n"
+        "    :lazy: true\n"
+        "    :max_lines: 2\n"
+    )
+
+    html = markdown.markdown(
+        directive, extensions=["tables", TyperExtension(engine="native")]
+    )
+
+    assert 'class="termy-lazy"' in html
+    assert '<details class="termynal-typer-more">' in html
+
+
+def test_static_threads_through_directive():
+    directive = (
+        "::: mkdocs-typer2\n"
+        "    :module: mkdocs_typer2.cli.cli\n"
+        "    :name: mkdocs-typer2\n"
+        "    :termynal: true\n"
+        "    :static: true\n"
+    )
+
+    html = markdown.markdown(
+        directive, extensions=["tables", TyperExtension(engine="native")]
+    )
+
+    assert 'class="termy-static"' in html
+
+
 def test_termynal_end_to_end_through_markdown_pipeline():
     directive = (
         "::: mkdocs-typer2\n"
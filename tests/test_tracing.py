@@ -0,0 +1,116 @@
+"""Tests for the trace-event timeline of the render pipeline."""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import markdown
+import pytest
+
+from mkdocs_typer2 import tracing
+from mkdocs_typer2.markdown import TyperExtension
+from mkdocs_typer2.plugin import MkdocsTyper
+from mkdocs_typer2.tracing import Tracer, set_page, span
+
+
+@pytest.fixture(autouse=True)
+def _no_tracer():
+    yield
+    tracing.install(None)
+    set_page("")
+
+
+def test_span_is_a_shared_no_op_without_a_tracer():
+    assert span("a") is span("b", key=1)
+
+
+def test_spans_record_complete_events_tagged_by_page_and_thread():
+    tracer = Tracer()
+    tracing.install(tracer)
+    set_page("cli.md")
+
+    with span("outer", module="mycli"):
+        with span("inner"):
+            pass
+    worker = threading.Thread(target=lambda: _traced("threaded"), name="pool-1")
+    worker.start()
+    worker.join()
+
+    complete = [event for event in tracer.events if event["ph"] == "X"]
+    assert [event["name"] for event in complete] == ["inner", "outer", "threaded"]
+    outer = complete[1]
+    assert outer["args"] == {"module": "mycli", "page": "cli.md"}
+    assert outer["dur"] >= complete[0]["dur"]
+    thread_names = {
+        event["tid"]: event["args"]["name"]
+        for event in tracer.events
+        if event["ph"] == "M"
+    }
+    assert thread_names[complete[2]["tid"]] == "pool-1"
+    # Thread pools only see the page when started from a copied context.
+    assert "page" not in complete[2]["args"]
+
+
+def _traced(name):
+    with span(name):
+        pass
+
+
+def test_tracer_writes_chrome_trace_json(tmp_path):
+    tracer = Tracer()
+    tracing.install(tracer)
+    with span("phase"):
+        pass
+
+    tracer.write(tmp_path / "out" / "trace.json")
+
+    data = json.loads((tmp_path / "out" / "trace.json").read_text())
+    assert data["displayTimeUnit"] == "ms"
+    assert [event["name"] for event in data["traceEvents"]] == [
+        "thread_name",
+        "phase",
+    ]
+
+
+def test_trace_covers_directive_phases():
+    extension = TyperExtension(engine="native", trace_file="trace.json")
+    directive = (
+        "::: mkdocs-typer2\n"
+        "    :module: mkdocs_typer2.cli.cli\n"
+        "    :name: mkdocs-typer2\n"
+    )
+
+    markdown.markdown(
+        f"{directive}\n\n{directive}    :termynal: true\n", extensions=[extension]
+    )
+
+    # ``get_command`` and ``format_help`` are cached across tests, so only
+    # phases that run on every directive are checked.
+    names = [event["name"] for event in extension.tracer.events]
+    for phase in (
+        "directive",
+        "import",
+        "tree build",
+        "render",
+        "markdown.markdown",
+        "_ansi_to_html",
+    ):
+        assert phase in names
+
+
+def test_plugin_writes_trace_next_to_config(tmp_path):
+    plugin = MkdocsTyper()
+    plugin.load_config({"trace_file": "build/trace.json"})
+    plugin.on_config({"markdown_extensions": []})
+    page = SimpleNamespace(file=SimpleNamespace(src_uri="cli.md"))
+
+    plugin.on_pre_build({})
+    plugin.on_page_markdown("", page=page, config={}, files=None)
+    with span("phase"):
+        pass
+    plugin.on_page_content("", page=page, config={}, files=None)
+    config = SimpleNamespace(config_file_path=str(tmp_path / "mkdocs.yml"))
+    plugin.on_post_build(config)
+
+    events = json.loads((tmp_path / "build" / "trace.json").read_text())
+    assert events["traceEvents"][-1]["args"] == {"page": "cli.md"}
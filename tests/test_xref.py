@@ -0,0 +1,109 @@
+"""Tests for ``typer:`` cross-references and the exported inventory."""
+
+from types import SimpleNamespace
+
+import markdown
+import pytest
+
+from mkdocs_typer2.plugin import MkdocsTyper
+from mkdocs_typer2.search import SearchRecord
+from mkdocs_typer2.tracing import set_page
+from mkdocs_typer2.xref import XrefIndex, XrefTarget
+
+RECORDS = [
+    (SearchRecord("tool", "tool", options=["--verbose"]), "tool"),
+    (SearchRecord("deploy", "tool deploy", options=["--force", "-f"]), "deploy"),
+]
+
+
+@pytest.fixture
+def index():
+    index = XrefIndex()
+    index.add_records("reference/cli/", RECORDS)
+    return index
+
+
+def test_index_resolves_commands_and_options(index):
+    assert index.resolve("tool  deploy") == XrefTarget(
+        "reference/cli/", "deploy", "command"
+    )
+    assert index.resolve("tool deploy -f").role == "option"
+    assert index.resolve("tool --force") is None
+    assert len(index) == 5
+
+
+@pytest.mark.parametrize(
+    "page_url,href",
+    [
+        ("", "reference/cli/#deploy"),
+        ("reference/cli/", "./#deploy"),
+        ("guide/", "../reference/cli/#deploy"),
+    ],
+)
+def test_links_are_relative_to_the_page(index, page_url, href):
+    assert index.resolve("tool deploy").href(page_url) == href
+
+
+def test_resolve_links(index):
+    content = (
+        '<p><a href="typer:tool deploy --force"></a>, '
+        '<a href="typer:tool deploy" title="t">deploying</a> and '
+        '<a href="typer:tool missing"></a></p>'
+    )
+
+    resolved, unresolved = index.resolve_links(content, "guide/")
+
+    assert resolved == (
+        '<p><a href="../reference/cli/#deploy"><code>tool deploy --force</code></a>, '
+        '<a href="../reference/cli/#deploy" title="t">deploying</a> and '
+        "<code>tool missing</code></p>"
+    )
+    assert unresolved == ["tool missing"]
+
+
+def test_inventory_round_trip(index):
+    data = index.inventory("Tool docs", "1.0")
+    assert data.startswith(b"# Sphinx inventory version 2\n# Project: Tool docs\n")
+
+    other = XrefIndex()
+    assert other.load_inventory(data, "https://tool.example.com/") == 5
+    target = other.resolve("tool deploy --force")
+    assert target.href("anywhere/") == "https://tool.example.com/reference/cli/#deploy"
+    # Imported targets are not re-exported, and local ones win.
+    assert len(other) == 0
+    other.add_records("cli/", RECORDS[:1])
+    assert other.resolve("tool").href("") == "cli/#tool"
+
+
+def test_plugin_resolves_references_to_later_pages(tmp_path):
+    plugin = MkdocsTyper()
+    plugin.load_config({"engine": "native", "xrefs": True, "xref_inventory": "cli.inv"})
+    config = {"markdown_extensions": [], "site_dir": str(tmp_path), "site_name": "t"}
+    plugin.on_config(config)
+    plugin.on_pre_build(config)
+    guide = SimpleNamespace(
+        file=SimpleNamespace(src_uri="index.md"),
+        url="",
+        content='<p><a href="typer:sample export --format"></a></p>',
+    )
+    reference = SimpleNamespace(file=SimpleNamespace(src_uri="cli.md"), url="cli/")
+
+    # The guide is converted before the page documenting the command.
+    plugin.on_page_content(guide.content, page=guide, config=config, files=None)
+    set_page("cli.md")
+    try:
+        html = markdown.markdown(
+            "::: mkdocs-typer2\n    :module: mkdocs_typer2.cli.cli\n"
+            "    :name: sample\n    :pretty: true\n",
+            extensions=["toc", *config["markdown_extensions"]],
+        )
+    finally:
+        set_page("")
+    plugin.on_page_content(html, page=reference, config=config, files=None)
+    plugin._resolve_xrefs({}, page=guide, config=config, nav=None)
+
+    assert guide.content == (
+        '<p><a href="cli/#export"><code>sample export --format</code></a></p>'
+    )
+    plugin.on_post_build(config)
+    assert XrefIndex().load_inventory((tmp_path / "cli.inv").read_bytes(), "") > 0